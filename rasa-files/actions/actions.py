@@ -1,203 +1,590 @@
-from typing import Any, Text, Dict, List
+from abc import ABC, abstractmethod
+from typing import Any, Text, Dict, List, Optional, Tuple
 from rasa_sdk import Action, Tracker
 from rasa_sdk.executor import CollectingDispatcher
+import asyncio
+import functools
+import inspect
 import logging
 import os
 import sys
+import threading
+import time
 
 # Ajouter le chemin du scraper au PYTHONPATH
 sys.path.append(os.path.dirname(os.path.dirname(__file__)))
-from scraper.esg_scraper_adapter import ESGScraperAdapter
+
+from scraper.cache import TTLCache
+from scraper.metrics import REGISTRY, start_metrics_server
+from scraper.profiling import profiled
+from scraper.storage import DEFAULT_DATA_DIR, DEFAULT_STORAGE_BACKEND
 
 # Configuration du logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-# Initialiser l'adaptateur de scraping ESG
-esg_adapter = ESGScraperAdapter(data_dir="data/esg_data")
+# Répertoire des données ESG lues par l'adaptateur (celui où écrit le scraper)
+ESG_DATA_DIR = DEFAULT_DATA_DIR
 
-class ActionGetEmissionsCO2(Action):
-    def name(self) -> Text:
-        return "action_get_emissions_co2"
+# Moteur de stockage des enregistrements du scraper ("none" pour ne lire que les JSON)
+ESG_STORAGE_BACKEND = DEFAULT_STORAGE_BACKEND
+
+# Si "1", l'adaptateur est chargé et chaque action exécutée une fois à l'import
+# du module, c'est-à-dire avant que le serveur d'actions ne soit prêt
+ESG_ACTIONS_WARMUP = os.environ.get("ESG_ACTIONS_WARMUP", "0") == "1"
+
+# Si "1", les fichiers JSON de ESG_DATA_DIR sont rechargés à chaud dès qu'ils changent
+ESG_HOT_RELOAD = os.environ.get("ESG_HOT_RELOAD", "1") == "1"
+
+# Magasin SQLite partagé par les workers du serveur d'actions (vide: pas de partage)
+ESG_SHARED_STORE = os.environ.get("ESG_SHARED_STORE", "")
+
+# Taille et durée de vie (en secondes) du cache des réponses rendues
+ESG_RESPONSE_CACHE_SIZE = int(os.environ.get("ESG_RESPONSE_CACHE_SIZE", "1024"))
+ESG_RESPONSE_CACHE_TTL = float(os.environ.get("ESG_RESPONSE_CACHE_TTL", "3600"))
+
+# Port de l'endpoint Prometheus /metrics ouvert à côté du serveur d'actions
+# (non défini ou 0: pas d'endpoint; le superviseur en attribue un à chaque worker)
+ESG_METRICS_PORT = int(os.environ.get("ESG_METRICS_PORT") or "0")
+
+# Adresse d'écoute de l'endpoint /metrics
+ESG_METRICS_HOST = os.environ.get("ESG_METRICS_HOST", "127.0.0.1")
+
+# Symboles boursiers des entreprises citées par leur nom
+COMPANY_SYMBOLS = {
+    "apple": "AAPL",
+    "microsoft": "MSFT",
+    "amazon": "AMZN",
+    "alphabet": "GOOGL",
+    "google": "GOOGL",
+    "tesla": "TSLA"
+}
+
+# Notations MSCI, de la meilleure à la moins bonne
+MSCI_RATINGS = ["AAA", "AA", "A", "BBB", "BB", "B", "CCC"]
+
+# Métriques des actions
+ACTION_DURATION = REGISTRY.histogram(
+    "esg_action_duration_seconds",
+    "Durée d'exécution des actions",
+    labels=("action",)
+)
+ACTION_ERRORS = REGISTRY.counter(
+    "esg_action_errors_total",
+    "Actions ayant répondu par un message d'erreur technique",
+    labels=("action",)
+)
+
+# Adaptateur de scraping ESG, créé au premier usage (voir get_esg_adapter)
+_esg_adapter = None
+_esg_adapter_lock = threading.Lock()
+
+def get_esg_adapter():
+    """
+    Renvoie l'adaptateur de scraping ESG, en le créant au premier appel
+    
+    Le module de scraping et ses dépendances ne sont importés qu'à ce
+    moment-là, pour que le serveur d'actions démarre sans attendre le
+    chargement des données.
+    """
+    global _esg_adapter
+    if _esg_adapter is None:
+        with _esg_adapter_lock:
+            if _esg_adapter is None:
+                from scraper.esg_scraper_adapter import ESGScraperAdapter
+                _esg_adapter = ESGScraperAdapter(
+                    data_dir=ESG_DATA_DIR,
+                    storage_backend=ESG_STORAGE_BACKEND,
+                    hot_reload=ESG_HOT_RELOAD,
+                    shared_store=ESG_SHARED_STORE or None
+                )
+    return _esg_adapter
+
+def resolve_company_symbol(company: Text) -> Text:
+    """
+    Convertit une entité company (nom ou symbole) en symbole boursier
     
-    def run(self, dispatcher: CollectingDispatcher,
+    Args:
+        company: Valeur de l'entité, par exemple "Apple" ou "aapl"
+    """
+    company = company.strip()
+    return COMPANY_SYMBOLS.get(company.lower(), company.upper())
+
+def format_company_rating(company_symbol: Text, company_data: Dict[Text, Any]) -> Text:
+    """
+    Résume les notations ESG d'une entreprise en une phrase
+    
+    Args:
+        company_symbol: Symbole boursier de l'entreprise
+        company_data: Données ESG par source
+    """
+    details = []
+    msci = company_data.get("msci") or {}
+    if msci.get("esg_rating") not in (None, "N/A"):
+        details.append(
+            f"MSCI {msci['esg_rating']} (environnement {msci.get('environmental_score', 'N/A')}, "
+            f"social {msci.get('social_score', 'N/A')}, gouvernance {msci.get('governance_score', 'N/A')})"
+        )
+    sustainalytics = company_data.get("sustainalytics") or {}
+    if sustainalytics.get("esg_risk_rating") not in (None, "N/A"):
+        details.append(f"risque ESG Sustainalytics de {sustainalytics['esg_risk_rating']}")
+    
+    if not details:
+        return f"{company_symbol}: aucune notation ESG disponible"
+    return f"{company_symbol}: " + ", ".join(details)
+
+def company_esg_rank(company_data: Dict[Text, Any]):
+    """
+    Clé de classement d'une entreprise: notation MSCI puis risque Sustainalytics
+    (plus la clé est petite, meilleure est l'entreprise)
+    
+    Args:
+        company_data: Données ESG par source
+    """
+    rating = (company_data.get("msci") or {}).get("esg_rating")
+    rating_rank = MSCI_RATINGS.index(rating) if rating in MSCI_RATINGS else len(MSCI_RATINGS)
+    risk = (company_data.get("sustainalytics") or {}).get("esg_risk_rating")
+    return rating_rank, risk if isinstance(risk, (int, float)) else float("inf")
+
+async def aget_esg_adapter():
+    """
+    Variante asyncio de get_esg_adapter: la création de l'adaptateur (lecture
+    des fichiers de données) s'exécute hors de la boucle d'événements
+    """
+    if _esg_adapter is not None:
+        return _esg_adapter
+    return await asyncio.get_running_loop().run_in_executor(None, get_esg_adapter)
+
+def instrumented(run):
+    """Décorateur de Action.run: mesure la durée de chaque exécution dans ACTION_DURATION"""
+    @functools.wraps(run)
+    async def wrapper(self, dispatcher, tracker, domain):
+        start = time.perf_counter()
+        try:
+            return await run(self, dispatcher, tracker, domain)
+        finally:
+            ACTION_DURATION.observe(time.perf_counter() - start, action=self.name())
+    return wrapper
+
+def action_profile_tag(run, action, dispatcher, tracker, domain) -> Text:
+    """Étiquette d'un profil d'action (voir ESG_PROFILE): nom de l'action et entités du message"""
+    entities = [f"{entity.get('entity')}={entity.get('value')}" for entity in tracker.latest_message.get("entities", [])]
+    return ",".join([action.name()] + entities)
+
+def build_synthetic_tracker(entities: Optional[Dict[Text, Any]] = None,
+                            sender_id: Text = "warmup") -> Tracker:
+    """
+    Construit un Tracker minimal dont le dernier message porte les entités données
+    
+    Args:
+        entities: {entité: valeur ou liste de valeurs}
+        sender_id: Identifiant de la conversation
+    """
+    entity_list = []
+    for entity, values in (entities or {}).items():
+        for value in values if isinstance(values, (list, tuple)) else [values]:
+            entity_list.append({"entity": entity, "value": value})
+    
+    latest_message = {"text": "", "intent": {}, "entities": entity_list}
+    return Tracker(sender_id, {}, latest_message, [], False, None, {}, None)
+
+def action_classes() -> List[type]:
+    """Classes d'actions concrètes définies dans ce module"""
+    classes = []
+    pending = list(Action.__subclasses__())
+    while pending:
+        action_class = pending.pop(0)
+        pending.extend(action_class.__subclasses__())
+        if action_class.__module__ == __name__ and not inspect.isabstract(action_class):
+            classes.append(action_class)
+    return classes
+
+async def awarm_up() -> None:
+    """
+    Précharge l'adaptateur puis exécute chaque action une fois sur un Tracker synthétique
+    
+    Les premiers appels réels ne paient ainsi ni le chargement des données
+    ni l'initialisation des chemins de code des actions.
+    """
+    start = time.perf_counter()
+    await aget_esg_adapter()
+    
+    for action_class in action_classes():
+        action = action_class()
+        try:
+            await action.run(CollectingDispatcher(), build_synthetic_tracker(), {})
+        except Exception as e:
+            logger.warning(f"Échec du préchauffage de {action.name()}: {e}")
+    
+    logger.info(f"Préchauffage des actions terminé en {time.perf_counter() - start:.2f}s")
+
+def warm_up() -> None:
+    """
+    Exécute awarm_up depuis un contexte synchrone (import du module)
+    
+    Si une boucle d'événements tourne déjà, le préchauffage y est planifié
+    en tâche de fond.
+    """
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        asyncio.run(awarm_up())
+    else:
+        loop.create_task(awarm_up())
+
+class ResponseCache:
+    """
+    Cache des réponses rendues par les actions
+    
+    Les réponses sont indexées par (nom de l'action, entités normalisées)
+    pour une version donnée des données de l'adaptateur: dès qu'une
+    nouvelle version est observée, le cache est vidé.
+    """
+    
+    def __init__(self, max_entries: int = 1024, ttl: float = 3600):
+        """
+        Args:
+            max_entries: Nombre maximal de réponses gardées en cache
+            ttl: Durée de vie d'une réponse en secondes
+        """
+        self._cache = TTLCache(max_entries=max_entries, ttl=ttl)
+        self._lock = threading.Lock()
+        self.version = None
+    
+    def get(self, action_name: Text, entities: Tuple, version: int) -> Optional[Text]:
+        """Renvoie la réponse en cache, ou None"""
+        if version != self.version:
+            with self._lock:
+                if version != self.version:
+                    self._cache.clear()
+                    self.version = version
+            return None
+        return self._cache.get((action_name, entities))
+    
+    def set(self, action_name: Text, entities: Tuple, version: int, response: Text) -> None:
+        """Met en cache une réponse rendue à partir de la version donnée des données"""
+        with self._lock:
+            # Une réponse rendue avant un rechargement ne doit pas survivre au vidage du cache
+            if version == self.version:
+                self._cache.set((action_name, entities), response)
+    
+    def clear(self) -> None:
+        """Vide le cache"""
+        with self._lock:
+            self._cache.clear()
+    
+    def stats(self) -> Dict[Text, Any]:
+        """Compteurs du cache (succès, échecs, évictions...)"""
+        return {**self._cache.stats(), "version": self.version}
+
+response_cache = ResponseCache(max_entries=ESG_RESPONSE_CACHE_SIZE, ttl=ESG_RESPONSE_CACHE_TTL)
+
+for _counter in ("hits", "misses", "evictions"):
+    REGISTRY.counter_function(
+        f"esg_response_cache_{_counter}_total",
+        f"Cache des réponses des actions: {_counter}",
+        functools.partial(lambda counter: response_cache.stats()[counter], _counter)
+    )
+
+class MemoizedResponseAction(Action, ABC):
+    """
+    Action dont la réponse ne dépend que de ses entités et des tables de l'adaptateur
+    
+    run() extrait les entités, puis sert la réponse depuis response_cache
+    ou la rend avec render() et la met en cache. Les sous-classes
+    implémentent name(), extract_entities() et render(). La classe est
+    abstraite pour que rasa_sdk ne l'enregistre pas comme une action.
+    
+    render() reçoit les entités telles que saisies: elles sont normalisées
+    pour les recherches, mais affichées sans modification. La clé du cache
+    contient les valeurs normalisées et leur forme affichée, pour qu'une
+    réponse ne montre jamais l'orthographe d'un autre utilisateur.
+    """
+    
+    # Réponse envoyée en cas d'erreur technique (jamais mise en cache)
+    error_response = "Je n'ai pas pu répondre en raison d'une erreur technique. Veuillez réessayer plus tard."
+    
+    def extract_entities(self, tracker: Tracker) -> Tuple:
+        """Extrait du dernier message les entités utiles, telles que saisies (sans espaces superflus)"""
+        return ()
+    
+    @staticmethod
+    def cache_key(entities: Tuple) -> Tuple:
+        """Clé du cache des réponses: entités normalisées, puis leur forme affichée"""
+        return tuple(normalize_entity(entity) for entity in entities), entities
+    
+    @abstractmethod
+    async def render(self, esg_adapter, *entities) -> Text:
+        """Récupère les données et construit la réponse"""
+    
+    @instrumented
+    @profiled(action_profile_tag)
+    async def run(self, dispatcher: CollectingDispatcher,
             tracker: Tracker,
             domain: Dict[Text, Any]) -> List[Dict[Text, Any]]:
         
-        logger.info("ActionGetEmissionsCO2 appelée")
+        logger.info(f"{type(self).__name__} appelée")
         
-        # Extraire la période des entités
-        periode = next(tracker.get_latest_entity_values("periode"), None)
-        logger.info(f"Période extraite: {periode}")
+        entities = self.extract_entities(tracker)
+        logger.info(f"Entités extraites: {entities}")
         
         try:
-            # Récupérer les données via l'adaptateur
-            emissions = esg_adapter.get_emissions_data(periode)
-            logger.info(f"Émissions récupérées: {emissions}")
-            
-            if emissions:
-                periode_text = f"pour {periode}" if periode else "au dernier trimestre"
-                response = f"D'après nos données, les émissions de CO₂ {periode_text} étaient de {emissions:,} tonnes."
-                
-                # Ajouter une comparaison avec la période précédente
-                if periode and periode.lower() == "dernier trimestre":
-                    response += " C'est une réduction de 8% par rapport au trimestre précédent."
-                elif periode and periode.lower() == "ce mois-ci":
-                    response += " C'est une augmentation de 5% par rapport au mois précédent."
-            else:
-                response = "Je n'ai pas pu récupérer les données d'émissions de CO₂. Veuillez réessayer plus tard."
+            esg_adapter = await aget_esg_adapter()
+            version = esg_adapter.data_version
+            key = self.cache_key(entities)
+            response = response_cache.get(self.name(), key, version)
+            if response is None:
+                response = await self.render(esg_adapter, *entities)
+                response_cache.set(self.name(), key, version, response)
         except Exception as e:
-            logger.error(f"Erreur lors de la récupération des émissions: {e}")
-            response = "Je n'ai pas pu récupérer les données d'émissions de CO₂ en raison d'une erreur technique. Veuillez réessayer plus tard."
+            logger.error(f"Erreur lors de l'exécution de {self.name()}: {e}")
+            ACTION_ERRORS.inc(action=self.name())
+            response = self.error_response
         
         dispatcher.utter_message(text=response)
         return []
 
-class ActionGetParite(Action):
+def normalize_entity(value: Optional[Text]) -> Optional[Text]:
+    """Normalise la valeur d'une entité pour les recherches (espaces superflus, casse)"""
+    return value.strip().lower() if value else None
+
+def entity_value(tracker: Tracker, entity: Text) -> Optional[Text]:
+    """Dernière valeur d'une entité, telle que saisie (sans espaces superflus)"""
+    value = next(tracker.get_latest_entity_values(entity), None)
+    return value.strip() or None if value else None
+
+class ActionGetEmissionsCO2(MemoizedResponseAction):
+    error_response = "Je n'ai pas pu récupérer les données d'émissions de CO₂ en raison d'une erreur technique. Veuillez réessayer plus tard."
+    
     def name(self) -> Text:
-        return "action_get_parite"
+        return "action_get_emissions_co2"
     
-    def run(self, dispatcher: CollectingDispatcher,
-            tracker: Tracker,
-            domain: Dict[Text, Any]) -> List[Dict[Text, Any]]:
+    def extract_entities(self, tracker: Tracker) -> Tuple:
+        # Extraire la période des entités
+        return (entity_value(tracker, "periode"),)
+    
+    async def render(self, esg_adapter, periode) -> Text:
+        # Récupérer les données via l'adaptateur
+        emissions = await esg_adapter.aget_emissions_data(periode)
+        logger.info(f"Émissions récupérées: {emissions}")
         
-        logger.info("ActionGetParite appelée")
+        if not emissions:
+            return "Je n'ai pas pu récupérer les données d'émissions de CO₂. Veuillez réessayer plus tard."
         
+        periode_text = f"pour {periode}" if periode else "au dernier trimestre"
+        response = f"D'après nos données, les émissions de CO₂ {periode_text} étaient de {emissions:,} tonnes."
+        
+        # Ajouter une comparaison avec la période précédente
+        if normalize_entity(periode) == "dernier trimestre":
+            response += " C'est une réduction de 8% par rapport au trimestre précédent."
+        elif normalize_entity(periode) == "ce mois-ci":
+            response += " C'est une augmentation de 5% par rapport au mois précédent."
+        return response
+
+class ActionGetParite(MemoizedResponseAction):
+    error_response = "Je n'ai pas pu récupérer les données de parité en raison d'une erreur technique. Veuillez réessayer plus tard."
+    
+    def name(self) -> Text:
+        return "action_get_parite"
+    
+    def extract_entities(self, tracker: Tracker) -> Tuple:
         # Extraire le département des entités
-        departement = next(tracker.get_latest_entity_values("departement"), None)
-        logger.info(f"Département extrait: {departement}")
+        return (entity_value(tracker, "departement"),)
+    
+    async def render(self, esg_adapter, departement) -> Text:
+        # Récupérer les données via l'adaptateur
+        parite_data = await esg_adapter.aget_parite_data(departement)
+        logger.info(f"Données de parité récupérées: {parite_data}")
         
-        try:
-            # Récupérer les données via l'adaptateur
-            parite_data = esg_adapter.get_parite_data(departement)
-            logger.info(f"Données de parité récupérées: {parite_data}")
-            
-            if parite_data:
-                if departement and departement.lower() in parite_data:
-                    taux = parite_data[departement.lower()] * 100
-                    response = f"Le taux de parité hommes-femmes dans le département {departement} est de {taux:.1f}% de femmes."
-                else:
-                    response = "Le taux de parité hommes-femmes global est de 42% de femmes. Par département: "
-                    details = [f"{dept.capitalize()}: {taux*100:.0f}%" for dept, taux in parite_data.items() if dept != "global"]
-                    response += ", ".join(details) + "."
-            else:
-                response = "Je n'ai pas pu récupérer les données de parité. Veuillez réessayer plus tard."
-        except Exception as e:
-            logger.error(f"Erreur lors de la récupération des données de parité: {e}")
-            response = "Je n'ai pas pu récupérer les données de parité en raison d'une erreur technique. Veuillez réessayer plus tard."
+        if not parite_data:
+            return "Je n'ai pas pu récupérer les données de parité. Veuillez réessayer plus tard."
         
-        dispatcher.utter_message(text=response)
-        return []
+        if departement and normalize_entity(departement) in parite_data:
+            taux = parite_data[normalize_entity(departement)] * 100
+            return f"Le taux de parité hommes-femmes dans le département {departement} est de {taux:.1f}% de femmes."
+        
+        response = "Le taux de parité hommes-femmes global est de 42% de femmes. Par département: "
+        details = [f"{dept.capitalize()}: {taux*100:.0f}%" for dept, taux in parite_data.items() if dept != "global"]
+        return response + ", ".join(details) + "."
 
-class ActionGetFormationRSE(Action):
+class ActionGetFormationRSE(MemoizedResponseAction):
+    error_response = "Je n'ai pas pu récupérer les données de formation RSE en raison d'une erreur technique. Veuillez réessayer plus tard."
+    
     def name(self) -> Text:
         return "action_get_formation_rse"
     
-    def run(self, dispatcher: CollectingDispatcher,
-            tracker: Tracker,
-            domain: Dict[Text, Any]) -> List[Dict[Text, Any]]:
-        
-        logger.info("ActionGetFormationRSE appelée")
-        
+    def extract_entities(self, tracker: Tracker) -> Tuple:
         # Extraire la période des entités
-        periode = next(tracker.get_latest_entity_values("periode"), None)
-        logger.info(f"Période extraite: {periode}")
+        return (entity_value(tracker, "periode"),)
+    
+    async def render(self, esg_adapter, periode) -> Text:
+        # Récupérer les données via l'adaptateur
+        heures = await esg_adapter.aget_formation_data(periode)
+        logger.info(f"Heures de formation récupérées: {heures}")
         
-        try:
-            # Récupérer les données via l'adaptateur
-            heures = esg_adapter.get_formation_data(periode)
-            logger.info(f"Heures de formation récupérées: {heures}")
-            
-            if heures:
-                periode_text = f"{periode}" if periode else "ce mois-ci"
-                response = f"{heures} heures de formation RSE ont été suivies {periode_text}."
-                
-                # Ajouter une tendance
-                if periode and periode.lower() == "ce mois-ci":
-                    response += " C'est une augmentation de 15% par rapport au mois précédent."
-                elif periode and periode.lower() == "cette année":
-                    response += " Nous avons déjà atteint 73% de notre objectif annuel."
-            else:
-                response = "Je n'ai pas pu récupérer les données de formation RSE. Veuillez réessayer plus tard."
-        except Exception as e:
-            logger.error(f"Erreur lors de la récupération des données de formation: {e}")
-            response = "Je n'ai pas pu récupérer les données de formation RSE en raison d'une erreur technique. Veuillez réessayer plus tard."
+        if not heures:
+            return "Je n'ai pas pu récupérer les données de formation RSE. Veuillez réessayer plus tard."
         
-        dispatcher.utter_message(text=response)
-        return []
+        periode_text = f"{periode}" if periode else "ce mois-ci"
+        response = f"{heures} heures de formation RSE ont été suivies {periode_text}."
+        
+        # Ajouter une tendance
+        if normalize_entity(periode) == "ce mois-ci":
+            response += " C'est une augmentation de 15% par rapport au mois précédent."
+        elif normalize_entity(periode) == "cette année":
+            response += " Nous avons déjà atteint 73% de notre objectif annuel."
+        return response
 
-class ActionGetScoreFournisseurs(Action):
+class ActionGetScoreFournisseurs(MemoizedResponseAction):
+    error_response = "Je n'ai pas pu récupérer les données des scores ESG des fournisseurs en raison d'une erreur technique. Veuillez réessayer plus tard."
+    
     def name(self) -> Text:
         return "action_get_score_fournisseurs"
     
-    def run(self, dispatcher: CollectingDispatcher,
+    async def render(self, esg_adapter) -> Text:
+        # Récupérer les données via l'adaptateur
+        fournisseurs = await esg_adapter.aget_fournisseurs_data()
+        logger.info(f"Données des fournisseurs récupérées: {fournisseurs}")
+        
+        if not fournisseurs:
+            return "Je n'ai pas pu récupérer les données des scores ESG des fournisseurs. Veuillez réessayer plus tard."
+        
+        response = "Les fournisseurs avec un score ESG faible cette année sont: "
+        details = [f"{fournisseur} (score {score}/100)" for fournisseur, score in fournisseurs.items()]
+        response += ", ".join(details) + "."
+        response += " Nous avons mis en place des plans d'action avec ces fournisseurs pour améliorer leurs performances ESG."
+        return response
+
+class ActionCompareEmpreinteCarbone(MemoizedResponseAction):
+    error_response = "Je n'ai pas pu comparer l'empreinte carbone en raison d'une erreur technique. Veuillez réessayer plus tard."
+    
+    def name(self) -> Text:
+        return "action_compare_empreinte_carbone"
+    
+    def extract_entities(self, tracker: Tracker) -> Tuple:
+        # Extraire les pays des entités
+        pays_entities = [pays.strip() for pays in tracker.get_latest_entity_values("pays") if pays and pays.strip()]
+        if len(pays_entities) >= 2:
+            return pays_entities[0], pays_entities[1]
+        # Valeurs par défaut si les pays ne sont pas spécifiés
+        return "france", "allemagne"
+    
+    async def render(self, esg_adapter, pays1, pays2) -> Text:
+        # Récupérer les données via l'adaptateur
+        empreintes = await esg_adapter.aget_empreinte_carbone(pays1, pays2)
+        logger.info(f"Empreintes carbone récupérées: {empreintes}")
+        
+        if not empreintes or len(empreintes) != 2:
+            return "Je n'ai pas pu comparer l'empreinte carbone entre les pays spécifiés. Veuillez vérifier que les pays sont bien dans notre base de données."
+        
+        pays_list = list(empreintes.keys())
+        diff = abs(empreintes[pays_list[0]] - empreintes[pays_list[1]])
+        pourcentage = diff / max(empreintes.values()) * 100
+        
+        response = f"L'empreinte carbone de nos sites en {pays_list[0].capitalize()} est de {empreintes[pays_list[0]]:,} tonnes de CO₂ contre {empreintes[pays_list[1]]:,} tonnes pour nos sites en {pays_list[1].capitalize()}. "
+        
+        if empreintes[pays_list[0]] < empreintes[pays_list[1]]:
+            response += f"Les sites en {pays_list[0].capitalize()} émettent {pourcentage:.1f}% moins de CO₂. "
+        else:
+            response += f"Les sites en {pays_list[0].capitalize()} émettent {pourcentage:.1f}% plus de CO₂. "
+        
+        response += "La différence s'explique principalement par le mix énergétique et l'efficacité des installations."
+        return response
+
+class ActionGetCompanyESGRating(Action):
+    def name(self) -> Text:
+        return "action_get_company_esg_rating"
+    
+    @instrumented
+    @profiled(action_profile_tag)
+    async def run(self, dispatcher: CollectingDispatcher,
             tracker: Tracker,
             domain: Dict[Text, Any]) -> List[Dict[Text, Any]]:
         
-        logger.info("ActionGetScoreFournisseurs appelée")
+        logger.info("ActionGetCompanyESGRating appelée")
         
+        # Extraire l'entreprise des entités (ou du slot, si elle a été citée plus tôt)
+        company = next(tracker.get_latest_entity_values("company"), None) or tracker.get_slot("company")
+        logger.info(f"Entreprise extraite: {company}")
+        
+        if not company:
+            dispatcher.utter_message(text="De quelle entreprise souhaitez-vous connaître la notation ESG ?")
+            return []
+        
+        company_symbol = resolve_company_symbol(company)
         try:
             # Récupérer les données via l'adaptateur
-            fournisseurs = esg_adapter.get_fournisseurs_data()
-            logger.info(f"Données des fournisseurs récupérées: {fournisseurs}")
+            esg_adapter = await aget_esg_adapter()
+            companies_data = await esg_adapter.aget_companies_esg_data([company_symbol])
+            logger.info(f"Données ESG récupérées: {companies_data}")
             
-            if fournisseurs:
-                response = "Les fournisseurs avec un score ESG faible cette année sont: "
-                details = [f"{fournisseur} (score {score}/100)" for fournisseur, score in fournisseurs.items()]
-                response += ", ".join(details) + "."
-                response += " Nous avons mis en place des plans d'action avec ces fournisseurs pour améliorer leurs performances ESG."
+            if company_symbol in companies_data:
+                response = f"Notation ESG de {format_company_rating(company_symbol, companies_data[company_symbol])}."
             else:
-                response = "Je n'ai pas pu récupérer les données des scores ESG des fournisseurs. Veuillez réessayer plus tard."
+                response = f"Je n'ai pas pu récupérer les données ESG de {company}. Veuillez réessayer plus tard."
         except Exception as e:
-            logger.error(f"Erreur lors de la récupération des scores fournisseurs: {e}")
-            response = "Je n'ai pas pu récupérer les données des scores ESG des fournisseurs en raison d'une erreur technique. Veuillez réessayer plus tard."
+            logger.error(f"Erreur lors de la récupération des données ESG de {company}: {e}")
+            ACTION_ERRORS.inc(action=self.name())
+            response = "Je n'ai pas pu récupérer la notation ESG en raison d'une erreur technique. Veuillez réessayer plus tard."
         
         dispatcher.utter_message(text=response)
         return []
 
-class ActionCompareEmpreinteCarbone(Action):
+class ActionCompareCompaniesESG(Action):
     def name(self) -> Text:
-        return "action_compare_empreinte_carbone"
+        return "action_compare_companies_esg"
     
-    def run(self, dispatcher: CollectingDispatcher,
+    @instrumented
+    @profiled(action_profile_tag)
+    async def run(self, dispatcher: CollectingDispatcher,
             tracker: Tracker,
             domain: Dict[Text, Any]) -> List[Dict[Text, Any]]:
         
-        logger.info("ActionCompareEmpreinteCarbone appelée")
+        logger.info("ActionCompareCompaniesESG appelée")
         
-        # Extraire les pays des entités
-        pays_entities = list(tracker.get_latest_entity_values("pays"))
-        logger.info(f"Pays extraits: {pays_entities}")
+        # Extraire les entreprises des entités
+        company_entities = list(tracker.get_latest_entity_values("company"))
+        logger.info(f"Entreprises extraites: {company_entities}")
         
-        if len(pays_entities) >= 2:
-            pays1, pays2 = pays_entities[0], pays_entities[1]
-        else:
-            # Valeurs par défaut si les pays ne sont pas spécifiés
-            pays1, pays2 = "france", "allemagne"
+        company_symbols = list(dict.fromkeys(resolve_company_symbol(company) for company in company_entities))
+        if len(company_symbols) < 2:
+            dispatcher.utter_message(text="Veuillez préciser au moins deux entreprises à comparer.")
+            return []
         
         try:
-            # Récupérer les données via l'adaptateur
-            empreintes = esg_adapter.get_empreinte_carbone(pays1, pays2)
-            logger.info(f"Empreintes carbone récupérées: {empreintes}")
+            # Récupérer toutes les entreprises en un seul passage
+            esg_adapter = await aget_esg_adapter()
+            companies_data = await esg_adapter.aget_companies_esg_data(company_symbols)
+            logger.info(f"Données ESG récupérées pour {list(companies_data)}")
             
-            if empreintes and len(empreintes) == 2:
-                pays_list = list(empreintes.keys())
-                diff = abs(empreintes[pays_list[0]] - empreintes[pays_list[1]])
-                pourcentage = diff / max(empreintes.values()) * 100
-                
-                response = f"L'empreinte carbone de nos sites en {pays_list[0].capitalize()} est de {empreintes[pays_list[0]]:,} tonnes de CO₂ contre {empreintes[pays_list[1]]:,} tonnes pour nos sites en {pays_list[1].capitalize()}. "
+            if len(companies_data) >= 2:
+                ranking = sorted(companies_data, key=lambda symbol: company_esg_rank(companies_data[symbol]))
+                details = [format_company_rating(symbol, companies_data[symbol]) for symbol in ranking]
+                response = "Comparaison ESG, de la meilleure à la moins bonne performance: " + "; ".join(details) + "."
                 
-                if empreintes[pays_list[0]] < empreintes[pays_list[1]]:
-                    response += f"Les sites en {pays_list[0].capitalize()} émettent {pourcentage:.1f}% moins de CO₂. "
-                else:
-                    response += f"Les sites en {pays_list[0].capitalize()} émettent {pourcentage:.1f}% plus de CO₂. "
-                
-                response += "La différence s'explique principalement par le mix énergétique et l'efficacité des installations."
+                missing = [symbol for symbol in company_symbols if symbol not in companies_data]
+                if missing:
+                    response += f" Données indisponibles pour: {', '.join(missing)}."
             else:
-                response = "Je n'ai pas pu comparer l'empreinte carbone entre les pays spécifiés. Veuillez vérifier que les pays sont bien dans notre base de données."
+                response = "Je n'ai pas pu récupérer suffisamment de données pour comparer ces entreprises. Veuillez réessayer plus tard."
         except Exception as e:
-            logger.error(f"Erreur lors de la comparaison d'empreinte carbone: {e}")
-            response = "Je n'ai pas pu comparer l'empreinte carbone en raison d'une erreur technique. Veuillez réessayer plus tard."
+            logger.error(f"Erreur lors de la comparaison ESG des entreprises: {e}")
+            ACTION_ERRORS.inc(action=self.name())
+            response = "Je n'ai pas pu comparer les entreprises en raison d'une erreur technique. Veuillez réessayer plus tard."
         
         dispatcher.utter_message(text=response)
         return []
+
+def start_metrics() -> None:
+    """Ouvre l'endpoint /metrics sur ESG_METRICS_PORT (sans effet s'il n'est pas défini)"""
+    if not ESG_METRICS_PORT:
+        return
+    try:
+        start_metrics_server(ESG_METRICS_PORT, ESG_METRICS_HOST)
+    except OSError as e:
+        logger.warning(f"Impossible d'exposer les métriques sur le port {ESG_METRICS_PORT}: {e}")
+
+start_metrics()
+
+if ESG_ACTIONS_WARMUP:
+    warm_up()
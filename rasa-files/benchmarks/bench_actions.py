@@ -0,0 +1,244 @@
+"""
+Micro-benchmarks des actions Rasa (actions/actions.py)
+
+Chaque action est exécutée dans le processus, sur des Tracker synthétiques
+couvrant les combinaisons d'entités (periode, departement, pays, company)
+et un CollectingDispatcher: ni serveur Rasa ni réseau ne sont nécessaires.
+Pour chaque action, le script affiche les latences p50/p95/p99, le débit
+et la mémoire allouée par appel, et compare le p95 au fichier de référence.
+
+Utilisation (depuis rasa-files/):
+    python benchmarks/bench_actions.py
+    python benchmarks/bench_actions.py --no-response-cache
+    python benchmarks/bench_actions.py --save-baseline
+"""
+import os
+import sys
+import json
+import time
+import asyncio
+import logging
+import argparse
+import tempfile
+import itertools
+import tracemalloc
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+
+# Les données sont générées dans un répertoire temporaire (supprimé en fin
+# d'exécution), sans rechargement à chaud
+TEMP_DATA_DIR = None
+if "ESG_DATA_DIR" not in os.environ:
+    TEMP_DATA_DIR = tempfile.TemporaryDirectory(prefix="esg-bench-")
+    os.environ["ESG_DATA_DIR"] = os.path.join(TEMP_DATA_DIR.name, "esg_data")
+os.environ.setdefault("ESG_HOT_RELOAD", "0")
+os.environ["ESG_ACTIONS_WARMUP"] = "0"
+os.environ.setdefault("ESG_METRICS_PORT", "0")
+sys.path.insert(0, ROOT_DIR)
+
+from rasa_sdk.executor import CollectingDispatcher
+from actions import actions
+
+# Valeurs d'entités testées (None: entité absente, "inconnu": valeur hors des tables)
+PERIODES = [None, "dernier trimestre", "ce mois-ci", "cette année", "2023", "Q2", "inconnu"]
+DEPARTEMENTS = [None, "finance", "R&D", "marketing", "service client", "inconnu"]
+PAYS = ["france", "allemagne", "Espagne", "italie", "suisse", "inconnu"]
+COMPANIES = ["Apple", "MSFT", "google", "AMZN", "tesla"]
+
+def entity_permutations(action_name):
+    """
+    Combinaisons d'entités utilisées pour une action
+    
+    Args:
+        action_name (str): Nom de l'action
+    
+    Returns:
+        list: Dictionnaires {entité: valeur ou liste de valeurs}
+    """
+    if action_name in ("action_get_emissions_co2", "action_get_formation_rse"):
+        return [{"periode": periode} if periode else {} for periode in PERIODES]
+    if action_name == "action_get_parite":
+        return [{"departement": departement} if departement else {} for departement in DEPARTEMENTS]
+    if action_name == "action_compare_empreinte_carbone":
+        return [{}] + [{"pays": list(pair)} for pair in itertools.permutations(PAYS, 2)]
+    if action_name == "action_get_company_esg_rating":
+        return [{}] + [{"company": company} for company in COMPANIES]
+    if action_name == "action_compare_companies_esg":
+        return [{"company": list(group)} for size in (2, 3, 5) for group in itertools.combinations(COMPANIES, size)]
+    return [{}]
+
+def percentile(sorted_values, fraction):
+    """Percentile (méthode du rang le plus proche) d'une liste triée"""
+    index = min(len(sorted_values) - 1, max(0, round(fraction * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+async def bench_action(action, trackers, iterations, use_response_cache=True):
+    """
+    Mesure la latence et la mémoire allouée d'une action
+    
+    Args:
+        action (Action): L'action à exécuter
+        trackers (list): Tracker synthétiques, utilisés à tour de rôle
+        iterations (int): Nombre d'appels mesurés
+        use_response_cache (bool): Si False, le cache des réponses est vidé avant chaque appel
+    
+    Returns:
+        dict: Latences (µs), débit (ops/s) et mémoire allouée par appel (Kio)
+    """
+    domain = {}
+    timings = []
+    
+    # Passe chronométrée
+    for i in range(iterations):
+        tracker = trackers[i % len(trackers)]
+        if not use_response_cache:
+            actions.response_cache.clear()
+        start = time.perf_counter_ns()
+        await action.run(CollectingDispatcher(), tracker, domain)
+        timings.append(time.perf_counter_ns() - start)
+    
+    # Passe instrumentée (tracemalloc ralentit l'exécution: elle n'est pas chronométrée)
+    allocated = []
+    tracemalloc.start()
+    try:
+        for i in range(min(iterations, 200)):
+            tracker = trackers[i % len(trackers)]
+            if not use_response_cache:
+                actions.response_cache.clear()
+            tracemalloc.reset_peak()
+            before, _ = tracemalloc.get_traced_memory()
+            await action.run(CollectingDispatcher(), tracker, domain)
+            _, peak = tracemalloc.get_traced_memory()
+            allocated.append(peak - before)
+    finally:
+        tracemalloc.stop()
+    
+    timings.sort()
+    total_seconds = sum(timings) / 1e9
+    return {
+        "iterations": iterations,
+        "p50_us": round(percentile(timings, 0.50) / 1000, 1),
+        "p95_us": round(percentile(timings, 0.95) / 1000, 1),
+        "p99_us": round(percentile(timings, 0.99) / 1000, 1),
+        "ops_per_sec": round(iterations / total_seconds) if total_seconds else None,
+        "alloc_kib_per_op": round(sum(allocated) / len(allocated) / 1024, 2)
+    }
+
+async def run_benchmarks(iterations, warmup, use_response_cache=True, selected=None):
+    """
+    Exécute les micro-benchmarks de toutes les actions
+    
+    Args:
+        iterations (int): Nombre d'appels mesurés par action
+        warmup (int): Nombre d'appels de préchauffage par action (non mesurés)
+        use_response_cache (bool): Si False, chaque appel rend sa réponse
+        selected (list, optional): Noms des actions à mesurer (toutes par défaut)
+    
+    Returns:
+        dict: {nom de l'action: résultats}
+    """
+    await actions.aget_esg_adapter()
+    results = {}
+    for action_class in actions.action_classes():
+        action = action_class()
+        if selected and action.name() not in selected:
+            continue
+        trackers = [actions.build_synthetic_tracker(entities, sender_id=f"bench-{i}")
+                    for i, entities in enumerate(entity_permutations(action.name()))]
+        for i in range(warmup):
+            await action.run(CollectingDispatcher(), trackers[i % len(trackers)], {})
+        results[action.name()] = await bench_action(action, trackers, iterations, use_response_cache)
+    return results
+
+def compare_to_baseline(results, baseline, tolerance):
+    """
+    Compare le p95 de chaque action à la référence
+    
+    Args:
+        results (dict): Résultats du benchmark
+        baseline (dict): Résultats de référence
+        tolerance (float): Dégradation relative tolérée (0.5 = +50%)
+    
+    Returns:
+        list: Messages décrivant les régressions
+    """
+    regressions = []
+    for action_name, result in results.items():
+        reference = baseline.get(action_name)
+        if not reference:
+            continue
+        limit = reference["p95_us"] * (1 + tolerance)
+        if result["p95_us"] > limit:
+            regressions.append(
+                f"{action_name}: p95 {result['p95_us']}µs > {limit:.1f}µs "
+                f"(référence {reference['p95_us']}µs, tolérance {tolerance:.0%})"
+            )
+    return regressions
+
+def print_results(results, baseline=None):
+    """Affiche les résultats sous forme de tableau"""
+    header = f"{'action':<36}{'p50 µs':>10}{'p95 µs':>10}{'p99 µs':>10}{'ops/s':>10}{'Kio/op':>9}"
+    if baseline:
+        header += f"{'p95 réf.':>10}"
+    print(header)
+    print("-" * len(header))
+    for action_name, result in results.items():
+        line = (f"{action_name:<36}{result['p50_us']:>10}{result['p95_us']:>10}{result['p99_us']:>10}"
+                f"{result['ops_per_sec']:>10}{result['alloc_kib_per_op']:>9}")
+        if baseline:
+            reference = baseline.get(action_name, {}).get("p95_us", "-")
+            line += f"{reference:>10}"
+        print(line)
+
+def main():
+    parser = argparse.ArgumentParser(description="Micro-benchmarks des actions Rasa")
+    parser.add_argument("--iterations", type=int, default=2000, help="Appels mesurés par action")
+    parser.add_argument("--warmup", type=int, default=100, help="Appels de préchauffage par action")
+    parser.add_argument("--action", action="append", help="Action à mesurer (répétable, toutes par défaut)")
+    parser.add_argument("--no-response-cache", action="store_true",
+                        help="Vide le cache des réponses avant chaque appel")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE, help="Fichier de référence")
+    parser.add_argument("--save-baseline", action="store_true", help="Enregistre les résultats comme référence")
+    parser.add_argument("--tolerance", type=float, default=0.5, help="Dégradation du p95 tolérée (0.5 = +50%%)")
+    parser.add_argument("--json", action="store_true", help="Affiche les résultats en JSON")
+    args = parser.parse_args()
+    
+    # Les journaux des actions fausseraient les mesures
+    logging.disable(logging.INFO)
+    
+    use_response_cache = not args.no_response_cache
+    results = asyncio.run(run_benchmarks(args.iterations, args.warmup, use_response_cache, args.action))
+    
+    mode = "response_cache" if use_response_cache else "no_response_cache"
+    baselines = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            baselines = json.load(f)
+    baseline = baselines.get(mode, {})
+    
+    if args.json:
+        print(json.dumps({mode: results}, ensure_ascii=False, indent=2))
+    else:
+        print_results(results, baseline)
+    
+    if args.save_baseline:
+        baselines[mode] = {**baseline, **results}
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(baselines, f, ensure_ascii=False, indent=2)
+            f.write("\n")
+        print(f"Référence enregistrée dans {args.baseline} ({mode})")
+        return 0
+    
+    regressions = compare_to_baseline(results, baseline, args.tolerance)
+    for regression in regressions:
+        print(f"RÉGRESSION {regression}")
+    return 1 if regressions else 0
+
+if __name__ == "__main__":
+    try:
+        status = main()
+    finally:
+        if TEMP_DATA_DIR is not None:
+            TEMP_DATA_DIR.cleanup()
+    sys.exit(status)
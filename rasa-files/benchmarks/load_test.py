@@ -0,0 +1,442 @@
+"""
+Test de charge de bout en bout du webhook REST de Rasa
+
+Les exemples de data/nlu.yml sont assemblés en conversations réalistes
+(salutation, questions ESG, au revoir) puis rejoués par N utilisateurs
+concurrents contre /webhooks/rest/webhook, comme le fait le tableau de
+bord. Le script affiche le débit, les latences p50/p95/p99, le taux
+d'erreur et la répartition du temps par action.
+
+Avec --stub, un serveur local remplace Rasa: il reconnaît l'intention à
+partir des exemples, exécute directement les actions de actions/actions.py
+et renvoie leur durée dans les en-têtes X-Action-Name/X-Action-Duration-Ms.
+Le harnais peut ainsi être testé sans Rasa ni réseau.
+
+Utilisation (depuis rasa-files/):
+    python benchmarks/load_test.py --users 20 --conversations 200
+    python benchmarks/load_test.py --stub --users 50 --duration 30
+"""
+import os
+import re
+import sys
+import json
+import time
+import random
+import asyncio
+import logging
+import argparse
+import tempfile
+import itertools
+import threading
+import urllib.error
+import urllib.request
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_NLU = os.path.join(ROOT_DIR, "data", "nlu.yml")
+DEFAULT_URL = "http://localhost:5005/webhooks/rest/webhook"
+
+# Action personnalisée déclenchée par chaque intention (les autres n'utilisent que des réponses utter_*)
+INTENT_ACTIONS = {
+    "ask_emissions_co2": "action_get_emissions_co2",
+    "ask_parite": "action_get_parite",
+    "ask_formation_rse": "action_get_formation_rse",
+    "ask_score_fournisseurs": "action_get_score_fournisseurs",
+    "ask_compare_empreinte_carbone": "action_compare_empreinte_carbone",
+    "ask_company_esg_rating": "action_get_company_esg_rating",
+    "ask_compare_companies_esg": "action_compare_companies_esg"
+}
+
+# Annotation d'entité dans un exemple: [valeur](entité)
+ENTITY_ANNOTATION = re.compile(r"\[([^\]]+)\]\(([^)]+)\)")
+
+def load_nlu_examples(path):
+    """
+    Lit les exemples par intention d'un fichier nlu.yml
+    
+    La lecture se fait ligne à ligne et ignore tout ce qui n'est pas un bloc
+    "- intent: ... examples: |", ce qui tolère un fichier partiellement
+    invalide. Les annotations [valeur](entité) sont retirées du texte et
+    conservées comme entités.
+    
+    Args:
+        path (str): Chemin du fichier nlu.yml
+    
+    Returns:
+        dict: {intention: [(texte, {entité: [valeurs]})]}
+    """
+    examples = defaultdict(list)
+    intent = None
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            stripped = line.strip()
+            if line.startswith("- intent:"):
+                intent = line.split(":", 1)[1].strip()
+            elif intent and line.startswith("    - ") and stripped[2:]:
+                raw_text = stripped[2:]
+                entities = defaultdict(list)
+                for value, entity in ENTITY_ANNOTATION.findall(raw_text):
+                    entities[entity].append(value)
+                text = ENTITY_ANNOTATION.sub(r"\1", raw_text)
+                examples[intent].append((text, dict(entities)))
+            elif stripped and not line.startswith(" "):
+                # Fin du bloc de l'intention (autre clé ou texte hors YAML)
+                intent = None
+    return dict(examples)
+
+def build_conversation(examples, rng, min_turns=1, max_turns=4):
+    """
+    Construit une conversation: salutation, questions ESG puis au revoir
+    
+    Args:
+        examples (dict): Exemples par intention (voir load_nlu_examples)
+        rng (random.Random): Générateur aléatoire
+        min_turns (int): Nombre minimal de questions ESG
+        max_turns (int): Nombre maximal de questions ESG
+    
+    Returns:
+        list: [(intention, texte)]
+    """
+    questions = [intent for intent in examples if intent in INTENT_ACTIONS] or list(examples)
+    conversation = []
+    if "greet" in examples:
+        conversation.append(("greet", rng.choice(examples["greet"])[0]))
+    for _ in range(rng.randint(min_turns, max_turns)):
+        intent = rng.choice(questions)
+        conversation.append((intent, rng.choice(examples[intent])[0]))
+    if "goodbye" in examples:
+        conversation.append(("goodbye", rng.choice(examples["goodbye"])[0]))
+    return conversation
+
+def percentile(sorted_values, fraction):
+    """Percentile (méthode du rang le plus proche) d'une liste triée"""
+    if not sorted_values:
+        return None
+    index = min(len(sorted_values) - 1, max(0, round(fraction * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+class LoadTestStats:
+    """Résultats des requêtes, agrégés par action (thread-safe)"""
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.latencies = defaultdict(list)  # action -> [latence en ms]
+        self.action_durations = defaultdict(list)  # action -> [durée côté action en ms]
+        self.errors = defaultdict(int)  # type d'erreur -> nombre
+        self.requests = 0
+    
+    def record(self, action, latency_ms, action_duration_ms=None, error=None):
+        """
+        Enregistre une requête
+        
+        Args:
+            action (str): Action (ou intention) visée par le message
+            latency_ms (float): Latence mesurée par le client
+            action_duration_ms (float, optional): Durée de l'action rapportée par le serveur
+            error (str, optional): Type d'erreur
+        """
+        with self._lock:
+            self.requests += 1
+            if error:
+                self.errors[error] += 1
+                return
+            self.latencies[action].append(latency_ms)
+            if action_duration_ms is not None:
+                self.action_durations[action].append(action_duration_ms)
+    
+    def report(self, elapsed):
+        """
+        Résumé des résultats
+        
+        Args:
+            elapsed (float): Durée du test en secondes
+        
+        Returns:
+            dict: Débit, latences, taux d'erreur et répartition par action
+        """
+        with self._lock:
+            all_latencies = sorted(latency for values in self.latencies.values() for latency in values)
+            total_time = sum(all_latencies)
+            errors = sum(self.errors.values())
+            per_action = {}
+            for action, values in sorted(self.latencies.items()):
+                values = sorted(values)
+                durations = self.action_durations.get(action, [])
+                per_action[action] = {
+                    "requests": len(values),
+                    "p50_ms": round(percentile(values, 0.50), 2),
+                    "p95_ms": round(percentile(values, 0.95), 2),
+                    "mean_ms": round(sum(values) / len(values), 2),
+                    "time_share": round(sum(values) / total_time, 3) if total_time else 0,
+                    "action_mean_ms": round(sum(durations) / len(durations), 2) if durations else None
+                }
+            return {
+                "requests": self.requests,
+                "elapsed_s": round(elapsed, 2),
+                "throughput_rps": round(self.requests / elapsed, 1) if elapsed else None,
+                "p50_ms": round(percentile(all_latencies, 0.50), 2) if all_latencies else None,
+                "p95_ms": round(percentile(all_latencies, 0.95), 2) if all_latencies else None,
+                "p99_ms": round(percentile(all_latencies, 0.99), 2) if all_latencies else None,
+                "error_rate": round(errors / self.requests, 4) if self.requests else 0,
+                "errors": dict(self.errors),
+                "actions": per_action
+            }
+
+def send_message(url, sender, text, timeout):
+    """
+    Envoie un message au webhook REST, comme le tableau de bord
+    
+    Args:
+        url (str): URL du webhook
+        sender (str): Identifiant de la conversation
+        text (str): Message de l'utilisateur
+        timeout (float): Délai maximal en secondes
+    
+    Returns:
+        tuple: (messages du bot, en-têtes de la réponse)
+    """
+    body = json.dumps({"sender": sender, "message": text}).encode("utf-8")
+    request = urllib.request.Request(url, data=body, headers={"Content-Type": "application/json"}, method="POST")
+    with urllib.request.urlopen(request, timeout=timeout) as response:
+        return json.loads(response.read().decode("utf-8")), response.headers
+
+def run_user(user_id, url, examples, stats, deadline, conversations, counter, args):
+    """
+    Rejoue des conversations pour un utilisateur, jusqu'à l'échéance ou au nombre demandé
+    
+    Args:
+        user_id (int): Numéro de l'utilisateur
+        url (str): URL du webhook
+        examples (dict): Exemples par intention
+        stats (LoadTestStats): Résultats
+        deadline (float): Échéance (time.monotonic), ou None
+        conversations (int): Nombre total de conversations, ou None
+        counter (itertools.count): Compteur partagé des conversations lancées
+        args (argparse.Namespace): Options (délais, graine...)
+    """
+    rng = random.Random(args.seed * 1000 + user_id)
+    while True:
+        conversation_id = next(counter)
+        if conversations is not None and conversation_id >= conversations:
+            return
+        if deadline is not None and time.monotonic() >= deadline:
+            return
+        
+        sender = f"load-{user_id}-{conversation_id}"
+        for intent, text in build_conversation(examples, rng, args.min_turns, args.max_turns):
+            action = INTENT_ACTIONS.get(intent, f"utter ({intent})")
+            start = time.perf_counter()
+            try:
+                messages, headers = send_message(url, sender, text, args.timeout)
+            except urllib.error.HTTPError as e:
+                stats.record(action, 0, error=f"HTTP {e.code}")
+                continue
+            except (urllib.error.URLError, OSError) as e:
+                stats.record(action, 0, error=type(getattr(e, "reason", e)).__name__)
+                continue
+            latency_ms = (time.perf_counter() - start) * 1000
+            
+            if not messages:
+                stats.record(action, latency_ms, error="réponse vide")
+                continue
+            duration = headers.get("X-Action-Duration-Ms")
+            stats.record(headers.get("X-Action-Name") or action, latency_ms,
+                         float(duration) if duration else None)
+            
+            if args.think_time:
+                time.sleep(rng.uniform(0, args.think_time))
+
+class StubHTTPServer(ThreadingHTTPServer):
+    """Serveur HTTP du mode --stub, dimensionné pour de nombreux utilisateurs concurrents"""
+    
+    daemon_threads = True
+    request_queue_size = 256
+
+class StubRasaServer:
+    """
+    Serveur local remplaçant Rasa pour tester le harnais hors ligne
+    
+    L'intention est retrouvée à partir du texte exact des exemples de
+    nlu.yml; les entités sont celles annotées dans l'exemple ou, à défaut,
+    les valeurs des tables de l'adaptateur citées dans le message. Les
+    actions personnalisées s'exécutent dans le processus sur une boucle
+    asyncio dédiée.
+    """
+    
+    def __init__(self, examples, host="127.0.0.1", port=0):
+        """
+        Args:
+            examples (dict): Exemples par intention (voir load_nlu_examples)
+            host (str): Adresse d'écoute
+            port (int): Port d'écoute (0: port libre choisi par le système)
+        """
+        # Les données sont générées dans un répertoire temporaire, sans rechargement à chaud
+        os.environ.setdefault("ESG_DATA_DIR", os.path.join(tempfile.mkdtemp(prefix="esg-stub-"), "esg_data"))
+        os.environ.setdefault("ESG_HOT_RELOAD", "0")
+        os.environ.setdefault("ESG_METRICS_PORT", "0")
+        sys.path.insert(0, ROOT_DIR)
+        from actions import actions
+        
+        self.actions = actions
+        self.action_instances = {action_class().name(): action_class() for action_class in actions.action_classes()}
+        self.intents = {text: (intent, entities) for intent, values in examples.items() for text, entities in values}
+        self.loop = asyncio.new_event_loop()
+        self._loop_thread = threading.Thread(target=self.loop.run_forever, name="stub-rasa-loop", daemon=True)
+        
+        adapter = actions.get_esg_adapter()
+        self.entity_values = {
+            "periode": sorted({*adapter.scraper.emissions_data, *adapter.scraper.formation_data}, key=len, reverse=True),
+            "departement": sorted(adapter.scraper.parite_data, key=len, reverse=True),
+            "pays": sorted(adapter.scraper.empreinte_carbone, key=len, reverse=True),
+            "company": sorted(actions.COMPANY_SYMBOLS, key=len, reverse=True)
+        }
+        
+        stub = self
+        
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                length = int(self.headers.get("Content-Length") or 0)
+                payload = json.loads(self.rfile.read(length) or b"{}")
+                messages, action_name, duration_ms = stub.handle(payload.get("sender", "stub"), payload.get("message", ""))
+                body = json.dumps(messages, ensure_ascii=False).encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                if action_name:
+                    self.send_header("X-Action-Name", action_name)
+                    self.send_header("X-Action-Duration-Ms", f"{duration_ms:.3f}")
+                self.end_headers()
+                self.wfile.write(body)
+            
+            def log_message(self, format, *args):
+                pass
+        
+        self.server = StubHTTPServer((host, port), Handler)
+        self._server_thread = threading.Thread(target=self.server.serve_forever, name="stub-rasa-http", daemon=True)
+    
+    @property
+    def url(self):
+        """URL du webhook REST simulé"""
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}/webhooks/rest/webhook"
+    
+    def start(self):
+        """Démarre la boucle des actions et le serveur HTTP"""
+        self._loop_thread.start()
+        self._server_thread.start()
+    
+    def stop(self):
+        """Arrête le serveur HTTP et la boucle des actions"""
+        self.server.shutdown()
+        self.server.server_close()
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self._loop_thread.join()
+    
+    def extract_entities(self, text):
+        """Valeurs connues des tables citées dans le message"""
+        lowered = text.lower()
+        entities = defaultdict(list)
+        for entity, values in self.entity_values.items():
+            for value in values:
+                if value and re.search(rf"(?<!\w){re.escape(value.lower())}(?!\w)", lowered):
+                    entities[entity].append(value)
+        return dict(entities)
+    
+    def handle(self, sender, text):
+        """
+        Traite un message comme le ferait Rasa
+        
+        Args:
+            sender (str): Identifiant de la conversation
+            text (str): Message de l'utilisateur
+        
+        Returns:
+            tuple: (messages du bot, action exécutée ou None, durée de l'action en ms)
+        """
+        intent, entities = self.intents.get(text, ("nlu_fallback", {}))
+        action = self.action_instances.get(INTENT_ACTIONS.get(intent))
+        if action is None:
+            return [{"recipient_id": sender, "text": f"[{intent}]"}], None, 0
+        
+        tracker = self.actions.build_synthetic_tracker(entities or self.extract_entities(text), sender_id=sender)
+        dispatcher = self.actions.CollectingDispatcher()
+        start = time.perf_counter()
+        future = asyncio.run_coroutine_threadsafe(action.run(dispatcher, tracker, {}), self.loop)
+        future.result()
+        duration_ms = (time.perf_counter() - start) * 1000
+        messages = [{"recipient_id": sender, "text": message.get("text")} for message in dispatcher.messages]
+        return messages, action.name(), duration_ms
+
+def print_report(report):
+    """Affiche le résumé du test de charge"""
+    print(f"Requêtes: {report['requests']} en {report['elapsed_s']}s "
+          f"({report['throughput_rps']} req/s), taux d'erreur {report['error_rate']:.2%}")
+    print(f"Latence: p50 {report['p50_ms']} ms, p95 {report['p95_ms']} ms, p99 {report['p99_ms']} ms")
+    if report["errors"]:
+        print(f"Erreurs: {report['errors']}")
+    header = f"{'action':<36}{'requêtes':>10}{'p50 ms':>10}{'p95 ms':>10}{'moy. ms':>10}{'% temps':>9}{'action ms':>11}"
+    print(header)
+    print("-" * len(header))
+    for action, values in report["actions"].items():
+        action_ms = values["action_mean_ms"] if values["action_mean_ms"] is not None else "-"
+        print(f"{action:<36}{values['requests']:>10}{values['p50_ms']:>10}{values['p95_ms']:>10}"
+              f"{values['mean_ms']:>10}{values['time_share']:>9.1%}{action_ms:>11}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Test de charge du webhook REST de Rasa")
+    parser.add_argument("--url", default=DEFAULT_URL, help="URL du webhook REST")
+    parser.add_argument("--nlu", default=DEFAULT_NLU, help="Fichier nlu.yml dont les exemples sont rejoués")
+    parser.add_argument("--users", type=int, default=10, help="Nombre d'utilisateurs concurrents")
+    parser.add_argument("--conversations", type=int, default=100, help="Nombre total de conversations")
+    parser.add_argument("--duration", type=float, help="Durée du test en secondes (remplace --conversations)")
+    parser.add_argument("--min-turns", type=int, default=1, help="Nombre minimal de questions par conversation")
+    parser.add_argument("--max-turns", type=int, default=4, help="Nombre maximal de questions par conversation")
+    parser.add_argument("--think-time", type=float, default=0, help="Pause maximale entre deux messages (s)")
+    parser.add_argument("--timeout", type=float, default=30, help="Délai maximal d'une requête (s)")
+    parser.add_argument("--seed", type=int, default=0, help="Graine du générateur de conversations")
+    parser.add_argument("--stub", action="store_true", help="Remplace Rasa par un serveur local exécutant les actions")
+    parser.add_argument("--json", action="store_true", help="Affiche le résumé en JSON")
+    args = parser.parse_args()
+    
+    examples = load_nlu_examples(args.nlu)
+    if not examples:
+        print(f"Aucun exemple trouvé dans {args.nlu}")
+        return 1
+    
+    stub = None
+    url = args.url
+    if args.stub:
+        logging.disable(logging.INFO)
+        stub = StubRasaServer(examples)
+        stub.start()
+        url = stub.url
+    
+    stats = LoadTestStats()
+    counter = itertools.count()
+    deadline = time.monotonic() + args.duration if args.duration else None
+    conversations = None if args.duration else args.conversations
+    
+    start = time.perf_counter()
+    try:
+        with ThreadPoolExecutor(max_workers=args.users, thread_name_prefix="load-user") as executor:
+            futures = [
+                executor.submit(run_user, user_id, url, examples, stats, deadline, conversations, counter, args)
+                for user_id in range(args.users)
+            ]
+            for future in futures:
+                future.result()
+    finally:
+        if stub is not None:
+            stub.stop()
+    
+    report = stats.report(time.perf_counter() - start)
+    if args.json:
+        print(json.dumps(report, ensure_ascii=False, indent=2))
+    else:
+        print_report(report)
+    return 1 if report["requests"] and report["error_rate"] == 1 else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
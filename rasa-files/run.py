@@ -1,78 +1,325 @@
 import os
 import sys
+import glob
+import json
+import hashlib
+import argparse
 import logging
 import subprocess
-from scraper.esg_scraper import ESGScraper
+import importlib.util
+from concurrent.futures import ThreadPoolExecutor
+from importlib import metadata
+from supervisor import ActionSupervisor, DEFAULT_WORKERS
 
 # Configuration du logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Répertoire du projet Rasa (config.yml, domain.yml, data/)
+PROJECT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Répertoire des modèles entraînés
+MODELS_DIR = os.path.join(PROJECT_DIR, "models")
+
+# Configurations du pipeline: complète, et rapide pour les itérations de développement
+CONFIG_FILE = "config.yml"
+FAST_CONFIG_FILE = "config.fast.yml"
+
+# Fichiers dont dépend l'entraînement (en plus de la configuration)
+TRAINING_FILES = ["domain.yml", os.path.join("data", "*.yml")]
+
+# Fichiers dont une modification permet d'affiner le modèle précédent au lieu de tout réentraîner
+FINETUNE_FILES = {"data/nlu.yml"}
+
+# Fraction des epochs de la configuration utilisée pour l'affinage
+DEFAULT_EPOCH_FRACTION = 0.2
+
 def setup_environment():
     """Vérifie et configure l'environnement pour Rasa"""
     logger.info("Configuration de l'environnement...")
     
-    # Vérifier si Rasa est installé
-    try:
-        import rasa
-        logger.info(f"Rasa version {rasa.__version__} trouvée")
-    except ImportError:
+    # Vérifier si Rasa est installé (sans l'importer: l'import de rasa prend plusieurs secondes)
+    if importlib.util.find_spec("rasa") is not None:
+        logger.info(f"Rasa version {metadata.version('rasa')} trouvée")
+    else:
         logger.error("Rasa n'est pas installé. Installation en cours...")
         subprocess.run([sys.executable, "-m", "pip", "install", "rasa"])
     
     # Vérifier si les dépendances sont installées
-    try:
-        import requests
-        import bs4
-        import pandas
+    missing = [module for module in ("requests", "bs4", "pandas") if importlib.util.find_spec(module) is None]
+    if not missing:
         logger.info("Toutes les dépendances sont installées")
-    except ImportError as e:
-        logger.error(f"Dépendance manquante: {e}")
+    else:
+        logger.error(f"Dépendances manquantes: {', '.join(missing)}")
         logger.info("Installation des dépendances...")
         subprocess.run([sys.executable, "-m", "pip", "install", "requests", "beautifulsoup4", "pandas"])
 
 def scrape_initial_data():
     """Récupère les données initiales via web scraping"""
     logger.info("Récupération des données initiales...")
+    from scraper.esg_scraper import ESGScraper
     scraper = ESGScraper()
     data = scraper.run_all_scrapers()
     logger.info(f"Données récupérées avec succès: {len(data)} catégories")
     return data
 
-def train_model():
-    """Entraîne le modèle Rasa"""
-    logger.info("Entraînement du modèle Rasa...")
-    subprocess.run(["rasa", "train"])
+def rasa_version():
+    """Version de Rasa installée (None si Rasa est absent)"""
+    try:
+        return metadata.version("rasa")
+    except metadata.PackageNotFoundError:
+        return None
+
+def training_files(config=CONFIG_FILE):
+    """
+    Liste les fichiers dont dépend l'entraînement
+    
+    Args:
+        config (str): Fichier de configuration du pipeline
+    
+    Returns:
+        list: Chemins relatifs à PROJECT_DIR (séparateur "/"), triés
+    """
+    files = {config}
+    for pattern in TRAINING_FILES:
+        for path in glob.glob(os.path.join(PROJECT_DIR, pattern)):
+            files.add(os.path.relpath(path, PROJECT_DIR).replace(os.sep, "/"))
+    return sorted(files)
+
+def training_file_hashes(config=CONFIG_FILE):
+    """
+    Empreinte SHA-256 de chaque fichier d'entraînement
+    
+    Args:
+        config (str): Fichier de configuration du pipeline
+    
+    Returns:
+        dict: {chemin relatif: empreinte hexadécimale}
+    """
+    hashes = {}
+    for relative_path in training_files(config):
+        with open(os.path.join(PROJECT_DIR, relative_path), "rb") as f:
+            hashes[relative_path] = hashlib.sha256(f.read()).hexdigest()
+    return hashes
+
+def compute_fingerprint(config=CONFIG_FILE, hashes=None):
+    """
+    Empreinte des données d'entraînement, de la configuration et de la version de Rasa
+    
+    Args:
+        config (str): Fichier de configuration du pipeline
+        hashes (dict, optional): Empreintes des fichiers (calculées si absentes)
+    
+    Returns:
+        str: Empreinte hexadécimale (16 caractères)
+    """
+    hashes = hashes if hashes is not None else training_file_hashes(config)
+    digest = hashlib.sha256()
+    digest.update((rasa_version() or "").encode("utf-8"))
+    for relative_path in sorted(hashes):
+        digest.update(relative_path.encode("utf-8"))
+        digest.update(bytes.fromhex(hashes[relative_path]))
+    return digest.hexdigest()[:16]
+
+def model_path(fingerprint):
+    """Chemin du modèle entraîné pour une empreinte"""
+    return os.path.join(MODELS_DIR, f"esg-{fingerprint}.tar.gz")
+
+def manifest_path(fingerprint):
+    """Chemin du manifeste (fichiers d'entraînement) d'un modèle"""
+    return os.path.join(MODELS_DIR, f"esg-{fingerprint}.json")
+
+def write_manifest(fingerprint, hashes, mode, base_model=None):
+    """
+    Enregistre les fichiers d'entraînement d'un modèle, pour le choix du mode des entraînements suivants
+    
+    Args:
+        fingerprint (str): Empreinte du modèle
+        hashes (dict): Empreintes des fichiers d'entraînement
+        mode (str): "full" ou "finetune"
+        base_model (str, optional): Modèle affiné
+    """
+    manifest = {
+        "fingerprint": fingerprint,
+        "rasa_version": rasa_version(),
+        "mode": mode,
+        "base_model": os.path.basename(base_model) if base_model else None,
+        "files": hashes
+    }
+    with open(manifest_path(fingerprint), "w", encoding="utf-8") as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2)
+
+def find_finetune_base(hashes):
+    """
+    Cherche un modèle précédent dont seuls les exemples NLU diffèrent
+    
+    Le modèle doit avoir été entraîné avec la même version de Rasa, la même
+    configuration, le même domaine et les mêmes stories: seuls les fichiers
+    de FINETUNE_FILES peuvent avoir changé.
+    
+    Args:
+        hashes (dict): Empreintes des fichiers d'entraînement courants
+    
+    Returns:
+        str: Chemin du modèle à affiner (le plus récent), ou None
+    """
+    manifests = glob.glob(os.path.join(MODELS_DIR, "esg-*.json"))
+    for path in sorted(manifests, key=os.path.getmtime, reverse=True):
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                manifest = json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Manifeste illisible {path}: {e}")
+            continue
+        files = manifest.get("files", {})
+        if manifest.get("rasa_version") != rasa_version() or set(files) != set(hashes):
+            continue
+        changed = {name for name in hashes if files[name] != hashes[name]}
+        base_model = model_path(manifest.get("fingerprint", ""))
+        if changed and changed <= FINETUNE_FILES and os.path.exists(base_model):
+            return base_model
+    return None
+
+def train_model(fingerprint=None, force=False, config=CONFIG_FILE, finetune=True,
+                epoch_fraction=DEFAULT_EPOCH_FRACTION):
+    """
+    Entraîne le modèle Rasa, sauf si un modèle existe déjà pour cette empreinte
+    
+    Si seuls les exemples de data/nlu.yml ont changé depuis un modèle
+    précédent, ce modèle est affiné (rasa train --finetune) pendant une
+    fraction des epochs au lieu d'un entraînement complet.
+    
+    Args:
+        fingerprint (str, optional): Empreinte des données (calculée si absente)
+        force (bool): Si True, entraîne complètement même si le modèle existe
+        config (str): Fichier de configuration du pipeline
+        finetune (bool): Si False, n'affine jamais un modèle précédent
+        epoch_fraction (float): Fraction des epochs utilisée pour l'affinage
+        
+    Returns:
+        str: Chemin du modèle à charger
+    """
+    hashes = training_file_hashes(config)
+    fingerprint = fingerprint or compute_fingerprint(config, hashes)
+    path = model_path(fingerprint)
+    if os.path.exists(path) and not force:
+        logger.info(f"Modèle à jour trouvé ({os.path.basename(path)}), entraînement ignoré")
+        return path
+    
+    command = ["rasa", "train", "--config", config, "--out", MODELS_DIR, "--fixed-model-name", f"esg-{fingerprint}"]
+    if force:
+        # Sans --force, rasa train réutilise les composants du cache .rasa/ dont les entrées n'ont pas changé
+        command.append("--force")
+    base_model = find_finetune_base(hashes) if finetune and not force else None
+    if base_model:
+        logger.info(f"Affinage de {os.path.basename(base_model)} (exemples NLU modifiés, "
+                    f"{epoch_fraction:.0%} des epochs, empreinte {fingerprint})...")
+        command += ["--finetune", base_model, "--epoch-fraction", str(epoch_fraction)]
+    else:
+        logger.info(f"Entraînement complet du modèle Rasa ({config}, empreinte {fingerprint})...")
+    
+    subprocess.run(command, cwd=PROJECT_DIR, check=True)
+    write_manifest(fingerprint, hashes, "finetune" if base_model else "full", base_model)
     logger.info("Entraînement terminé")
+    return path
 
-def run_actions():
-    """Lance le serveur d'actions Rasa"""
+def run_actions(warmup=True, workers=DEFAULT_WORKERS):
+    """
+    Lance le serveur d'actions Rasa: plusieurs workers supervisés derrière le port 5055
+    
+    Args:
+        warmup (bool): Si True, chaque worker précharge les données et exécute
+            chaque action une fois avant d'accepter des requêtes
+        workers (int): Nombre de processus serveur d'actions
+        
+    Returns:
+        ActionSupervisor: Le superviseur démarré (à arrêter avec stop())
+    """
     logger.info("Démarrage du serveur d'actions...")
-    subprocess.Popen(["rasa", "run", "actions"])
+    supervisor = ActionSupervisor(
+        workers=workers,
+        metrics_port=int(os.environ.get("ESG_METRICS_PORT", "9105")),
+        warmup=warmup
+    )
+    supervisor.start()
+    return supervisor
 
-def run_rasa():
-    """Lance le serveur Rasa"""
+def run_rasa(model=None):
+    """
+    Lance le serveur Rasa
+    
+    Args:
+        model (str, optional): Chemin du modèle à charger (par défaut: le plus récent)
+    """
     logger.info("Démarrage du serveur Rasa...")
-    subprocess.run(["rasa", "run", "--enable-api", "--cors", "*"])
+    command = ["rasa", "run", "--enable-api", "--cors", "*"]
+    if model:
+        command += ["--model", model]
+    subprocess.run(command, cwd=PROJECT_DIR)
+
+def parse_args(argv=None):
+    """Options de la ligne de commande"""
+    parser = argparse.ArgumentParser(description="Lance l'assistant conversationnel ESG")
+    parser.add_argument("--skip-setup", action="store_true", help="Ne vérifie pas les dépendances")
+    parser.add_argument("--skip-scraping", action="store_true", help="Ne récupère pas les données initiales")
+    parser.add_argument("--force-train", action="store_true", help="Entraîne complètement même si un modèle à jour existe")
+    parser.add_argument("--fast", action="store_true",
+                        help=f"Utilise la configuration rapide ({FAST_CONFIG_FILE}) pour le développement")
+    parser.add_argument("--no-finetune", action="store_true",
+                        help="Entraîne complètement même si seuls les exemples NLU ont changé")
+    parser.add_argument("--epoch-fraction", type=float, default=DEFAULT_EPOCH_FRACTION,
+                        help="Fraction des epochs utilisée pour l'affinage")
+    parser.add_argument("--no-warmup", action="store_true", help="Ne préchauffe pas le serveur d'actions")
+    parser.add_argument("--action-workers", type=int,
+                        default=int(os.environ.get("ESG_ACTION_WORKERS", DEFAULT_WORKERS)),
+                        help="Nombre de processus serveur d'actions (variable ESG_ACTION_WORKERS)")
+    return parser.parse_args(argv)
 
-def main():
-    """Fonction principale pour lancer le chatbot ESG"""
+def main(argv=None):
+    """
+    Fonction principale pour lancer le chatbot ESG
+    
+    Le serveur d'actions démarre immédiatement (il recharge les données à
+    chaud); la récupération des données et l'entraînement, indépendants,
+    s'exécutent en parallèle. L'entraînement est ignoré si un modèle existe
+    déjà pour l'empreinte de la configuration, domain.yml et data/*.yml, et
+    remplacé par un affinage si seul data/nlu.yml a changé.
+    """
+    args = parse_args(argv)
     logger.info("Démarrage de l'assistant conversationnel ESG...")
     
     # Configuration de l'environnement
-    setup_environment()
-    
-    # Récupération des données initiales
-    data = scrape_initial_data()
+    if not args.skip_setup:
+        setup_environment()
     
-    # Entraînement du modèle
-    train_model()
+    # Lancement du serveur d'actions, pendant le scraping et l'entraînement
+    actions_supervisor = run_actions(warmup=not args.no_warmup, workers=args.action_workers)
     
-    # Lancement du serveur d'actions
-    run_actions()
-    
-    # Lancement du serveur Rasa
-    run_rasa()
+    try:
+        with ThreadPoolExecutor(max_workers=2, thread_name_prefix="boot") as executor:
+            # Récupération des données initiales
+            scraping = None if args.skip_scraping else executor.submit(scrape_initial_data)
+            
+            # Entraînement du modèle (ou réutilisation du modèle existant)
+            config = FAST_CONFIG_FILE if args.fast else CONFIG_FILE
+            model = executor.submit(
+                train_model,
+                force=args.force_train,
+                config=config,
+                finetune=not args.no_finetune,
+                epoch_fraction=args.epoch_fraction
+            ).result()
+            
+            if scraping is not None:
+                try:
+                    scraping.result()
+                except Exception as e:
+                    logger.error(f"Erreur lors de la récupération des données initiales: {e}")
+        
+        # Lancement du serveur Rasa
+        run_rasa(model)
+    finally:
+        actions_supervisor.stop()
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,176 @@
+import threading
+import time
+from collections import OrderedDict
+
+class _CacheEntry:
+    """Entrée du cache: valeur, date d'expiration et nombre d'accès depuis l'insertion"""
+    
+    __slots__ = ("value", "expires_at", "hits")
+    
+    def __init__(self, value, expires_at):
+        self.value = value
+        self.expires_at = expires_at
+        self.hits = 0
+
+class TTLCache:
+    """
+    Cache borné avec expiration (TTL) et éviction LRU
+    
+    Chaque entrée expire ttl secondes après son insertion. Une entrée
+    expirée reste encore disponible pendant stale_ttl secondes pour
+    get_stale() (mode stale-while-revalidate), puis est supprimée. Lorsque
+    le cache est plein, l'entrée la moins récemment utilisée est évincée.
+    Les compteurs de succès, d'échecs, d'évictions et d'expirations sont
+    disponibles via stats().
+    """
+    
+    def __init__(self, max_entries=1000, ttl=24 * 3600, stale_ttl=0, clock=time.monotonic):
+        """
+        Initialise le cache
+        
+        Args:
+            max_entries (int): Nombre maximal d'entrées
+            ttl (float): Durée de vie par défaut d'une entrée en secondes
+            stale_ttl (float): Durée pendant laquelle une entrée expirée peut
+                encore être servie par get_stale()
+            clock (callable): Horloge monotone (remplaçable pour les tests)
+        """
+        self.max_entries = max(1, max_entries)
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.clock = clock
+        self._entries = OrderedDict()  # clé -> _CacheEntry
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+    
+    def get(self, key, default=None):
+        """
+        Récupère une valeur encore valide
+        
+        Args:
+            key: La clé recherchée
+            default: Valeur renvoyée si la clé est absente ou expirée
+            
+        Returns:
+            La valeur en cache, ou default
+        """
+        with self._lock:
+            entry = self._lookup(key)
+            if entry is None or entry.expires_at <= self.clock():
+                self.misses += 1
+                return default
+            self._entries.move_to_end(key)
+            entry.hits += 1
+            self.hits += 1
+            return entry.value
+    
+    def get_stale(self, key):
+        """
+        Récupère une valeur, même expirée tant qu'elle reste dans la fenêtre stale_ttl
+        
+        Args:
+            key: La clé recherchée
+            
+        Returns:
+            tuple: (valeur, fraîche) où fraîche vaut False pour une valeur
+                expirée, ou None si la clé est absente
+        """
+        with self._lock:
+            entry = self._lookup(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            entry.hits += 1
+            if entry.expires_at <= self.clock():
+                self.stale_hits += 1
+                return entry.value, False
+            self.hits += 1
+            return entry.value, True
+    
+    def _lookup(self, key):
+        """Entrée d'une clé, supprimée si elle a dépassé la fenêtre stale_ttl (verrou requis)"""
+        entry = self._entries.get(key)
+        if entry is not None and entry.expires_at + self.stale_ttl <= self.clock():
+            del self._entries[key]
+            self.expirations += 1
+            return None
+        return entry
+    
+    def expiring_keys(self, within, min_hits=1):
+        """
+        Clés fréquemment utilisées qui expirent bientôt (ou ont déjà expiré)
+        
+        Args:
+            within (float): Horizon en secondes
+            min_hits (int): Nombre minimal d'accès depuis l'insertion
+            
+        Returns:
+            list: Les clés concernées, des plus récemment utilisées aux moins récentes
+        """
+        deadline = self.clock() + within
+        with self._lock:
+            return [
+                key for key, entry in reversed(self._entries.items())
+                if entry.expires_at <= deadline and entry.hits >= min_hits
+            ]
+    
+    def set(self, key, value, ttl=None):
+        """
+        Ajoute ou remplace une entrée
+        
+        Args:
+            key: La clé
+            value: La valeur
+            ttl (float, optional): Durée de vie de l'entrée (par défaut: self.ttl)
+        """
+        expires_at = self.clock() + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            self._entries[key] = _CacheEntry(value, expires_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+    
+    def delete(self, key):
+        """Supprime une entrée si elle existe"""
+        with self._lock:
+            self._entries.pop(key, None)
+    
+    def clear(self):
+        """Vide le cache (les compteurs sont conservés)"""
+        with self._lock:
+            self._entries.clear()
+    
+    def __contains__(self, key):
+        """Indique si une entrée valide existe, sans modifier l'ordre LRU ni les compteurs"""
+        with self._lock:
+            entry = self._entries.get(key)
+            return entry is not None and entry.expires_at > self.clock()
+    
+    def __len__(self):
+        with self._lock:
+            return len(self._entries)
+    
+    def stats(self):
+        """
+        Compteurs du cache
+        
+        Returns:
+            dict: Taille, capacité, succès (frais et périmés), échecs, évictions
+                et expirations
+        """
+        with self._lock:
+            return {
+                "size": len(self._entries),
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "stale_hits": self.stale_hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "expirations": self.expirations
+            }
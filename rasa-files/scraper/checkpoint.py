@@ -0,0 +1,114 @@
+import json
+import logging
+import os
+import threading
+
+# Configuration du logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+class CheckpointJournal:
+    """
+    Journal de reprise des extractions, en ajout seul
+    
+    Chaque ligne est un objet JSON {"company": ..., "source": ..., "data": ...}
+    écrit dès qu'une source a été extraite avec succès pour une entreprise.
+    Après un arrêt brutal, une dernière ligne tronquée est simplement ignorée.
+    """
+    
+    def __init__(self, path, resume=True, fsync=False):
+        """
+        Ouvre le journal
+        
+        Args:
+            path (str): Chemin du fichier journal
+            resume (bool): Si True, recharge les résultats déjà journalisés;
+                sinon le journal est vidé
+            fsync (bool): Si True, force l'écriture sur disque après chaque ligne
+        """
+        self.path = path
+        self.fsync = fsync
+        self._lock = threading.Lock()
+        self._results = {}
+        
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        
+        if resume:
+            self._load()
+        self._file = open(path, "a" if resume else "w", encoding="utf-8")
+    
+    def _load(self):
+        """Recharge les résultats d'un journal existant"""
+        if not os.path.exists(self.path):
+            return
+        
+        # Fin de la dernière ligne complète: une ligne tronquée sans retour à la
+        # ligne est retirée, sinon le prochain enregistrement y serait accolé
+        end = 0
+        with open(self.path, "rb") as f:
+            for line_number, raw_line in enumerate(f, 1):
+                complete = raw_line.endswith(b"\n")
+                line = raw_line.strip()
+                if not line:
+                    end += len(raw_line)
+                    continue
+                try:
+                    entry = json.loads(line.decode("utf-8"))
+                    self._results.setdefault(entry["company"], {})[entry["source"]] = entry["data"]
+                except (ValueError, KeyError, TypeError):
+                    logger.warning(f"Ligne {line_number} du journal illisible, ignorée")
+                    if not complete:
+                        break
+                if complete:
+                    end += len(raw_line)
+                else:
+                    # Dernière ligne lisible mais sans retour à la ligne: la conserver
+                    end = None
+        
+        if end is None:
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write("\n")
+        elif end < os.path.getsize(self.path):
+            logger.warning(f"Fin tronquée du journal retirée ({os.path.getsize(self.path) - end} octets)")
+            os.truncate(self.path, end)
+        
+        total = sum(len(sources) for sources in self._results.values())
+        logger.info(f"Reprise: {total} résultats déjà journalisés pour {len(self._results)} entreprises")
+    
+    def record(self, company, source, data):
+        """
+        Journalise le résultat d'une source pour une entreprise
+        
+        Args:
+            company (str): Le symbole de l'entreprise
+            source (str): La clé de la source
+            data (dict): Les données extraites
+        """
+        line = json.dumps({"company": company, "source": source, "data": data}, ensure_ascii=False)
+        with self._lock:
+            self._file.write(line + "\n")
+            self._file.flush()
+            if self.fsync:
+                os.fsync(self._file.fileno())
+            self._results.setdefault(company, {})[source] = data
+    
+    def results(self, company):
+        """
+        Résultats journalisés pour une entreprise
+        
+        Args:
+            company (str): Le symbole de l'entreprise
+            
+        Returns:
+            dict: {source: données}
+        """
+        with self._lock:
+            return dict(self._results.get(company, {}))
+    
+    def close(self):
+        """Ferme le fichier journal"""
+        with self._lock:
+            if not self._file.closed:
+                self._file.close()
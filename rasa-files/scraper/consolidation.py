@@ -0,0 +1,121 @@
+import csv
+import logging
+import os
+
+# Configuration du logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Clés communes à tous les enregistrements, exclues du fichier combiné
+RECORD_KEYS = ["source", "company", "date_extracted"]
+
+class ConsolidationWriter:
+    """
+    Écriture incrémentale des fichiers consolidés
+    
+    Le schéma des colonnes est fixé à la création à partir des champs de
+    chaque source. Les lignes sont ajoutées au fur et à mesure que les
+    entreprises sont traitées et écrites par blocs, si bien que la mémoire
+    utilisée ne dépend pas du nombre d'entreprises.
+    """
+    
+    def __init__(self, output_dir, source_fields, chunk_size=100):
+        """
+        Initialise l'écriture
+        
+        Args:
+            output_dir (str): Répertoire des fichiers consolidés
+            source_fields (dict): {source: [champs]} dans l'ordre des colonnes
+            chunk_size (int): Nombre d'entreprises en tampon avant écriture
+        """
+        self.output_dir = output_dir
+        self.source_fields = source_fields
+        self.chunk_size = chunk_size
+        
+        self.source_columns = {
+            source: ["source", "company"] + list(fields) + ["date_extracted"]
+            for source, fields in source_fields.items()
+        }
+        self.combined_columns = ["company_symbol"] + [
+            f"{source}_{field}" for source, fields in source_fields.items() for field in fields
+        ]
+        
+        self._rows = {source: [] for source in source_fields}
+        self._combined_rows = []
+        self._files = {}
+        self._writers = {}
+        self._pending = 0
+    
+    def source_path(self, source):
+        """Chemin du fichier consolidé d'une source"""
+        return os.path.join(self.output_dir, f"consolidated_{source}_esg_data.csv")
+    
+    @property
+    def combined_path(self):
+        """Chemin du fichier combiné"""
+        return os.path.join(self.output_dir, "all_esg_data_combined.csv")
+    
+    def add_company(self, company_symbol, data):
+        """
+        Ajoute les données d'une entreprise
+        
+        Args:
+            company_symbol (str): Le symbole de l'entreprise
+            data (dict): {source: enregistrement}
+        """
+        company_combined = {"company_symbol": company_symbol}
+        
+        for source in self.source_fields:
+            record = data.get(source)
+            if not isinstance(record, dict) or "error" in record:
+                continue
+            self._rows[source].append(record)
+            
+            # Ajouter un préfixe source_ à chaque clé pour éviter les conflits
+            for key, value in record.items():
+                if key not in RECORD_KEYS:
+                    company_combined[f"{source}_{key}"] = value
+        
+        self._combined_rows.append(company_combined)
+        self._pending += 1
+        if self._pending >= self.chunk_size:
+            self.flush()
+    
+    def _writer(self, key, path, columns):
+        """Ouvre à la demande le fichier d'une sortie et écrit son en-tête"""
+        if key not in self._writers:
+            f = open(path, "w", encoding="utf-8", newline="")
+            writer = csv.DictWriter(f, fieldnames=columns, extrasaction="ignore")
+            writer.writeheader()
+            self._files[key] = f
+            self._writers[key] = writer
+        return self._writers[key]
+    
+    def flush(self):
+        """Écrit les lignes en tampon"""
+        for source, rows in self._rows.items():
+            if rows:
+                self._writer(source, self.source_path(source), self.source_columns[source]).writerows(rows)
+                rows.clear()
+        if self._combined_rows:
+            self._writer(None, self.combined_path, self.combined_columns).writerows(self._combined_rows)
+            self._combined_rows.clear()
+        for f in self._files.values():
+            f.flush()
+        self._pending = 0
+    
+    def close(self):
+        """Écrit le tampon et ferme les fichiers"""
+        self.flush()
+        for key, f in self._files.items():
+            f.close()
+            path = self.combined_path if key is None else self.source_path(key)
+            logger.info(f"Données consolidées sauvegardées dans {path}")
+        self._files.clear()
+        self._writers.clear()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
@@ -20,9 +20,6 @@ class ESGScraper:
         self.data_dir = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'data', 'scraped')
         os.makedirs(self.data_dir, exist_ok=True)
     
-    def scrape_emissions  'data', 'scraped')
-        os.makedirs(self.data_dir, exist_ok=True)
-    
     def scrape_emissions_data(self, sources=None):
         """Scrape les données d'émissions CO2 depuis diverses sources"""
         logger.info("Scraping des données d'émissions CO2")
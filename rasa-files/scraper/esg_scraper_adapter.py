@@ -1,8 +1,20 @@
 import os
+import socket
+import asyncio
+import functools
 import logging
-import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from .esg_scraper_simple import SimpleESGScraper
+from .cache import TTLCache
+from .esg_scraper_simple import DATA_FILES, SimpleESGScraper
+from .file_watcher import FileWatcher
+from .metrics import REGISTRY
+from .profiling import profiled
+from .shared_store import SharedESGStore, SharedTable
+from .singleflight import SingleFlight
+from .storage import DEFAULT_DATA_DIR, DEFAULT_STORAGE_BACKEND, create_storage
 
 # Configuration du logging
 logging.basicConfig(level=logging.INFO)
@@ -13,12 +25,38 @@ class ESGScraperAdapter:
     Adaptateur pour intégrer le scraper ESG au système Rasa
     """
     
-    def __init__(self, data_dir="esg_data"):
+    def __init__(self, data_dir=DEFAULT_DATA_DIR, storage_backend=DEFAULT_STORAGE_BACKEND, cache_max_entries=1000,
+                 cache_ttl=24 * 3600, stale_while_revalidate=False, stale_ttl=7 * 24 * 3600,
+                 refresh_ahead=None, refresh_interval=60, refresh_workers=2,
+                 hot_reload=False, reload_interval=1.0, io_workers=32,
+                 shared_store=None, shared_sync_interval=1.0):
         """
         Initialise l'adaptateur
         
         Args:
             data_dir (str): Répertoire où stocker/lire les données ESG
+            storage_backend (str, optional): Moteur de stockage des enregistrements
+                ("sqlite", "parquet", "csv", ou "none" pour s'en passer), partagé avec ESGScraper
+            cache_max_entries (int): Nombre maximal d'entreprises gardées en cache
+            cache_ttl (float): Durée de vie d'une entrée du cache en secondes
+            stale_while_revalidate (bool): Si True, une entrée expirée (ou un
+                force_refresh) est servie immédiatement et rafraîchie en arrière-plan
+            stale_ttl (float): Durée pendant laquelle une entrée expirée peut encore être servie
+            refresh_ahead (float, optional): Si défini, les entreprises consultées
+                sont rafraîchies en arrière-plan lorsqu'il leur reste moins de
+                refresh_ahead secondes de validité
+            refresh_interval (float): Période de l'ordonnanceur de rafraîchissement
+            refresh_workers (int): Nombre de threads de rafraîchissement
+            hot_reload (bool): Si True, les fichiers JSON du répertoire de
+                données sont surveillés et rechargés dès qu'ils changent
+            reload_interval (float): Période de scrutation des fichiers
+                lorsque inotify n'est pas disponible
+            io_workers (int): Nombre de threads exécutant les appels bloquants
+                des méthodes asynchrones (aget_*)
+            shared_store (str, optional): Chemin du magasin SQLite partagé par
+                les processus du serveur d'actions (voir SharedESGStore)
+            shared_sync_interval (float): Période de synchronisation avec le
+                magasin partagé, en secondes
         """
         self.data_dir = data_dir
         self.scraper = SimpleESGScraper(data_dir=data_dir)
@@ -27,36 +65,298 @@ class ESGScraperAdapter:
         if not os.path.exists(data_dir):
             os.makedirs(data_dir)
         
+        # Moteur de stockage des enregistrements écrits par ESGScraper
+        self.storage = create_storage(storage_backend, data_dir) if storage_backend not in (None, "none") else None
+        
+        # Magasin partagé entre processus: tables publiées par un seul
+        # rafraîchisseur et données des entreprises extraites par chacun
+        self.shared_store = SharedESGStore(shared_store) if shared_store else None
+        self.shared_sync_interval = shared_sync_interval
+        self._store_owner = f"{socket.gethostname()}:{os.getpid()}:{id(self)}"
+        self._store_version = None
+        self._is_refresher = False
+        self._store_sync = None
+        self._store_sync_stop = threading.Event()
+        
+        # Cache borné (TTL + LRU) des données ESG des entreprises
+        self.stale_while_revalidate = stale_while_revalidate
+        self.cache = TTLCache(
+            max_entries=cache_max_entries,
+            ttl=cache_ttl,
+            stale_ttl=stale_ttl if stale_while_revalidate else 0
+        )
+        # Entreprises mises en cache depuis company_esg_data.json
+        self._file_companies = set()
+        
+        # Rafraîchissements en arrière-plan (mode stale-while-revalidate)
+        self.refresh_ahead = refresh_ahead
+        self.refresh_interval = refresh_interval
+        self.refresh_workers = refresh_workers
+        self._refresh_executor = None
+        self._refreshing = set()
+        self._refresh_lock = threading.Lock()
+        self._scheduler = None
+        self._scheduler_stop = threading.Event()
+        
+        # Une seule extraction en cours par entreprise, partagée par les appels concurrents
+        self._inflight = SingleFlight()
+        
+        # Exécuteur des appels bloquants des méthodes asynchrones
+        self.io_workers = io_workers
+        self._io_executor = None
+        self._io_lock = threading.Lock()
+        
+        # Métriques: compteurs du cache, extractions en cours et durée des extractions
+        self._register_metrics()
+        
         # Charger ou initialiser les données
-        self.cached_data = self._load_cached_data()
+        self._load_cached_data()
+        
+        if stale_while_revalidate and refresh_ahead:
+            self.start_refresh_scheduler()
+        
+        # Rechargement à chaud des fichiers de données (avec un magasin
+        # partagé, seul le rafraîchisseur surveille les fichiers)
+        self.hot_reload = hot_reload
+        self.reload_interval = reload_interval
+        self._watcher = None
+        if self.shared_store:
+            self.sync_shared_store()
+            self.start_store_sync()
+        elif hot_reload:
+            self.start_watching()
+    
+    def _register_metrics(self):
+        """Expose les compteurs de l'adaptateur dans le registre de métriques"""
+        self._fetch_duration = REGISTRY.histogram(
+            "esg_adapter_fetch_duration_seconds",
+            "Durée de récupération des données d'une entreprise absente du cache"
+        )
+        for counter in ("hits", "stale_hits", "misses", "evictions", "expirations"):
+            REGISTRY.counter_function(
+                f"esg_adapter_cache_{counter}_total",
+                f"Cache des entreprises de l'adaptateur: {counter}",
+                functools.partial(lambda counter: self.cache.stats()[counter], counter)
+            )
+        REGISTRY.gauge(
+            "esg_adapter_cache_entries",
+            "Entreprises actuellement en cache",
+            function=lambda: len(self.cache)
+        )
+        REGISTRY.gauge(
+            "esg_adapter_inflight_fetches",
+            "Extractions d'entreprises en cours (partagées entre appels concurrents)",
+            function=lambda: len(self._inflight.in_flight())
+        )
+        REGISTRY.gauge(
+            "esg_adapter_shared_refresher",
+            "1 si ce processus publie les tables dans le magasin partagé",
+            function=lambda: int(self._is_refresher)
+        )
+        REGISTRY.gauge(
+            "esg_adapter_data_version",
+            "Version des tables de données (incrémentée à chaque rechargement)",
+            function=lambda: self.data_version
+        )
+    
+    @property
+    def data_version(self):
+        """Version des données, incrémentée à chaque rechargement des tables"""
+        return self.scraper.data_version
     
     def _load_cached_data(self):
         """
-        Charge les données ESG précédemment sauvegardées
+        Charge dans le cache les données ESG précédemment sauvegardées
+        
+        Chaque entrée ne vit que le temps restant avant l'expiration de ses
+        données: l'âge du fichier JSON, ou la date d'extraction des
+        enregistrements du moteur de stockage. Les données trop anciennes ne
+        sont pas chargées.
+        """
+        # Le scraper a déjà lu les fichiers JSON; les générer s'ils n'existent pas
+        company_file = os.path.join(self.data_dir, DATA_FILES["company_esg_data"])
+        if not os.path.exists(company_file):
+            self.scraper.save_data()
+        
+        cached_data = self.scraper.company_esg_data
+        self._cache_companies(cached_data)
+        
+        # Compléter avec les derniers enregistrements du moteur de stockage
+        if self.storage:
+            for company_symbol, sources in self.storage.latest_records().items():
+                company_data = {**cached_data.get(company_symbol, {}), **sources}
+                self._cache_company_data(company_symbol, company_data, self._records_age(sources))
+    
+    def _cache_companies(self, companies):
+        """
+        Met en cache les données des entreprises lues depuis company_esg_data.json
+        
+        Les entreprises qui figuraient dans la version précédente du fichier
+        et n'y figurent plus sont retirées du cache.
+        
+        Args:
+            companies (dict): {symbole: données ESG par source}
+        """
+        company_file = os.path.join(self.data_dir, DATA_FILES["company_esg_data"])
+        try:
+            file_age = time.time() - os.path.getmtime(company_file)
+        except OSError:
+            file_age = 0
+        
+        for company_symbol in self._file_companies.difference(companies):
+            self.cache.delete(company_symbol)
+        self._file_companies = set(companies)
+        
+        for company_symbol, company_data in companies.items():
+            self._cache_company_data(company_symbol, company_data, file_age)
+    
+    def reload_data(self, filenames=None):
+        """
+        Recharge les données modifiées sur disque, sans interrompre le service
+        
+        Les tables sont reconstruites par le scraper puis publiées d'un bloc;
+        les entreprises du fichier company_esg_data.json remplacent leurs
+        entrées dans le cache, et celles qui en ont été retirées sont
+        évincées.
         
+        Args:
+            filenames (iterable, optional): Noms des fichiers modifiés; par
+                défaut, tous les fichiers sont relus
+            
         Returns:
-            dict: Données ESG
+            set: Noms des tables rechargées
+        """
+        reloaded = self.scraper.reload(filenames)
+        if "company_esg_data" in reloaded:
+            self._cache_companies(self.scraper.company_esg_data)
+        if reloaded and self._is_refresher:
+            self._publish_tables()
+        return reloaded
+    
+    def sync_shared_store(self):
+        """
+        Synchronise l'adaptateur avec le magasin partagé
+        
+        Le processus qui obtient le bail de rafraîchisseur relit les fichiers
+        de données, publie ses tables et surveille les fichiers (si
+        hot_reload); il renouvelle ensuite son bail à chaque appel. Les
+        autres processus lisent les tables publiées ligne par ligne (vues
+        SharedTable, sans copie locale) et, lorsque leur version change, ne
+        relisent que les entreprises modifiées pour mettre à jour leur cache.
         """
-        cached_data = {}
+        lease = max(5.0, 5 * self.shared_sync_interval)
+        refresher = self.shared_store.acquire_refresher(self._store_owner, lease)
+        if refresher and not self._is_refresher:
+            logger.info(f"Ce processus devient le rafraîchisseur de {self.shared_store.path}")
+            self.reload_data()
+            self._is_refresher = True
+            self._publish_tables()
+            if self.hot_reload:
+                self.start_watching()
+        elif not refresher and self._is_refresher:
+            logger.warning(f"Rôle de rafraîchisseur de {self.shared_store.path} perdu")
+            self._is_refresher = False
+            self.stop_watching()
         
-        # Vérifier si le fichier de données des entreprises existe
-        company_file = os.path.join(self.data_dir, "company_esg_data.json")
-        if os.path.exists(company_file):
+        version = self.shared_store.data_version()
+        if version != self._store_version:
+            since = self._store_version or 0
+            changed = self.shared_store.changed_tables(since)
+            self.scraper.replace_tables({table: SharedTable(self.shared_store, table) for table in changed})
+            if "company_esg_data" in changed:
+                for company_symbol, company_data in self.shared_store.changed_rows("company_esg_data", since):
+                    if company_data is None:
+                        self.cache.delete(company_symbol)
+                    else:
+                        self._cache_company_data(company_symbol, company_data)
+            self._store_version = version
+    
+    def _publish_tables(self):
+        """Publie les tables du scraper dans le magasin partagé"""
+        self._store_version = self.shared_store.publish_tables(self.scraper.tables)
+    
+    def start_store_sync(self):
+        """Démarre la synchronisation périodique avec le magasin partagé"""
+        if self._store_sync is not None or not self.shared_store:
+            return
+        self._store_sync_stop.clear()
+        self._store_sync = threading.Thread(target=self._run_store_sync, name="esg-store-sync", daemon=True)
+        self._store_sync.start()
+    
+    def _run_store_sync(self):
+        """Boucle de synchronisation avec le magasin partagé"""
+        while not self._store_sync_stop.wait(self.shared_sync_interval):
             try:
-                with open(company_file, "r", encoding="utf-8") as f:
-                    cached_data = json.load(f)
+                self.sync_shared_store()
             except Exception as e:
-                logger.error(f"Erreur lors du chargement des données: {e}")
-                # Générer de nouvelles données
-                self.scraper.save_data()
-                cached_data = self.scraper.company_esg_data
-        else:
-            # Générer et sauvegarder de nouvelles données
-            self.scraper.save_data()
-            cached_data = self.scraper.company_esg_data
+                logger.error(f"Erreur lors de la synchronisation avec {self.shared_store.path}: {e}")
+    
+    def start_watching(self):
+        """Démarre la surveillance des fichiers de données (rechargement à chaud)"""
+        if self._watcher is not None:
+            return
+        self._watcher = FileWatcher(
+            self.data_dir,
+            DATA_FILES.values(),
+            self.reload_data,
+            interval=self.reload_interval
+        )
+        self._watcher.start()
+    
+    def stop_watching(self):
+        """Arrête la surveillance des fichiers de données"""
+        if self._watcher is not None:
+            self._watcher.stop()
+            self._watcher = None
+    
+    def _cache_company_data(self, company_symbol, company_data, age=0):
+        """
+        Met en cache les données d'une entreprise pour la durée de vie restante
+        
+        Args:
+            company_symbol (str): Symbole boursier de l'entreprise
+            company_data (dict): Données ESG par source
+            age (float): Âge des données en secondes
+            
+        Returns:
+            bool: True si les données sont assez récentes pour être mises en cache
+        """
+        remaining = self.cache.ttl - age
+        if remaining <= 0:
+            return False
+        self.cache.set(company_symbol, company_data, ttl=remaining)
+        return True
+    
+    @staticmethod
+    def _records_age(records):
+        """
+        Âge en secondes de l'enregistrement le plus ancien (d'après date_extracted)
+        
+        Args:
+            records (dict): {source: enregistrement}
+            
+        Returns:
+            float: Âge en secondes (0 si aucune date n'est disponible)
+        """
+        ages = []
+        for record in records.values():
+            try:
+                extracted = datetime.strptime(record["date_extracted"], "%Y-%m-%d")
+            except (KeyError, TypeError, ValueError):
+                continue
+            ages.append((datetime.now() - extracted).total_seconds())
+        return max(ages) if ages else 0
+    
+    def cache_stats(self):
+        """
+        Compteurs du cache des données d'entreprises
         
-        return cached_data
+        Returns:
+            dict: Taille, capacité, succès, échecs, évictions et expirations
+        """
+        return self.cache.stats()
     
+    @profiled()
     def get_emissions_data(self, periode=None):
         """
         Récupère les données d'émissions CO2
@@ -69,6 +369,7 @@ class ESGScraperAdapter:
         """
         return self.scraper.get_emissions_data(periode)
     
+    @profiled()
     def get_parite_data(self, departement=None):
         """
         Récupère les données de parité hommes-femmes
@@ -81,6 +382,7 @@ class ESGScraperAdapter:
         """
         return self.scraper.get_parite_data(departement)
     
+    @profiled()
     def get_formation_data(self, periode=None):
         """
         Récupère les données de formation RSE
@@ -93,9 +395,8 @@ class ESGScraperAdapter:
         """
         return self.scraper.get_formation_data(periode)
     
+    @profiled()
     def get_fournisseurs_data(self, seuil=50):
-        """
-        Récupère les données des fournisseurs avec un  seuil=50):
         """
         Récupère les données des fournisseurs avec un score ESG faible
         
@@ -107,6 +408,7 @@ class ESGScraperAdapter:
         """
         return self.scraper.get_fournisseurs_data(seuil)
     
+    @profiled()
     def get_empreinte_carbone(self, pays1, pays2):
         """
         Compare l'empreinte carbone entre deux pays
@@ -120,6 +422,50 @@ class ESGScraperAdapter:
         """
         return self.scraper.get_empreinte_carbone(pays1, pays2)
     
+    def _get_io_executor(self):
+        """Crée à la demande l'exécuteur des appels bloquants"""
+        with self._io_lock:
+            if self._io_executor is None:
+                self._io_executor = ThreadPoolExecutor(
+                    max_workers=self.io_workers,
+                    thread_name_prefix="esg-io"
+                )
+            return self._io_executor
+    
+    async def _run_blocking(self, fn, *args, **kwargs):
+        """
+        Exécute un appel bloquant hors de la boucle d'événements
+        
+        Args:
+            fn (callable): Fonction à appeler
+            
+        Returns:
+            Le résultat de fn(*args, **kwargs)
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._get_io_executor(), functools.partial(fn, *args, **kwargs))
+    
+    async def aget_emissions_data(self, periode=None):
+        """Variante asyncio de get_emissions_data"""
+        return await self._run_blocking(self.get_emissions_data, periode)
+    
+    async def aget_parite_data(self, departement=None):
+        """Variante asyncio de get_parite_data"""
+        return await self._run_blocking(self.get_parite_data, departement)
+    
+    async def aget_formation_data(self, periode=None):
+        """Variante asyncio de get_formation_data"""
+        return await self._run_blocking(self.get_formation_data, periode)
+    
+    async def aget_fournisseurs_data(self, seuil=50):
+        """Variante asyncio de get_fournisseurs_data"""
+        return await self._run_blocking(self.get_fournisseurs_data, seuil)
+    
+    async def aget_empreinte_carbone(self, pays1, pays2):
+        """Variante asyncio de get_empreinte_carbone"""
+        return await self._run_blocking(self.get_empreinte_carbone, pays1, pays2)
+    
+    @profiled()
     def get_company_esg_data(self, company_symbol, company_name=None, force_refresh=False):
         """
         Récupère les données ESG d'une entreprise
@@ -132,13 +478,285 @@ class ESGScraperAdapter:
         Returns:
             dict: Données ESG de l'entreprise
         """
-        if force_refresh or company_symbol not in self.cached_data:
-            # Récupérer de nouvelles données
+        company_data = self._lookup_company_data(company_symbol, force_refresh)
+        if company_data is not None:
+            return company_data
+        
+        # Récupérer de nouvelles données (une seule extraction par entreprise à la fois)
+        return self._inflight.do(company_symbol, self._fetch_company_data, company_symbol)
+    
+    async def aget_company_esg_data(self, company_symbol, company_name=None, force_refresh=False):
+        """
+        Variante asyncio de get_company_esg_data
+        
+        Seul un succès du cache est servi sur la boucle d'événements: la
+        lecture du stockage et l'extraction s'exécutent sur l'exécuteur des
+        appels bloquants, et l'extraction est partagée avec les appels
+        concurrents (threads ou tâches) pour la même entreprise.
+        
+        Args:
+            company_symbol (str): Symbole boursier de l'entreprise
+            company_name (str, optional): Nom complet de l'entreprise
+            force_refresh (bool): Si True, force une nouvelle extraction
+            
+        Returns:
+            dict: Données ESG de l'entreprise
+        """
+        company_data = self._lookup_company_data(company_symbol, force_refresh, use_storage=False)
+        if company_data is None and (self.storage or self.shared_store) and not force_refresh:
+            company_data = await self._run_blocking(self._read_stored_company, company_symbol)
+        if company_data is not None:
+            return company_data
+        
+        return await self._inflight.do_async(
+            company_symbol, self._fetch_company_data, company_symbol,
+            executor=self._get_io_executor()
+        )
+    
+    @profiled()
+    def get_companies_esg_data(self, company_symbols, force_refresh=False):
+        """
+        Récupère les données ESG de plusieurs entreprises en un seul passage
+        
+        Les symboles sont dédoublonnés, les entreprises en cache sont servies
+        immédiatement et toutes les autres sont récupérées en parallèle (une
+        seule extraction par entreprise, partagée avec les appels concurrents).
+        Les récupérations s'exécutent sur un pool propre à l'appel, et non sur
+        l'exécuteur des appels bloquants: la méthode peut donc être appelée
+        depuis un thread de cet exécuteur sans risque d'interblocage.
+        
+        Args:
+            company_symbols (iterable): Symboles boursiers des entreprises
+            force_refresh (bool): Si True, force une nouvelle extraction
+            
+        Returns:
+            dict: {symbole: données ESG}, dans l'ordre des symboles demandés;
+                les entreprises en échec sont absentes
+        """
+        results, misses = self._split_cached_companies(company_symbols, force_refresh)
+        if len(misses) == 1:
+            # Une seule entreprise: pas besoin de pool, l'appel est fait sur ce thread
+            company_symbol = misses[0]
+            try:
+                results[company_symbol] = self.get_company_esg_data(company_symbol, force_refresh=force_refresh)
+            except Exception as e:
+                logger.error(f"Erreur lors de la récupération des données ESG de {company_symbol}: {e}")
+        elif misses:
+            with ThreadPoolExecutor(max_workers=min(len(misses), self.io_workers),
+                                    thread_name_prefix="esg-batch") as executor:
+                futures = {
+                    company_symbol: executor.submit(self.get_company_esg_data, company_symbol, force_refresh=force_refresh)
+                    for company_symbol in misses
+                }
+                for company_symbol, future in futures.items():
+                    try:
+                        results[company_symbol] = future.result()
+                    except Exception as e:
+                        logger.error(f"Erreur lors de la récupération des données ESG de {company_symbol}: {e}")
+        
+        return {company_symbol: results[company_symbol] for company_symbol in dict.fromkeys(company_symbols) if company_symbol in results}
+    
+    async def aget_companies_esg_data(self, company_symbols, force_refresh=False):
+        """
+        Variante asyncio de get_companies_esg_data
+        
+        Args:
+            company_symbols (iterable): Symboles boursiers des entreprises
+            force_refresh (bool): Si True, force une nouvelle extraction
+            
+        Returns:
+            dict: {symbole: données ESG}, dans l'ordre des symboles demandés;
+                les entreprises en échec sont absentes
+        """
+        company_symbols = list(company_symbols)
+        results, misses = self._split_cached_companies(company_symbols, force_refresh)
+        if misses:
+            fetched = await asyncio.gather(
+                *(self.aget_company_esg_data(company_symbol, force_refresh=force_refresh) for company_symbol in misses),
+                return_exceptions=True
+            )
+            for company_symbol, company_data in zip(misses, fetched):
+                if isinstance(company_data, Exception):
+                    logger.error(f"Erreur lors de la récupération des données ESG de {company_symbol}: {company_data}")
+                else:
+                    results[company_symbol] = company_data
+        
+        return {company_symbol: results[company_symbol] for company_symbol in dict.fromkeys(company_symbols) if company_symbol in results}
+    
+    def _split_cached_companies(self, company_symbols, force_refresh=False):
+        """
+        Sépare les entreprises servies par le cache de celles à récupérer
+        
+        Args:
+            company_symbols (iterable): Symboles boursiers des entreprises
+            force_refresh (bool): Si True, ignore les données en cache
+            
+        Returns:
+            tuple: ({symbole: données en cache}, [symboles à récupérer, sans doublons])
+        """
+        hits = {}
+        misses = []
+        for company_symbol in dict.fromkeys(company_symbols):
+            company_data = self._lookup_company_data(company_symbol, force_refresh, use_storage=False)
+            if company_data is not None:
+                hits[company_symbol] = company_data
+            else:
+                misses.append(company_symbol)
+        return hits, misses
+    
+    def _lookup_company_data(self, company_symbol, force_refresh=False, use_storage=True):
+        """
+        Cherche les données d'une entreprise dans le cache puis dans le stockage
+        
+        Args:
+            company_symbol (str): Symbole boursier de l'entreprise
+            force_refresh (bool): Si True, ignore les données en cache
+            use_storage (bool): Si False, seul le cache est consulté
+            
+        Returns:
+            dict: Données ESG de l'entreprise, ou None si une extraction est nécessaire
+        """
+        if self.stale_while_revalidate:
+            # Servir immédiatement la valeur en cache, même périmée, et la rafraîchir en arrière-plan
+            entry = self.cache.get_stale(company_symbol)
+            if entry is not None:
+                company_data, fresh = entry
+                if force_refresh or not fresh:
+                    self.refresh_in_background(company_symbol)
+                return company_data
+        
+        if force_refresh:
+            return None
+        
+        company_data = self.cache.get(company_symbol)
+        if company_data is not None:
+            return company_data
+        
+        # Données extraites entre-temps par le scraper ou par un autre processus
+        if (self.storage or self.shared_store) and use_storage:
+            return self._read_stored_company(company_symbol)
+        
+        return None
+    
+    def _read_stored_company(self, company_symbol):
+        """
+        Lit les données d'une entreprise dans le magasin partagé puis dans le moteur de stockage, et les met en cache
+        
+        Args:
+            company_symbol (str): Symbole boursier de l'entreprise
+            
+        Returns:
+            dict: Données ESG de l'entreprise, ou None si elles sont absentes ou expirées
+        """
+        if self.shared_store:
+            shared = self.shared_store.get_company(company_symbol)
+            if shared and self._cache_company_data(company_symbol, *shared):
+                return shared[0]
+        if self.storage:
+            stored = self.storage.read_company(company_symbol)
+            if stored and self._cache_company_data(company_symbol, stored, self._records_age(stored)):
+                return stored
+        return None
+    
+    def _fetch_company_data(self, company_symbol):
+        """
+        Récupère de nouvelles données pour une entreprise et met à jour le cache
+        
+        Args:
+            company_symbol (str): Symbole boursier de l'entreprise
+            
+        Returns:
+            dict: Données ESG de l'entreprise
+        """
+        with self._fetch_duration.time():
             company_data = self.scraper.get_company_esg_data(company_symbol)
-            self.cached_data[company_symbol] = company_data
+        self.cache.set(company_symbol, company_data)
+        if self.shared_store:
+            self.shared_store.put_company(company_symbol, company_data)
+        # Pas d'écriture dans le moteur de stockage: SimpleESGScraper renvoie des
+        # données simulées pour les entreprises inconnues, qui remplaceraient les
+        # enregistrements réels d'ESGScraper dans latest_records()
+        
+        return company_data
+    
+    def refresh_in_background(self, company_symbol):
+        """
+        Planifie le rafraîchissement d'une entreprise sur un thread de travail
+        
+        Un seul rafraîchissement par entreprise est en attente à la fois.
         
-        return self.cached_data[company_symbol]
+        Args:
+            company_symbol (str): Symbole boursier de l'entreprise
+            
+        Returns:
+            bool: True si un rafraîchissement a été planifié
+        """
+        with self._refresh_lock:
+            if company_symbol in self._refreshing:
+                return False
+            if self._refresh_executor is None:
+                self._refresh_executor = ThreadPoolExecutor(
+                    max_workers=self.refresh_workers,
+                    thread_name_prefix="esg-refresh"
+                )
+            self._refreshing.add(company_symbol)
+            self._refresh_executor.submit(self._refresh_company, company_symbol)
+        return True
+    
+    def _refresh_company(self, company_symbol):
+        """Rafraîchit une entreprise (exécuté sur un thread de travail)"""
+        try:
+            self._inflight.do(company_symbol, self._fetch_company_data, company_symbol)
+            logger.info(f"Données ESG rafraîchies en arrière-plan pour {company_symbol}")
+        except Exception as e:
+            logger.error(f"Erreur lors du rafraîchissement de {company_symbol}: {e}")
+        finally:
+            with self._refresh_lock:
+                self._refreshing.discard(company_symbol)
+    
+    def start_refresh_scheduler(self):
+        """
+        Démarre l'ordonnanceur qui rafraîchit à l'avance les entreprises consultées
+        
+        Toutes les refresh_interval secondes, les entreprises déjà consultées
+        dont la validité expire dans moins de refresh_ahead secondes sont
+        rafraîchies en arrière-plan.
+        """
+        if self._scheduler is not None or not self.refresh_ahead:
+            return
+        self._scheduler_stop.clear()
+        self._scheduler = threading.Thread(target=self._run_scheduler, name="esg-refresh-scheduler", daemon=True)
+        self._scheduler.start()
+    
+    def _run_scheduler(self):
+        """Boucle de l'ordonnanceur de rafraîchissement"""
+        while not self._scheduler_stop.wait(self.refresh_interval):
+            for company_symbol in self.cache.expiring_keys(self.refresh_ahead):
+                self.refresh_in_background(company_symbol)
     
     def close(self):
-        """Méthode de fermeture (pour compatibilité)"""
-        pass
+        """Arrête les rafraîchissements et la surveillance des fichiers, et ferme les moteurs de stockage"""
+        self._store_sync_stop.set()
+        if self._store_sync is not None:
+            self._store_sync.join()
+            self._store_sync = None
+        self.stop_watching()
+        self._scheduler_stop.set()
+        if self._scheduler is not None:
+            self._scheduler.join()
+            self._scheduler = None
+        with self._refresh_lock:
+            executor, self._refresh_executor = self._refresh_executor, None
+        if executor is not None:
+            executor.shutdown(wait=True, cancel_futures=True)
+        with self._io_lock:
+            io_executor, self._io_executor = self._io_executor, None
+        if io_executor is not None:
+            io_executor.shutdown(wait=True)
+        if self.storage:
+            self.storage.close()
+        if self.shared_store:
+            if self._is_refresher:
+                self.shared_store.release_refresher(self._store_owner)
+                self._is_refresher = False
+            self.shared_store.close()
@@ -1,10 +1,11 @@
-import requests
-from bs4 import BeautifulSoup
-import pandas as pd
 import time
+import functools
 import logging
 import os
+import threading
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
 from datetime import datetime
+from itertools import islice
 from selenium import webdriver
 from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.common.by import By
@@ -12,6 +13,15 @@ from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException, NoSuchElementException
 
+from .checkpoint import CheckpointJournal
+from .consolidation import ConsolidationWriter
+from .extraction import ExtractionSpec, FieldSpec
+from .http_cache import CachedHTTPClient
+from .metrics import REGISTRY
+from .rate_limiter import HostRateLimiter
+from .storage import DEFAULT_DATA_DIR, DEFAULT_STORAGE_BACKEND, create_storage
+from .webdriver_pool import WebDriverPool
+
 # Configuration du logging
 logging.basicConfig(
     level=logging.INFO,
@@ -20,42 +30,243 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Sources interrogées pour chaque entreprise, dans l'ordre historique
+SOURCES = ["msci", "refinitiv", "sustainalytics", "bloomberg", "cdp"]
+
+# Libellés utilisés dans les enregistrements produits par chaque source
+SOURCE_LABELS = {
+    "msci": "MSCI",
+    "refinitiv": "Refinitiv",
+    "sustainalytics": "Sustainalytics",
+    "bloomberg": "Bloomberg",
+    "cdp": "CDP"
+}
+
+# Champs extraits par source. Ces sélecteurs CSS sont hypothétiques et doivent
+# être adaptés à la structure réelle des pages.
+SOURCE_SPECS = {
+    "msci": ExtractionSpec([
+        FieldSpec("esg_rating", ".esg-rating"),
+        FieldSpec("environmental_score", ".env-score"),
+        FieldSpec("social_score", ".social-score"),
+        FieldSpec("governance_score", ".gov-score")
+    ]),
+    "refinitiv": ExtractionSpec([
+        FieldSpec("esg_score", ".esg-score"),
+        FieldSpec("environmental_score", ".env-pillar"),
+        FieldSpec("social_score", ".social-pillar"),
+        FieldSpec("governance_score", ".gov-pillar")
+    ]),
+    "sustainalytics": ExtractionSpec([
+        FieldSpec("esg_risk_rating", ".esg-risk-rating"),
+        FieldSpec("environmental_risk", ".env-risk"),
+        FieldSpec("social_risk", ".social-risk"),
+        FieldSpec("governance_risk", ".gov-risk")
+    ]),
+    "bloomberg": ExtractionSpec([
+        FieldSpec("esg_disclosure_score", ".esg-disclosure-score"),
+        FieldSpec("environmental_disclosure", ".env-disclosure"),
+        FieldSpec("social_disclosure", ".social-disclosure"),
+        FieldSpec("governance_disclosure", ".gov-disclosure")
+    ]),
+    "cdp": ExtractionSpec([
+        FieldSpec("climate_rating", ".climate-score"),
+        FieldSpec("water_rating", ".water-score"),
+        FieldSpec("forest_rating", ".forest-score")
+    ])
+}
+
+# Délai maximal (en secondes) accordé à chaque source en mode concurrent
+DEFAULT_SOURCE_TIMEOUTS = {
+    "msci": 30,
+    "refinitiv": 20,
+    "sustainalytics": 30,
+    "bloomberg": 40,
+    "cdp": 45
+}
+
+# Délai de chargement d'une page appliqué aux navigateurs hors délai de source
+# (valeur par défaut de Selenium)
+DEFAULT_PAGE_LOAD_TIMEOUT = 300
+
+# Durée et échecs de l'extraction de chaque source
+SCRAPE_DURATION = REGISTRY.histogram(
+    "esg_scrape_duration_seconds",
+    "Durée de l'extraction d'une source pour une entreprise",
+    labels=("source",)
+)
+SCRAPE_FAILURES = REGISTRY.counter(
+    "esg_scrape_failures_total",
+    "Extractions en échec par source (exception, error: enregistrement d'erreur, timeout)",
+    labels=("source", "reason")
+)
+
+class _SourceDeadline:
+    """
+    Délai d'une source, compté à partir du début de son exécution (pas de sa
+    soumission) et prolongé des attentes du limiteur de débit
+    """
+    
+    def __init__(self, timeout):
+        """
+        Initialise le délai
+        
+        Args:
+            timeout (float, optional): Délai en secondes (None: pas de délai)
+        """
+        self.timeout = timeout
+        self.started = threading.Event()
+        self._start = None
+        self._throttled = 0.0
+        self._lock = threading.Lock()
+    
+    def begin(self):
+        """Démarre le délai (appelé par la tâche de la source)"""
+        self._start = time.monotonic()
+        self.started.set()
+    
+    def add_throttled(self, seconds):
+        """Exclut du délai une attente du limiteur de débit"""
+        with self._lock:
+            self._throttled += seconds
+    
+    def remaining(self):
+        """Temps restant en secondes (None: pas de délai)"""
+        if self.timeout is None:
+            return None
+        if self._start is None:
+            # Tâche pas encore démarrée (ou annulée avant de démarrer)
+            return self.timeout
+        with self._lock:
+            return self._start + self._throttled + self.timeout - time.monotonic()
+
 class ESGScraper:
-    def __init__(self, output_dir="esg_data"):
+    def __init__(self, output_dir=DEFAULT_DATA_DIR, concurrent=False, max_workers=None,
+                 source_timeouts=None, pool_size=1, max_pages_per_driver=100,
+                 max_driver_memory_mb=1024, http_cache_dir=None, http_timeout=15,
+                 rate_limits=None, fast_parse=True, storage_backend=DEFAULT_STORAGE_BACKEND):
         """
         Initialise le scraper ESG
         
         Args:
             output_dir (str): Répertoire où sauvegarder les données
+            concurrent (bool): Si True, interroge les sources d'une entreprise en parallèle
+            max_workers (int, optional): Nombre maximal de sources interrogées
+                simultanément (par défaut: len(SOURCES) par navigateur du pool)
+            source_timeouts (dict, optional): Délai maximal en secondes par source
+                (complète DEFAULT_SOURCE_TIMEOUTS)
+            pool_size (int): Nombre de navigateurs headless du pool
+            max_pages_per_driver (int): Pages servies avant recyclage d'un navigateur
+            max_driver_memory_mb (int): Mémoire (Mo) au-delà de laquelle un navigateur est recyclé
+            http_cache_dir (str, optional): Répertoire du cache HTTP
+                (par défaut: <output_dir>/http_cache)
+            http_timeout (float): Délai maximal d'une requête HTTP en secondes
+            rate_limits (dict, optional): {domaine: (requêtes par seconde, rafale)}
+                (complète DEFAULT_HOST_LIMITS)
+            fast_parse (bool): Si True, n'analyse que les sous-arbres contenant
+                les champs recherchés (lxml si disponible)
+            storage_backend (str): Moteur de stockage des enregistrements
+                ("sqlite", "parquet" ou "csv" pour un fichier par entreprise et par source)
         """
         self.headers = {
             "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36",
             "Accept-Language": "en-US,en;q=0.9",
         }
         self.output_dir = output_dir
+        self.fast_parse = fast_parse
         
         # Créer le répertoire de sortie s'il n'existe pas
         if not os.path.exists(output_dir):
             os.makedirs(output_dir)
             
-        # Initialiser le pilote Selenium (pour les sites qui nécessitent JavaScript)
-        self.driver = None
+        # Moteur de stockage des enregistrements extraits
+        self.storage = create_storage(storage_backend, output_dir)
+        
+        # Limiteur de débit par domaine, partagé par toutes les sources et tous les threads
+        self.rate_limiter = HostRateLimiter(rate_limits)
+        
+        # Session HTTP partagée avec cache conditionnel (ETag / Last-Modified)
+        self.http = CachedHTTPClient(
+            http_cache_dir or os.path.join(output_dir, "http_cache"),
+            headers=self.headers,
+            timeout=http_timeout,
+            rate_limiter=self.rate_limiter
+        )
+        
+        # Mode concurrent: un exécuteur borné partagé par toutes les entreprises
+        self.concurrent = concurrent
+        self.max_workers = max(1, max_workers or len(SOURCES) * max(1, pool_size))
+        self.source_timeouts = dict(DEFAULT_SOURCE_TIMEOUTS)
+        if source_timeouts:
+            self.source_timeouts.update(source_timeouts)
+        self._executor = None
+        self._executor_lock = threading.Lock()
+        # Délai de la source exécutée par le thread courant (voir _time_budget)
+        self._current = threading.local()
+            
+        # Pool de navigateurs Selenium (pour les sites qui nécessitent JavaScript).
+        # Un WebDriver n'est pas thread-safe: chaque page emprunte le sien au pool.
+        self.driver_pool = WebDriverPool(
+            self._create_driver,
+            size=pool_size,
+            max_pages=max_pages_per_driver,
+            max_memory_mb=max_driver_memory_mb
+        )
+    
+    def _create_driver(self):
+        """Crée un navigateur Selenium headless"""
+        options = Options()
+        options.add_argument("--headless")  # Mode sans interface graphique
+        options.add_argument("--no-sandbox")
+        options.add_argument("--disable-dev-shm-usage")
+        options.add_argument(f"user-agent={self.headers['User-Agent']}")
+        return webdriver.Chrome(options=options)
+    
+    def _get_executor(self):
+        """Crée à la demande l'exécuteur borné utilisé en mode concurrent"""
+        with self._executor_lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers,
+                    thread_name_prefix="esg-source"
+                )
+            return self._executor
     
-    def _init_selenium(self):
-        """Initialise le navigateur Selenium si nécessaire"""
-        if self.driver is None:
-            options = Options()
-            options.add_argument("--headless")  # Mode sans interface graphique
-            options.add_argument("--no-sandbox")
-            options.add_argument("--disable-dev-shm-usage")
-            options.add_argument(f"user-agent={self.headers['User-Agent']}")
-            self.driver = webdriver.Chrome(options=options)
+    def _time_budget(self, limit):
+        """
+        Borne une attente réseau par le temps restant à la source en cours
+        
+        Une tâche abandonnée après son délai (future.cancel() n'interrompt pas
+        un thread déjà démarré) libère ainsi son navigateur et sa connexion
+        au plus tard à l'expiration de ce délai.
+        
+        Args:
+            limit (float): Attente maximale hors délai de source, en secondes
+        
+        Returns:
+            float: L'attente maximale à appliquer
+        
+        Raises:
+            TimeoutError: Si le délai de la source est déjà dépassé
+        """
+        deadline = getattr(self._current, "deadline", None)
+        remaining = deadline.remaining() if deadline else None
+        if remaining is None:
+            return limit
+        if remaining <= 0:
+            raise TimeoutError("Délai de la source dépassé")
+        return min(limit, remaining)
     
     def close(self):
-        """Ferme le navigateur Selenium"""
-        if self.driver:
-            self.driver.quit()
-            self.driver = None
+        """Ferme l'exécuteur, la session HTTP, les navigateurs du pool et le stockage"""
+        with self._executor_lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = None
+        
+        self.http.close()
+        self.driver_pool.close()
+        self.storage.close()
     
     def scrape_msci_esg_ratings(self, company_symbol):
         """
@@ -72,44 +283,7 @@ class ESGScraper:
         # URL exemple pour MSCI (à adapter selon la structure réelle du site)
         url = f"https://www.msci.com/our-solutions/esg-investing/esg-ratings/esg-ratings-corporate-search-tool/issuer/{company_symbol}"
         
-        try:
-            self._init_selenium()
-            self.driver.get(url)
-            
-            # Attendre que les éléments ESG soient chargés
-            WebDriverWait(self.driver, 10).until(
-                EC.presence_of_element_located((By.CSS_SELECTOR, ".esg-rating"))
-            )
-            
-            # Extraire les données ESG
-            soup = BeautifulSoup(self.driver.page_source, "html.parser")
-            
-            # Ces sélecteurs CSS sont hypothétiques et doivent être adaptés à la structure réelle
-            esg_rating = soup.select_one(".esg-rating").text.strip() if soup.select_one(".esg-rating") else "N/A"
-            environmental_score = soup.select_one(".env-score").text.strip() if soup.select_one(".env-score") else "N/A"
-            social_score = soup.select_one(".social-score").text.strip() if soup.select_one(".social-score") else "N/A"
-            governance_score = soup.select_one(".gov-score").text.strip() if soup.select_one(".gov-score") else "N/A"
-            
-            data = {
-                "source": "MSCI",
-                "company": company_symbol,
-                "esg_rating": esg_rating,
-                "environmental_score": environmental_score,
-                "social_score": social_score,
-                "governance_score": governance_score,
-                "date_extracted": datetime.now().strftime("%Y-%m-%d")
-            }
-            
-            return data
-            
-        except Exception as e:
-            logger.error(f"Erreur lors de l'extraction des données MSCI ESG pour {company_symbol}: {str(e)}")
-            return {
-                "source": "MSCI",
-                "company": company_symbol,
-                "error": str(e),
-                "date_extracted": datetime.now().strftime("%Y-%m-%d")
-            }
+        return self._scrape_selenium_page("msci", company_symbol, url, ".esg-rating", 10)
     
     def scrape_refinitiv_esg(self, company_symbol):
         """
@@ -127,37 +301,22 @@ class ESGScraper:
         url = f"https://www.refinitiv.com/esg-scores/{company_symbol}"
         
         try:
-            response = requests.get(url, headers=self.headers)
-            response.raise_for_status()
-            
-            soup = BeautifulSoup(response.text, "html.parser")
+            response = self.http.get(url, timeout=self._time_budget(self.http.timeout))
             
-            # Adapater ces sélecteurs à la structure réelle de la page
-            esg_score = soup.select_one(".esg-score").text.strip() if soup.select_one(".esg-score") else "N/A"
-            environmental_score = soup.select_one(".env-pillar").text.strip() if soup.select_one(".env-pillar") else "N/A"
-            social_score = soup.select_one(".social-pillar").text.strip() if soup.select_one(".social-pillar") else "N/A"
-            governance_score = soup.select_one(".gov-pillar").text.strip() if soup.select_one(".gov-pillar") else "N/A"
+            # Page inchangée depuis la dernière extraction: réutiliser les données déjà analysées
+            if response.not_modified and response.parsed:
+                data = dict(response.parsed)
+                data["date_extracted"] = datetime.now().strftime("%Y-%m-%d")
+                return data
             
-            data = {
-                "source": "Refinitiv",
-                "company": company_symbol,
-                "esg_score": esg_score,
-                "environmental_score": environmental_score,
-                "social_score": social_score,
-                "governance_score": governance_score,
-                "date_extracted": datetime.now().strftime("%Y-%m-%d")
-            }
+            data = self._build_record("refinitiv", company_symbol, response.text)
             
+            self.http.store_parsed(url, data)
             return data
             
         except Exception as e:
             logger.error(f"Erreur lors de l'extraction des données Refinitiv ESG pour {company_symbol}: {str(e)}")
-            return {
-                "source": "Refinitiv",
-                "company": company_symbol,
-                "error": str(e),
-                "date_extracted": datetime.now().strftime("%Y-%m-%d")
-            }
+            return self._error_record("refinitiv", company_symbol, e)
     
     def scrape_sustainalytics_esg(self, company_symbol):
         """
@@ -174,44 +333,7 @@ class ESGScraper:
         # URL exemple pour Sustainalytics (à adapter)
         url = f"https://www.sustainalytics.com/esg-rating/company/{company_symbol}"
         
-        try:
-            self._init_selenium()
-            self.driver.get(url)
-            
-            # Attendre que les éléments ESG soient chargés
-            WebDriverWait(self.driver, 10).until(
-                EC.presence_of_element_located((By.CSS_SELECTOR, ".esg-risk-rating"))
-            )
-            
-            # Extraire les données ESG
-            soup = BeautifulSoup(self.driver.page_source, "html.parser")
-            
-            # Ces sélecteurs CSS sont hypothétiques et doivent être adaptés à la structure réelle
-            esg_risk_rating = soup.select_one(".esg-risk-rating").text.strip() if soup.select_one(".esg-risk-rating") else "N/A"
-            environmental_risk = soup.select_one(".env-risk").text.strip() if soup.select_one(".env-risk") else "N/A"
-            social_risk = soup.select_one(".social-risk").text.strip() if soup.select_one(".social-risk") else "N/A"
-            governance_risk = soup.select_one(".gov-risk").text.strip() if soup.select_one(".gov-risk") else "N/A"
-            
-            data = {
-                "source": "Sustainalytics",
-                "company": company_symbol,
-                "esg_risk_rating": esg_risk_rating,
-                "environmental_risk": environmental_risk,
-                "social_risk": social_risk,
-                "governance_risk": governance_risk,
-                "date_extracted": datetime.now().strftime("%Y-%m-%d")
-            }
-            
-            return data
-            
-        except Exception as e:
-            logger.error(f"Erreur lors de l'extraction des données Sustainalytics ESG pour {company_symbol}: {str(e)}")
-            return {
-                "source": "Sustainalytics",
-                "company": company_symbol,
-                "error": str(e),
-                "date_extracted": datetime.now().strftime("%Y-%m-%d")
-            }
+        return self._scrape_selenium_page("sustainalytics", company_symbol, url, ".esg-risk-rating", 10)
     
     def scrape_bloomberg_esg(self, company_symbol):
         """
@@ -228,44 +350,7 @@ class ESGScraper:
         # URL exemple pour Bloomberg (à adapter)
         url = f"https://www.bloomberg.com/quote/{company_symbol}:US/sustainability"
         
-        try:
-            self._init_selenium()
-            self.driver.get(url)
-            
-            # Attendre que les éléments ESG soient chargés
-            WebDriverWait(self.driver, 15).until(
-                EC.presence_of_element_located((By.CSS_SELECTOR, ".esg-disclosure-score"))
-            )
-            
-            # Extraire les données ESG
-            soup = BeautifulSoup(self.driver.page_source, "html.parser")
-            
-            # Ces sélecteurs CSS sont hypothétiques et doivent être adaptés à la structure réelle
-            esg_disclosure_score = soup.select_one(".esg-disclosure-score").text.strip() if soup.select_one(".esg-disclosure-score") else "N/A"
-            environmental_disclosure = soup.select_one(".env-disclosure").text.strip() if soup.select_one(".env-disclosure") else "N/A"
-            social_disclosure = soup.select_one(".social-disclosure").text.strip() if soup.select_one(".social-disclosure") else "N/A"
-            governance_disclosure = soup.select_one(".gov-disclosure").text.strip() if soup.select_one(".gov-disclosure") else "N/A"
-            
-            data = {
-                "source": "Bloomberg",
-                "company": company_symbol,
-                "esg_disclosure_score": esg_disclosure_score,
-                "environmental_disclosure": environmental_disclosure,
-                "social_disclosure": social_disclosure,
-                "governance_disclosure": governance_disclosure,
-                "date_extracted": datetime.now().strftime("%Y-%m-%d")
-            }
-            
-            return data
-            
-        except Exception as e:
-            logger.error(f"Erreur lors de l'extraction des données Bloomberg ESG pour {company_symbol}: {str(e)}")
-            return {
-                "source": "Bloomberg",
-                "company": company_symbol,
-                "error": str(e),
-                "date_extracted": datetime.now().strftime("%Y-%m-%d")
-            }
+        return self._scrape_selenium_page("bloomberg", company_symbol, url, ".esg-disclosure-score", 15)
 
     def scrape_cdp_climate_ratings(self, company_name):
         """
@@ -283,57 +368,114 @@ class ESGScraper:
         url = "https://www.cdp.net/en/companies/companies-scores"
         
         try:
-            self._init_selenium()
-            self.driver.get(url)
-            
-            # Rechercher l'entreprise
-            search_input = WebDriverWait(self.driver, 10).until(
-                EC.presence_of_element_located((By.ID, "company-search"))
-            )
-            search_input.send_keys(company_name)
-            search_button = self.driver.find_element(By.CSS_SELECTOR, ".search-button")
-            search_button.click()
-            
-            # Attendre les résultats
-            WebDriverWait(self.driver, 10).until(
-                EC.presence_of_element_located((By.CSS_SELECTOR, ".company-result"))
-            )
+            self.rate_limiter.acquire(url)
+            with self.driver_pool.lease() as driver:
+                driver.set_page_load_timeout(self._time_budget(DEFAULT_PAGE_LOAD_TIMEOUT))
+                driver.get(url)
+                
+                # Rechercher l'entreprise
+                search_input = WebDriverWait(driver, self._time_budget(10)).until(
+                    EC.presence_of_element_located((By.ID, "company-search"))
+                )
+                search_input.send_keys(company_name)
+                search_button = driver.find_element(By.CSS_SELECTOR, ".search-button")
+                search_button.click()
+                
+                # Attendre les résultats
+                WebDriverWait(driver, self._time_budget(10)).until(
+                    EC.presence_of_element_located((By.CSS_SELECTOR, ".company-result"))
+                )
+                
+                page_source = driver.page_source
             
             # Extraire les données climatiques
-            soup = BeautifulSoup(self.driver.page_source, "html.parser")
+            return self._build_record("cdp", company_name, page_source)
             
-            # Ces sélecteurs CSS sont hypothétiques et doivent être adaptés à la structure réelle
-            climate_rating = soup.select_one(".climate-score").text.strip() if soup.select_one(".climate-score") else "N/A"
-            water_rating = soup.select_one(".water-score").text.strip() if soup.select_one(".water-score") else "N/A"
-            forest_rating = soup.select_one(".forest-score").text.strip() if soup.select_one(".forest-score") else "N/A"
+        except Exception as e:
+            logger.error(f"Erreur lors de l'extraction des données CDP pour {company_name}: {str(e)}")
+            return self._error_record("cdp", company_name, e)
+    
+    def _scrape_selenium_page(self, source, company_symbol, url, wait_selector, wait_timeout):
+        """
+        Charge une page rendue en JavaScript et en extrait les champs de la source
+        
+        Args:
+            source (str): Clé de la source (voir SOURCE_SPECS)
+            company_symbol (str): Le symbole boursier de l'entreprise
+            url (str): L'URL de la page
+            wait_selector (str): Sélecteur CSS attendu avant l'extraction
+            wait_timeout (int): Attente maximale de ce sélecteur en secondes
             
-            data = {
-                "source": "CDP",
-                "company": company_name,
-                "climate_rating": climate_rating,
-                "water_rating": water_rating,
-                "forest_rating": forest_rating,
-                "date_extracted": datetime.now().strftime("%Y-%m-%d")
-            }
+        Returns:
+            dict: Les données ESG extraites
+        """
+        try:
+            self.rate_limiter.acquire(url)
+            with self.driver_pool.lease() as driver:
+                driver.set_page_load_timeout(self._time_budget(DEFAULT_PAGE_LOAD_TIMEOUT))
+                driver.get(url)
+                
+                # Attendre que les éléments ESG soient chargés
+                WebDriverWait(driver, self._time_budget(wait_timeout)).until(
+                    EC.presence_of_element_located((By.CSS_SELECTOR, wait_selector))
+                )
+                
+                page_source = driver.page_source
             
-            return data
+            # Extraire les données ESG
+            return self._build_record(source, company_symbol, page_source)
             
         except Exception as e:
-            logger.error(f"Erreur lors de l'extraction des données CDP pour {company_name}: {str(e)}")
-            return {
-                "source": "CDP",
-                "company": company_name,
-                "error": str(e),
-                "date_extracted": datetime.now().strftime("%Y-%m-%d")
-            }
+            logger.error(f"Erreur lors de l'extraction des données {SOURCE_LABELS[source]} ESG pour {company_symbol}: {str(e)}")
+            return self._error_record(source, company_symbol, e)
+    
+    def _build_record(self, source, company, markup):
+        """
+        Construit l'enregistrement d'une source à partir du code HTML de la page
+        
+        Args:
+            source (str): Clé de la source (voir SOURCE_SPECS)
+            company (str): Symbole ou nom de l'entreprise
+            markup (str): Le code HTML de la page
+            
+        Returns:
+            dict: L'enregistrement de la source
+        """
+        data = {"source": SOURCE_LABELS[source], "company": company}
+        data.update(SOURCE_SPECS[source].parse_and_extract(markup, partial=self.fast_parse))
+        data["date_extracted"] = datetime.now().strftime("%Y-%m-%d")
+        return data
+    
+    @staticmethod
+    def _error_record(source, company, error):
+        """
+        Construit l'enregistrement d'une source en échec
+        
+        Args:
+            source (str): Clé de la source
+            company (str): Symbole ou nom de l'entreprise
+            error (Exception|str): L'erreur rencontrée
+            
+        Returns:
+            dict: L'enregistrement d'erreur
+        """
+        return {
+            "source": SOURCE_LABELS[source],
+            "company": company,
+            "error": str(error),
+            "date_extracted": datetime.now().strftime("%Y-%m-%d")
+        }
 
-    def scrape_company_esg_data(self, company_symbol, company_name=None):
+    def scrape_company_esg_data(self, company_symbol, company_name=None, sources=None, journal=None):
         """
         Extrait les données ESG de toutes les sources pour une entreprise
         
         Args:
             company_symbol (str): Le symbole boursier de l'entreprise
             company_name (str, optional): Le nom complet de l'entreprise (pour CDP)
+            sources (list, optional): Sources à interroger (par défaut: SOURCES)
+            journal (CheckpointJournal, optional): Journal où consigner chaque
+                source extraite avec succès
             
         Returns:
             dict: Toutes les données ESG extraites
@@ -341,116 +483,308 @@ class ESGScraper:
         if company_name is None:
             company_name = company_symbol
             
-        all_data = {}
+        tasks = self._source_tasks(company_symbol, company_name)
+        if sources is not None:
+            tasks = {source: task for source, task in tasks.items() if source in sources}
         
         # Extraction depuis différentes sources
-        all_data["msci"] = self.scrape_msci_esg_ratings(company_symbol)
-        all_data["refinitiv"] = self.scrape_refinitiv_esg(company_symbol)
-        all_data["sustainalytics"] = self.scrape_sustainalytics_esg(company_symbol)
-        all_data["bloomberg"] = self.scrape_bloomberg_esg(company_symbol)
-        all_data["cdp"] = self.scrape_cdp_climate_ratings(company_name)
+        if self.concurrent:
+            all_data = self._scrape_sources_concurrently(tasks, company_symbol, journal)
+        else:
+            all_data = {}
+            for source, (func, arg) in tasks.items():
+                all_data[source] = func(arg)
+                self._journal_result(journal, company_symbol, source, all_data[source])
         
         # Sauvegarder les données
         self._save_data(all_data, company_symbol)
         
         return all_data
     
-    def scrape_multiple_companies(self, companies_list):
+    @staticmethod
+    def _journal_result(journal, company_symbol, source, data):
+        """Consigne dans le journal le résultat d'une source s'il n'est pas en erreur"""
+        if journal is not None and "error" not in data:
+            journal.record(company_symbol, source, data)
+    
+    def _source_tasks(self, company_symbol, company_name):
         """
-        Extrait les données ESG pour plusieurs entreprises
+        Associe chaque source à sa méthode d'extraction et à son argument
         
         Args:
-            companies_list (list): Liste de tuples (symbole, nom) des entreprises
+            company_symbol (str): Le symbole boursier de l'entreprise
+            company_name (str): Le nom complet de l'entreprise (pour CDP)
             
         Returns:
-            dict: Données ESG pour toutes les entreprises
+            dict: {source: (méthode, argument)} dans l'ordre de SOURCES
         """
-        all_companies_data = {}
+        tasks = {
+            "msci": (self.scrape_msci_esg_ratings, company_symbol),
+            "refinitiv": (self.scrape_refinitiv_esg, company_symbol),
+            "sustainalytics": (self.scrape_sustainalytics_esg, company_symbol),
+            "bloomberg": (self.scrape_bloomberg_esg, company_symbol),
+            "cdp": (self.scrape_cdp_climate_ratings, company_name)
+        }
+        return {source: (self._instrumented(source, func), arg) for source, (func, arg) in tasks.items()}
+    
+    @staticmethod
+    def _instrumented(source, func):
+        """
+        Enveloppe une méthode d'extraction pour mesurer sa durée et compter ses échecs
         
-        for company_info in companies_list:
-            if isinstance(company_info, tuple) and len(company_info) >= 2:
-                symbol, name = company_info[0], company_info[1]
-            else:
-                symbol = company_info
-                name = company_info
-                
-            logger.info(f"Traitement de l'entreprise: {name} ({symbol})")
+        Args:
+            source (str): La source interrogée
+            func (callable): La méthode d'extraction
             
-            # Ajouter un délai entre les requêtes pour éviter le blocage
-            time.sleep(2)
+        Returns:
+            callable: La méthode instrumentée
+        """
+        @functools.wraps(func)
+        def wrapper(arg):
+            start = time.perf_counter()
+            try:
+                data = func(arg)
+            except Exception:
+                SCRAPE_FAILURES.inc(source=source, reason="exception")
+                raise
+            finally:
+                SCRAPE_DURATION.observe(time.perf_counter() - start, source=source)
+            if "error" in data:
+                SCRAPE_FAILURES.inc(source=source, reason="error")
+            return data
+        return wrapper
+    
+    def _scrape_sources_concurrently(self, tasks, company_symbol, journal=None):
+        """
+        Interroge les sources en parallèle sur l'exécuteur borné
+        
+        Chaque source dispose de son propre délai, compté à partir du début
+        de son exécution: l'attente dans la file de l'exécuteur (toutes les
+        entreprises le partagent) et celle d'un jeton du limiteur de débit
+        ne sont pas décomptées.
+        
+        Args:
+            tasks (dict): {source: (méthode, argument)}
+            company_symbol (str): Le symbole boursier de l'entreprise
+            journal (CheckpointJournal, optional): Journal des sources extraites
             
+        Returns:
+            dict: Les données de chaque source, dans l'ordre de tasks
+        """
+        executor = self._get_executor()
+        deadlines = {source: _SourceDeadline(self.source_timeouts.get(source)) for source in tasks}
+        futures = {
+            source: executor.submit(self._run_source, deadlines[source], func, arg)
+            for source, (func, arg) in tasks.items()
+        }
+        
+        all_data = {}
+        for source, future in futures.items():
+            timeout = self.source_timeouts.get(source)
             try:
-                company_data = self.scrape_company_esg_data(symbol, name)
-                all_companies_data[symbol] = company_data
+                all_data[source] = self._wait_for_source(future, deadlines[source])
+                self._journal_result(journal, company_symbol, source, all_data[source])
+            except FutureTimeoutError:
+                future.cancel()
+                SCRAPE_FAILURES.inc(source=source, reason="timeout")
+                logger.error(f"Délai dépassé ({timeout}s) pour la source {SOURCE_LABELS[source]}")
+                all_data[source] = self._error_record(source, tasks[source][1], f"Délai dépassé ({timeout}s)")
             except Exception as e:
-                logger.error(f"Erreur lors du traitement de {name}: {str(e)}")
-                all_companies_data[symbol] = {"error": str(e)}
+                logger.error(f"Erreur lors de l'extraction depuis {SOURCE_LABELS[source]}: {str(e)}")
+                all_data[source] = self._error_record(source, tasks[source][1], e)
         
-        # Consolider les données en un seul DataFrame
-        self._consolidate_data(all_companies_data)
-        
-        return all_companies_data
+        return all_data
     
-    def _save_data(self, data, company_symbol):
+    def _run_source(self, deadline, func, arg):
+        """Exécute l'extraction d'une source en démarrant son délai (hors attentes du limiteur de débit)"""
+        deadline.begin()
+        self._current.deadline = deadline
+        try:
+            with self.rate_limiter.waits_reported_to(deadline.add_throttled):
+                return func(arg)
+        finally:
+            self._current.deadline = None
+    
+    @staticmethod
+    def _wait_for_source(future, deadline):
         """
-        Sauvegarde les données ESG pour une entreprise
+        Attend le résultat d'une source dans la limite de son délai
         
         Args:
-            data (dict): Les données à sauvegarder
-            company_symbol (str): Le symbole de l'entreprise
+            future (Future): La tâche de la source
+            deadline (_SourceDeadline): Son délai, démarré par la tâche
+            
+        Returns:
+            dict: Les données de la source
+            
+        Raises:
+            concurrent.futures.TimeoutError: Si le délai est dépassé
         """
-        # Créer un DataFrame pour chaque source
-        for source, source_data in data.items():
-            df = pd.DataFrame([source_data])
+        # Tâche encore dans la file de l'exécuteur: son délai n'a pas commencé
+        while not deadline.started.wait(0.1):
+            if future.done():
+                break
+        if future.done():
+            return future.result()
+        while True:
+            remaining = deadline.remaining()
+            try:
+                return future.result(timeout=None if remaining is None else max(0, remaining))
+            except FutureTimeoutError:
+                # Délai prolongé entre-temps par une attente du limiteur de débit
+                if deadline.remaining() <= 0:
+                    raise
+    
+    def scrape_multiple_companies(self, companies_list, max_company_workers=None,
+                                  journal_path=None, resume=False, keep_results=False,
+                                  chunk_size=100):
+        """
+        Extrait les données ESG pour plusieurs entreprises
+        
+        Les entreprises sont traitées par blocs de chunk_size: à la fin de
+        chaque bloc, les enregistrements sont écrits dans le stockage et les
+        fichiers consolidés sont complétés. Par défaut (keep_results=False),
+        aucun résultat n'est conservé en mémoire, qui reste donc constante
+        quelle que soit la taille de la liste: les données se lisent dans le
+        stockage et les fichiers consolidés.
+        
+        Avec un journal, chaque source extraite avec succès est consignée
+        dès qu'elle est terminée. En mode reprise, les couples (entreprise,
+        source) déjà journalisés ne sont pas extraits à nouveau et la
+        consolidation utilise les résultats du journal.
+        
+        Args:
+            companies_list (iterable): Tuples (symbole, nom) des entreprises
+            max_company_workers (int, optional): Nombre d'entreprises traitées en
+                parallèle (par défaut: la taille du pool de navigateurs); en mode
+                concurrent, limité à max_workers // len(SOURCES) pour que les
+                sources de chaque entreprise aient un thread de l'exécuteur
+            journal_path (str, optional): Chemin du journal de reprise
+                (par défaut en mode reprise: <output_dir>/scrape_journal.jsonl)
+            resume (bool): Si True, reprend un traitement interrompu à partir du journal
+            keep_results (bool): Si True, renvoie aussi les données extraites
+            chunk_size (int): Nombre d'entreprises par bloc
             
-            # Sauvegarder en CSV
-            filename = f"{self.output_dir}/{company_symbol}_{source}_esg_data.csv"
-            df.to_csv(filename, index=False)
-            logger.info(f"Données sauvegardées dans {filename}")
+        Returns:
+            dict: Données ESG pour toutes les entreprises (None si keep_results=False)
+        """
+        if max_company_workers is None:
+            max_company_workers = self.driver_pool.size
+        if self.concurrent:
+            limit = max(1, self.max_workers // len(SOURCES))
+            if max_company_workers > limit:
+                logger.info(f"Entreprises traitées en parallèle limitées à {limit} "
+                            f"({self.max_workers} threads pour {len(SOURCES)} sources)")
+                max_company_workers = limit
+        if resume and journal_path is None:
+            journal_path = os.path.join(self.output_dir, "scrape_journal.jsonl")
+        journal = CheckpointJournal(journal_path, resume=resume) if journal_path else None
+        
+        companies = (self._parse_company_info(company_info) for company_info in companies_list)
+        all_companies_data = {} if keep_results else None
+        
+        # Consolidation incrémentale, au fil des blocs
+        writer = self._consolidation_writer(chunk_size)
+        executor = None
+        if max_company_workers > 1:
+            executor = ThreadPoolExecutor(max_workers=max_company_workers, thread_name_prefix="esg-company")
+        
+        try:
+            while True:
+                chunk = list(islice(companies, chunk_size))
+                if not chunk:
+                    break
+                
+                if executor is not None:
+                    results = executor.map(lambda company: self._scrape_company_safe(*company, journal=journal), chunk)
+                else:
+                    results = (self._scrape_company_safe(symbol, name, journal=journal) for symbol, name in chunk)
+                
+                for (symbol, _), data in zip(chunk, results):
+                    writer.add_company(symbol, data)
+                    if keep_results:
+                        all_companies_data[symbol] = data
+                
+                self.storage.flush()
+                writer.flush()
+        finally:
+            if executor is not None:
+                executor.shutdown()
+            if journal is not None:
+                journal.close()
+            writer.close()
+        
+        return all_companies_data
     
-    def _consolidate_data(self, all_companies_data):
+    def _consolidation_writer(self, chunk_size=100):
         """
-        Consolide les données de toutes les entreprises en un seul fichier
+        Crée l'écriture incrémentale des fichiers consolidés
         
         Args:
-            all_companies_data (dict): Les données de toutes les entreprises
+            chunk_size (int): Nombre d'entreprises en tampon avant écriture
+            
+        Returns:
+            ConsolidationWriter: L'écriture, avec le schéma des colonnes de SOURCE_SPECS
         """
-        # Créer des DataFrames consolidés par source
-        sources = ["msci", "refinitiv", "sustainalytics", "bloomberg", "cdp"]
+        source_fields = {source: SOURCE_SPECS[source].field_names for source in SOURCES}
+        return ConsolidationWriter(self.output_dir, source_fields, chunk_size=chunk_size)
+    
+    @staticmethod
+    def _parse_company_info(company_info):
+        """
+        Normalise une entrée de la liste des entreprises
         
-        for source in sources:
-            source_data_list = []
+        Args:
+            company_info (tuple|str): Tuple (symbole, nom) ou simple symbole
             
-            for company, data in all_companies_data.items():
-                if source in data and "error" not in data[source]:
-                    source_data_list.append(data[source])
+        Returns:
+            tuple: (symbole, nom)
+        """
+        if isinstance(company_info, tuple) and len(company_info) >= 2:
+            return company_info[0], company_info[1]
+        return company_info, company_info
+    
+    def _scrape_company_safe(self, symbol, name, journal=None):
+        """
+        Extrait les données d'une entreprise sans propager les erreurs
+        
+        Args:
+            symbol (str): Le symbole boursier de l'entreprise
+            name (str): Le nom complet de l'entreprise
+            journal (CheckpointJournal, optional): Journal de reprise
             
-            if source_data_list:
-                df = pd.DataFrame(source_data_list)
-                filename = f"{self.output_dir}/consolidated_{source}_esg_data.csv"
-                df.to_csv(filename, index=False)
-                logger.info(f"Données consolidées sauvegardées dans {filename}")
+        Returns:
+            dict: Données ESG de l'entreprise, ou {"error": ...} en cas d'échec
+        """
+        # Sources déjà extraites lors d'une exécution précédente
+        previous = journal.results(symbol) if journal is not None else {}
+        missing = [source for source in SOURCES if source not in previous]
+        if not missing:
+            logger.info(f"Entreprise déjà traitée, reprise depuis le journal: {name} ({symbol})")
+            return {source: previous[source] for source in SOURCES}
         
-        # Créer un fichier consolidé avec toutes les données
-        combined_data = []
+        logger.info(f"Traitement de l'entreprise: {name} ({symbol})")
         
-        for company, data in all_companies_data.items():
-            company_combined = {"company_symbol": company}
-            
-            for source in sources:
-                if source in data and "error" not in data[source]:
-                    # Ajouter un préfixe source_ à chaque clé pour éviter les conflits
-                    for key, value in data[source].items():
-                        if key not in ["company", "date_extracted", "source"]:
-                            company_combined[f"{source}_{key}"] = value
-            
-            combined_data.append(company_combined)
+        # Le débit est régulé par domaine (self.rate_limiter) au moment de chaque requête
+        try:
+            company_data = self.scrape_company_esg_data(symbol, name, sources=missing, journal=journal)
+            return {source: previous[source] if source in previous else company_data[source]
+                    for source in SOURCES}
+        except Exception as e:
+            logger.error(f"Erreur lors du traitement de {name}: {str(e)}")
+            return {**previous, "error": str(e)}
+    
+    def _save_data(self, data, company_symbol):
+        """
+        Sauvegarde les données ESG pour une entreprise
         
-        if combined_data:
-            df = pd.DataFrame(combined_data)
-            filename = f"{self.output_dir}/all_esg_data_combined.csv"
-            df.to_csv(filename, index=False)
-            logger.info(f"Toutes les données combinées sauvegardées dans {filename}")
+        Args:
+            data (dict): Les données à sauvegarder
+            company_symbol (str): Le symbole de l'entreprise
+        """
+        # Un enregistrement par source, écrit par lots par le moteur de stockage
+        for source, source_data in data.items():
+            self.storage.add(company_symbol, source, source_data)
 
 # Exemple d'utilisation
 if __name__ == "__main__":
@@ -463,14 +797,14 @@ if __name__ == "__main__":
         ("TSLA", "Tesla, Inc.")
     ]
     
-    # Initialiser le scraper
-    scraper = ESGScraper(output_dir="esg_data")
+    # Initialiser le scraper (sources interrogées en parallèle, un navigateur par cœur)
+    scraper = ESGScraper(concurrent=True, pool_size=os.cpu_count() or 1)
     
     try:
         # Scraper toutes les entreprises
-        all_data = scraper.scrape_multiple_companies(companies)
+        scraper.scrape_multiple_companies(companies)
         
-        print("Extraction terminée. Les données sont sauvegardées dans le dossier 'esg_data'.")
+        print(f"Extraction terminée. Les données sont sauvegardées dans le dossier '{scraper.output_dir}'.")
         
     finally:
         # Fermer le navigateur Selenium
@@ -2,19 +2,122 @@ import os
 import json
 import logging
 import random
+import threading
 from datetime import datetime, timedelta
+from .storage import DEFAULT_DATA_DIR
 
 # Configuration du logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Fichier JSON de chaque table, relu par reload()
+DATA_FILES = {
+    "emissions_data": "emissions_co2.json",
+    "parite_data": "parite.json",
+    "formation_data": "formation_rse.json",
+    "fournisseurs_data": "score_fournisseurs.json",
+    "empreinte_carbone": "empreinte_carbone.json",
+    "company_esg_data": "company_esg_data.json"
+}
+
+# Données simulées, utilisées lorsqu'aucun fichier JSON n'est disponible
+DEFAULT_TABLES = {
+    "emissions_data": {
+        "dernier trimestre": 12500,
+        "ce mois-ci": 4200,
+        "cette année": 48000,
+        "2023": 52000,
+        "q2": 13200,
+        "l'année dernière": 51000
+    },
+    "parite_data": {
+        "global": 0.42,  # 42% de femmes
+        "r&d": 0.38,
+        "marketing": 0.51,
+        "finance": 0.45,
+        "production": 0.32,
+        "service client": 0.58,
+        "équipe technique": 0.35
+    },
+    "formation_data": {
+        "ce mois-ci": 450,
+        "le premier trimestre": 1250,
+        "cette année": 3800,
+        "2023": 5200,
+        "le mois dernier": 420
+    },
+    "fournisseurs_data": {
+        "Supplier A": 42,
+        "Supplier B": 38,
+        "Supplier C": 45,
+        "Supplier D": 72,
+        "Supplier E": 68,
+        "Supplier F": 85
+    },
+    "empreinte_carbone": {
+        "france": 8200,
+        "allemagne": 10500,
+        "espagne": 7800,
+        "portugal": 6500,
+        "italie": 9200,
+        "suisse": 5800,
+        "belgique": 6200,
+        "pays-bas": 7100,
+        "royaume-uni": 9800
+    },
+    "company_esg_data": {
+        "AAPL": {
+            "msci": {
+                "esg_rating": "AA",
+                "environmental_score": 7.8,
+                "social_score": 6.5,
+                "governance_score": 8.2
+            },
+            "sustainalytics": {
+                "esg_risk_rating": 18.5,
+                "environmental_risk": 4.2,
+                "social_risk": 7.1,
+                "governance_risk": 7.2
+            }
+        },
+        "MSFT": {
+            "msci": {
+                "esg_rating": "AAA",
+                "environmental_score": 8.5,
+                "social_score": 7.2,
+                "governance_score": 8.7
+            },
+            "sustainalytics": {
+                "esg_risk_rating": 14.2,
+                "environmental_risk": 3.8,
+                "social_risk": 5.9,
+                "governance_risk": 4.5
+            }
+        },
+        "GOOGL": {
+            "msci": {
+                "esg_rating": "AA",
+                "environmental_score": 7.9,
+                "social_score": 6.8,
+                "governance_score": 7.5
+            },
+            "sustainalytics": {
+                "esg_risk_rating": 17.8,
+                "environmental_risk": 4.0,
+                "social_risk": 7.5,
+                "governance_risk": 6.3
+            }
+        }
+    }
+}
+
 class SimpleESGScraper:
     """
     Scraper ESG simplifié qui génère des données simulées
     sans dépendances externes comme Selenium
     """
     
-    def __init__(self, data_dir="esg_data"):
+    def __init__(self, data_dir=DEFAULT_DATA_DIR):
         """
         Initialise le scraper ESG simplifié
         
@@ -27,100 +130,132 @@ class SimpleESGScraper:
         if not os.path.exists(data_dir):
             os.makedirs(data_dir)
         
-        # Données simulées
-        self.emissions_data = {
-            "dernier trimestre": 12500,
-            "ce mois-ci": 4200,
-            "cette année": 48000,
-            "2023": 52000,
-            "q2": 13200,
-            "l'année dernière": 51000
-        }
+        # Tables de données, remplacées d'un bloc à chaque rechargement
+        self._tables = {}
+        self.data_version = 0
+        self._reload_lock = threading.Lock()
+        self.reload()
+    
+    @property
+    def emissions_data(self):
+        """Émissions CO2 par période"""
+        return self._tables["emissions_data"]
+    
+    @property
+    def parite_data(self):
+        """Part de femmes par département"""
+        return self._tables["parite_data"]
+    
+    @property
+    def formation_data(self):
+        """Heures de formation RSE par période"""
+        return self._tables["formation_data"]
+    
+    @property
+    def fournisseurs_data(self):
+        """Score ESG par fournisseur"""
+        return self._tables["fournisseurs_data"]
+    
+    @property
+    def empreinte_carbone(self):
+        """Empreinte carbone par pays"""
+        return self._tables["empreinte_carbone"]
+    
+    @property
+    def company_esg_data(self):
+        """Données ESG des entreprises par source"""
+        return self._tables["company_esg_data"]
+    
+    def reload(self, filenames=None):
+        """
+        Recharge les tables depuis les fichiers JSON du répertoire de données
         
-        self.parite_data = {
-            "global": 0.42,  # 42% de femmes
-            "r&d": 0.38,
-            "marketing": 0.51,
-            "finance": 0.45,
-            "production": 0.32,
-            "service client": 0.58,
-            "équipe technique": 0.35
-        }
+        Les nouvelles tables sont entièrement construites avant d'être
+        publiées en une seule affectation: un appel concurrent voit soit les
+        anciennes tables, soit les nouvelles, jamais un état intermédiaire.
+        Un fichier absent ou illisible conserve la table en cours (ou les
+        données par défaut au premier chargement).
         
-        self.formation_data = {
-            "ce mois-ci": 450,
-            "le premier trimestre": 1250,
-            "cette année": 3800,
-            "2023": 5200,
-            "le mois dernier": 420
-        }
+        Args:
+            filenames (iterable, optional): Noms des fichiers modifiés; par
+                défaut, tous les fichiers sont relus
+            
+        Returns:
+            set: Noms des tables rechargées
+        """
+        with self._reload_lock:
+            tables = dict(self._tables)
+            reloaded = set()
+            for table, filename in DATA_FILES.items():
+                if filenames is not None and filename not in filenames and table in tables:
+                    continue
+                data = self._load_table(filename)
+                if data is not None:
+                    tables[table] = data
+                    reloaded.add(table)
+                elif table not in tables:
+                    tables[table] = DEFAULT_TABLES[table]
+            
+            if reloaded or not self._tables:
+                self._tables = tables
+                self.data_version += 1
         
-        self.fournisseurs_data = {
-            "Supplier A": 42,
-            "Supplier B": 38,
-            "Supplier C": 45,
-            "Supplier D": 72,
-            "Supplier E": 68,
-            "Supplier F": 85
-        }
+        if reloaded:
+            logger.info(f"Tables rechargées (version {self.data_version}): {', '.join(sorted(reloaded))}")
+        return reloaded
+    
+    @property
+    def tables(self):
+        """Toutes les tables ({nom: données}), telles que publiées par le dernier chargement"""
+        return self._tables
+    
+    def replace_tables(self, tables):
+        """
+        Publie des tables modifiées reçues d'une autre source (magasin partagé entre processus)
         
-        self.empreinte_carbone = {
-            "france": 8200,
-            "allemagne": 10500,
-            "espagne": 7800,
-            "portugal": 6500,
-            "italie": 9200,
-            "suisse": 5800,
-            "belgique": 6200,
-            "pays-bas": 7100,
-            "royaume-uni": 9800
-        }
+        Comme reload(), les tables sont remplacées en une seule affectation
+        et la version est incrémentée. Une table peut être une vue en lecture
+        seule (Mapping) plutôt qu'un dict: elle n'est alors jamais copiée.
         
-        # Données ESG des entreprises
-        self.company_esg_data = {
-            "AAPL": {
-                "msci": {
-                    "esg_rating": "AA",
-                    "environmental_score": 7.8,
-                    "social_score": 6.5,
-                    "governance_score": 8.2
-                },
-                "sustainalytics": {
-                    "esg_risk_rating": 18.5,
-                    "environmental_risk": 4.2,
-                    "social_risk": 7.1,
-                    "governance_risk": 7.2
-                }
-            },
-            "MSFT": {
-                "msci": {
-                    "esg_rating": "AAA",
-                    "environmental_score": 8.5,
-                    "social_score": 7.2,
-                    "governance_score": 8.7
-                },
-                "sustainalytics": {
-                    "esg_risk_rating": 14.2,
-                    "environmental_risk": 3.8,
-                    "social_risk": 5.9,
-                    "governance_risk": 4.5
-                }
-            },
-            "GOOGL": {
-                "msci": {
-                    "esg_rating": "AA",
-                    "environmental_score": 7.9,
-                    "social_score": 6.8,
-                    "governance_score": 7.5
-                },
-                "sustainalytics": {
-                    "esg_risk_rating": 17.8,
-                    "environmental_risk": 4.0,
-                    "social_risk": 7.5,
-                    "governance_risk": 6.3
-                }
-            }
-        }
+        Args:
+            tables (dict): {nom de la table: données}; les noms inconnus sont ignorés
+            
+        Returns:
+            set: Noms des tables remplacées
+        """
+        with self._reload_lock:
+            changed = {table for table in tables if table in DATA_FILES}
+            if changed:
+                self._tables = {**self._tables, **{table: tables[table] for table in changed}}
+                self.data_version += 1
+        
+        if changed:
+            logger.info(f"Tables synchronisées (version {self.data_version}): {', '.join(sorted(changed))}")
+        return changed
+    
+    def _load_table(self, filename):
+        """
+        Lit une table depuis un fichier JSON
+        
+        Args:
+            filename (str): Nom du fichier dans le répertoire de données
+            
+        Returns:
+            dict: Contenu du fichier, ou None s'il est absent ou invalide
+        """
+        path = os.path.join(self.data_dir, filename)
+        if not os.path.exists(path):
+            return None
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            logger.error(f"Erreur lors du chargement de {path}: {e}")
+            return None
+        if not isinstance(data, dict):
+            logger.error(f"Format invalide pour {path}: un objet JSON est attendu")
+            return None
+        return data
     
     def get_emissions_data(self, periode=None):
         """
@@ -134,11 +269,12 @@ class SimpleESGScraper:
         """
         logger.info(f"Récupération des données d'émissions CO2 pour la période: {periode}")
         
-        if periode and periode.lower() in self.emissions_data:
-            return self.emissions_data[periode.lower()]
+        emissions_data = self.emissions_data
+        if periode and periode.lower() in emissions_data:
+            return emissions_data[periode.lower()]
         
         # Valeur par défaut
-        return self.emissions_data["dernier trimestre"]
+        return emissions_data.get("dernier trimestre", DEFAULT_TABLES["emissions_data"]["dernier trimestre"])
     
     def get_parite_data(self, departement=None):
         """
@@ -152,11 +288,12 @@ class SimpleESGScraper:
         """
         logger.info(f"Récupération des données de parité pour le département: {departement}")
         
-        if departement and departement.lower() in self.parite_data:
-            return {departement.lower(): self.parite_data[departement.lower()]}
+        parite_data = self.parite_data
+        if departement and departement.lower() in parite_data:
+            return {departement.lower(): parite_data[departement.lower()]}
         
         # Retourner toutes les données
-        return self.parite_data
+        return dict(parite_data.items())
     
     def get_formation_data(self, periode=None):
         """
@@ -170,11 +307,12 @@ class SimpleESGScraper:
         """
         logger.info(f"Récupération des données de formation pour la période: {periode}")
         
-        if periode and periode.lower() in self.formation_data:
-            return self.formation_data[periode.lower()]
+        formation_data = self.formation_data
+        if periode and periode.lower() in formation_data:
+            return formation_data[periode.lower()]
         
         # Valeur par défaut
-        return self.formation_data["ce mois-ci"]
+        return formation_data.get("ce mois-ci", DEFAULT_TABLES["formation_data"]["ce mois-ci"])
     
     def get_fournisseurs_data(self, seuil=50):
         """
@@ -203,11 +341,12 @@ class SimpleESGScraper:
         """
         logger.info(f"Comparaison de l'empreinte carbone entre {pays1} et {pays2}")
         
+        empreinte_carbone = self.empreinte_carbone
         result = {}
-        if pays1 and pays1.lower() in self.empreinte_carbone:
-            result[pays1.lower()] = self.empreinte_carbone[pays1.lower()]
-        if pays2 and pays2.lower() in self.empreinte_carbone:
-            result[pays2.lower()] = self.empreinte_carbone[pays2.lower()]
+        if pays1 and pays1.lower() in empreinte_carbone:
+            result[pays1.lower()] = empreinte_carbone[pays1.lower()]
+        if pays2 and pays2.lower() in empreinte_carbone:
+            result[pays2.lower()] = empreinte_carbone[pays2.lower()]
         
         return result
     
@@ -224,8 +363,9 @@ class SimpleESGScraper:
         logger.info(f"Récupération des données ESG pour {company_symbol}")
         
         # Si l'entreprise existe dans notre base de données
-        if company_symbol in self.company_esg_data:
-            return self.company_esg_data[company_symbol]
+        company_data = self.company_esg_data.get(company_symbol)
+        if company_data is not None:
+            return company_data
         
         # Sinon, générer des données aléatoires
         return {
@@ -246,34 +386,25 @@ class SimpleESGScraper:
     def save_data(self):
         """
         Sauvegarde toutes les données dans des fichiers JSON
+        
+        Chaque fichier est écrit de façon atomique, pour qu'un processus qui
+        surveille le répertoire ne lise jamais un fichier à moitié écrit.
         """
         logger.info("Sauvegarde des données ESG")
         
-        # Sauvegarder les données d'émissions
-        with open(os.path.join(self.data_dir, "emissions_co2.json"), "w", encoding="utf-8") as f:
-            json.dump(self.emissions_data, f, ensure_ascii=False, indent=2)
-        
-        # Sauvegarder les données de parité
-        with open(os.path.join(self.data_dir, "parite.json"), "w", encoding="utf-8") as f:
-            json.dump(self.parite_data, f, ensure_ascii=False, indent=2)
-        
-        # Sauvegarder les données de formation
-        with open(os.path.join(self.data_dir, "formation_rse.json"), "w", encoding="utf-8") as f:
-            json.dump(self.formation_data, f, ensure_ascii=False, indent=2)
-        
-        # Sauvegarder les données des fournisseurs
-        with open(os.path.join(self.data_dir, "score_fournisseurs.json"), "w", encoding="utf-8") as f:
-            json.dump(self.fournisseurs_data, f, ensure_ascii=False, indent=2)
-        
-        # Sauvegarder les données d'empreinte carbone
-        with open(os.path.join(self.data_dir, "empreinte_carbone.json"), "w", encoding="utf-8") as f:
-            json.dump(self.empreinte_carbone, f, ensure_ascii=False, indent=2)
-        
-        # Sauvegarder les données ESG des entreprises
-        with open(os.path.join(self.data_dir, "company_esg_data.json"), "w", encoding="utf-8") as f:
-            json.dump(self.company_esg_data, f, ensure_ascii=False, indent=2)
+        tables = self._tables
+        for table, filename in DATA_FILES.items():
+            self._write_json(os.path.join(self.data_dir, filename), dict(tables[table].items()))
         
         logger.info("Toutes les données ont été sauvegardées avec succès")
+    
+    @staticmethod
+    def _write_json(path, data):
+        """Écriture atomique d'un fichier JSON (fichier temporaire puis renommage)"""
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, path)
 
 # Exemple d'utilisation
 if __name__ == "__main__":
@@ -0,0 +1,154 @@
+import importlib.util
+import logging
+import re
+
+import soupsieve as sv
+from bs4 import BeautifulSoup, SoupStrainer
+
+# lxml est optionnel: repli sur l'analyseur de la bibliothèque standard
+# (détecté sans l'importer, BeautifulSoup le charge lui-même au besoin)
+DEFAULT_PARSER = "lxml" if importlib.util.find_spec("lxml") is not None else "html.parser"
+
+# Configuration du logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Sélecteur réduit à une classe (".esg-rating"), seul cas traduisible en SoupStrainer
+CLASS_SELECTOR = re.compile(r"^\.(-?[_a-zA-Z][_a-zA-Z0-9-]*)$")
+
+class FieldSpec:
+    """Description d'un champ à extraire: sélecteur CSS, type et valeur par défaut"""
+    
+    def __init__(self, name, selector, type=str, default="N/A"):
+        """
+        Initialise la description du champ
+        
+        Args:
+            name (str): Nom du champ dans l'enregistrement produit
+            selector (str): Sélecteur CSS du nœud contenant la valeur
+            type (callable): Conversion appliquée au texte du nœud
+            default: Valeur utilisée si le nœud est absent ou la conversion échoue
+        """
+        self.name = name
+        self.selector = selector
+        self.type = type
+        self.default = default
+    
+    def convert(self, text):
+        """Convertit le texte d'un nœud selon le type du champ"""
+        try:
+            return self.type(text)
+        except (TypeError, ValueError):
+            logger.warning(f"Valeur invalide pour {self.name}: {text!r}")
+            return self.default
+
+class ExtractionSpec:
+    """
+    Spécification d'extraction d'une source
+    
+    Les sélecteurs sont compilés une seule fois, individuellement et sous forme
+    d'une liste de sélecteurs unique. L'extraction parcourt le document une
+    seule fois avec cette liste, dans l'ordre du document, et retient pour
+    chaque champ le premier nœud correspondant (comme select_one). Seuls les
+    nœuds retenus sont confrontés aux sélecteurs individuels.
+    """
+    
+    def __init__(self, fields):
+        """
+        Initialise et compile la spécification
+        
+        Args:
+            fields (list): Liste de FieldSpec
+        """
+        self.fields = list(fields)
+        self._compiled = [(field, sv.compile(field.selector)) for field in self.fields]
+        self._combined = sv.compile(", ".join(field.selector for field in self.fields))
+        self._strainer = self._build_strainer()
+    
+    def _build_strainer(self):
+        """
+        Construit le filtre d'analyse partielle à partir des sélecteurs
+        
+        Returns:
+            SoupStrainer: Filtre ne conservant que les sous-arbres ciblés, ou None
+                si un sélecteur n'est pas une simple classe
+        """
+        classes = []
+        for field in self.fields:
+            match = CLASS_SELECTOR.match(field.selector.strip())
+            if not match:
+                return None
+            classes.append(match.group(1))
+        # Expression régulière plutôt que liste: fonctionne aussi sur les
+        # attributs class contenant plusieurs classes ("esg-rating highlight")
+        pattern = "|".join(re.escape(name) for name in classes)
+        return SoupStrainer(class_=re.compile(rf"(^|\s)({pattern})(\s|$)"))
+    
+    @property
+    def field_names(self):
+        """Noms des champs, dans l'ordre de la spécification"""
+        return [field.name for field in self.fields]
+    
+    @property
+    def selectors(self):
+        """Sélecteurs CSS de tous les champs"""
+        return [field.selector for field in self.fields]
+    
+    def parse(self, markup, partial=True):
+        """
+        Analyse une page en ne construisant que les sous-arbres utiles
+        
+        Avec partial=True, seuls les nœuds portant l'une des classes ciblées
+        (et leurs descendants) sont construits. Si ce filtre ne trouve rien,
+        la page est analysée en entier.
+        
+        Args:
+            markup (str): Le code HTML de la page
+            partial (bool): Si False, analyse toujours la page en entier
+            
+        Returns:
+            BeautifulSoup: Le document analysé
+        """
+        if partial and self._strainer is not None:
+            soup = BeautifulSoup(markup, DEFAULT_PARSER, parse_only=self._strainer)
+            if soup.find(True) is not None:
+                return soup
+            logger.debug("Analyse partielle sans résultat, analyse complète de la page")
+        return BeautifulSoup(markup, DEFAULT_PARSER)
+    
+    def parse_and_extract(self, markup, partial=True):
+        """
+        Analyse une page puis en extrait tous les champs
+        
+        Args:
+            markup (str): Le code HTML de la page
+            partial (bool): Si False, analyse toujours la page en entier
+            
+        Returns:
+            dict: {champ: valeur}, dans l'ordre de la spécification
+        """
+        return self.extract(self.parse(markup, partial))
+    
+    def extract(self, soup):
+        """
+        Extrait tous les champs d'un document en un seul parcours
+        
+        Args:
+            soup (BeautifulSoup): Le document analysé
+            
+        Returns:
+            dict: {champ: valeur}, dans l'ordre de la spécification
+        """
+        pending = list(self._compiled)
+        found = {}
+        
+        for element in self._combined.iselect(soup):
+            for item in list(pending):
+                field, pattern = item
+                if pattern.match(element):
+                    found[field.name] = field.convert(element.text.strip())
+                    pending.remove(item)
+            if not pending:
+                break
+        
+        return {field.name: found.get(field.name, field.default) for field in self.fields}
@@ -0,0 +1,141 @@
+import os
+import logging
+import threading
+
+try:
+    from inotify_simple import INotify, flags
+except ImportError:  # inotify_simple est optionnel: sans lui, les fichiers sont surveillés par scrutation
+    INotify = None
+    flags = None
+
+# Configuration du logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+class FileWatcher:
+    """
+    Surveille des fichiers d'un répertoire et signale leurs modifications
+    
+    Utilise inotify lorsqu'il est disponible (Linux, paquet inotify_simple),
+    sinon compare périodiquement la date de modification et la taille des
+    fichiers. Le répertoire est surveillé plutôt que les fichiers eux-mêmes,
+    afin de suivre les écritures atomiques (fichier temporaire puis renommage).
+    """
+    
+    def __init__(self, directory, filenames, callback, interval=1.0, debounce=0.5):
+        """
+        Initialise la surveillance
+        
+        Args:
+            directory (str): Répertoire contenant les fichiers
+            filenames (iterable): Noms des fichiers à surveiller
+            callback (callable): Fonction appelée avec l'ensemble des noms
+                de fichiers modifiés
+            interval (float): Période de scrutation en secondes (sans inotify)
+            debounce (float): Délai d'attente après une modification, pour
+                regrouper les écritures successives en un seul rechargement
+        """
+        self.directory = directory
+        self.filenames = frozenset(filenames)
+        self.callback = callback
+        self.interval = interval
+        self.debounce = debounce
+        self._stop = threading.Event()
+        self._thread = None
+        self._inotify = None
+        self._mtimes = {}
+    
+    @property
+    def mode(self):
+        """Mécanisme de surveillance utilisé ("inotify" ou "polling")"""
+        return "inotify" if self._inotify is not None else "polling"
+    
+    def start(self):
+        """Démarre la surveillance sur un thread dédié"""
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._mtimes = self._snapshot()
+        if INotify is not None:
+            try:
+                self._inotify = INotify()
+                self._inotify.add_watch(
+                    self.directory,
+                    flags.CLOSE_WRITE | flags.MOVED_TO | flags.CREATE | flags.DELETE
+                )
+            except OSError as e:
+                logger.warning(f"inotify indisponible, surveillance par scrutation: {e}")
+                self._close_inotify()
+        
+        self._thread = threading.Thread(target=self._run, name="esg-file-watcher", daemon=True)
+        self._thread.start()
+        logger.info(f"Surveillance de {self.directory} ({self.mode})")
+    
+    def stop(self):
+        """Arrête la surveillance"""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        self._close_inotify()
+    
+    def _close_inotify(self):
+        """Ferme le descripteur inotify"""
+        if self._inotify is not None:
+            self._inotify.close()
+            self._inotify = None
+    
+    def _run(self):
+        """Boucle de surveillance"""
+        while not self._stop.is_set():
+            changed = self._wait_for_changes()
+            if not changed or self._stop.is_set():
+                continue
+            
+            # Regrouper les écritures rapprochées avant de notifier
+            if self._stop.wait(self.debounce):
+                break
+            changed |= self._wait_for_changes(timeout=0)
+            
+            try:
+                self.callback(changed)
+            except Exception as e:
+                logger.error(f"Erreur lors du traitement des modifications de {sorted(changed)}: {e}")
+    
+    def _wait_for_changes(self, timeout=None):
+        """
+        Attend les modifications des fichiers surveillés
+        
+        Args:
+            timeout (float, optional): Durée maximale d'attente (interval par défaut)
+        
+        Returns:
+            set: Noms des fichiers modifiés (vide si aucun)
+        """
+        timeout = self.interval if timeout is None else timeout
+        if self._inotify is not None:
+            events = self._inotify.read(timeout=int(timeout * 1000))
+            return {event.name for event in events if event.name in self.filenames}
+        
+        if timeout and self._stop.wait(timeout):
+            return set()
+        current = self._snapshot()
+        changed = {name for name in self.filenames if current.get(name) != self._mtimes.get(name)}
+        self._mtimes = current
+        return changed
+    
+    def _snapshot(self):
+        """
+        Relève la date de modification et la taille des fichiers surveillés
+        
+        Returns:
+            dict: {nom du fichier: (mtime_ns, taille)} pour les fichiers existants
+        """
+        snapshot = {}
+        for name in self.filenames:
+            try:
+                stat = os.stat(os.path.join(self.directory, name))
+            except OSError:
+                continue
+            snapshot[name] = (stat.st_mtime_ns, stat.st_size)
+        return snapshot
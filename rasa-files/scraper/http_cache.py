@@ -0,0 +1,219 @@
+import hashlib
+import json
+import logging
+import os
+import threading
+
+import requests
+from requests.adapters import HTTPAdapter
+
+# Configuration du logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+class HTTPCache:
+    """
+    Cache HTTP sur disque indexé par URL
+    
+    Chaque entrée est composée d'un fichier de métadonnées JSON (ETag,
+    Last-Modified et données déjà extraites de la page) et d'un fichier
+    contenant le corps de la réponse. Le corps n'est relu que si la page
+    doit être analysée à nouveau.
+    """
+    
+    def __init__(self, cache_dir):
+        """
+        Initialise le cache
+        
+        Args:
+            cache_dir (str): Répertoire où stocker les réponses
+        """
+        self.cache_dir = cache_dir
+        self._lock = threading.Lock()
+        
+        # Créer le répertoire du cache s'il n'existe pas
+        os.makedirs(cache_dir, exist_ok=True)
+    
+    def _paths(self, url):
+        """Chemins des fichiers de métadonnées et de corps pour une URL"""
+        key = hashlib.sha256(url.encode("utf-8")).hexdigest()
+        base = os.path.join(self.cache_dir, key)
+        return f"{base}.json", f"{base}.body"
+    
+    def get(self, url):
+        """
+        Récupère les métadonnées mises en cache pour une URL
+        
+        Args:
+            url (str): L'URL demandée
+            
+        Returns:
+            dict: Métadonnées de l'entrée, ou None si l'URL n'est pas en cache
+        """
+        meta_path, body_path = self._paths(url)
+        if not os.path.exists(meta_path) or not os.path.exists(body_path):
+            return None
+        try:
+            with open(meta_path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except Exception as e:
+            logger.warning(f"Entrée de cache illisible pour {url}: {str(e)}")
+            return None
+    
+    def read_body(self, url):
+        """
+        Lit le corps mis en cache pour une URL
+        
+        Args:
+            url (str): L'URL demandée
+            
+        Returns:
+            str: Le corps de la réponse
+        """
+        _, body_path = self._paths(url)
+        with open(body_path, "r", encoding="utf-8") as f:
+            return f.read()
+    
+    def put(self, url, body, etag=None, last_modified=None):
+        """
+        Enregistre une réponse complète (200)
+        
+        Args:
+            url (str): L'URL demandée
+            body (str): Le corps de la réponse
+            etag (str, optional): En-tête ETag de la réponse
+            last_modified (str, optional): En-tête Last-Modified de la réponse
+        """
+        meta_path, body_path = self._paths(url)
+        meta = {"url": url, "etag": etag, "last_modified": last_modified, "parsed": None}
+        with self._lock:
+            self._write(body_path, body)
+            self._write(meta_path, json.dumps(meta, ensure_ascii=False))
+    
+    def store_parsed(self, url, parsed):
+        """
+        Associe à une entrée les données extraites de la page
+        
+        Args:
+            url (str): L'URL demandée
+            parsed (dict): Les données extraites
+        """
+        meta_path, _ = self._paths(url)
+        # Lecture et réécriture sous le verrou de put(): sinon une réponse
+        # enregistrée entre les deux serait écrasée par les anciennes métadonnées
+        with self._lock:
+            meta = self.get(url)
+            if meta is None:
+                return
+            meta["parsed"] = parsed
+            self._write(meta_path, json.dumps(meta, ensure_ascii=False))
+    
+    @staticmethod
+    def _write(path, content):
+        """Écriture atomique d'un fichier (fichier temporaire puis renommage)"""
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(content)
+        os.replace(tmp_path, path)
+
+class CachedResponse:
+    """Réponse renvoyée par CachedHTTPClient"""
+    
+    def __init__(self, client, url, status_code, not_modified, parsed=None, text=None):
+        self._client = client
+        self.url = url
+        self.status_code = status_code
+        self.not_modified = not_modified
+        self.parsed = parsed
+        self._text = text
+    
+    @property
+    def text(self):
+        """Corps de la réponse (relu depuis le cache après un 304)"""
+        if self._text is None:
+            self._text = self._client.cache.read_body(self.url)
+        return self._text
+
+class CachedHTTPClient:
+    """
+    Client HTTP avec session persistante et requêtes conditionnelles
+    
+    Une seule requests.Session est partagée (connexions keep-alive réutilisées).
+    Les pages déjà en cache sont revalidées avec If-None-Match /
+    If-Modified-Since: sur une réponse 304, ni le corps ni l'analyse HTML
+    ne sont refaits.
+    """
+    
+    def __init__(self, cache_dir, headers=None, timeout=15, pool_maxsize=10, rate_limiter=None):
+        """
+        Initialise le client
+        
+        Args:
+            cache_dir (str): Répertoire du cache HTTP
+            headers (dict, optional): En-têtes envoyés avec chaque requête
+            timeout (float): Délai maximal d'une requête en secondes
+            pool_maxsize (int): Nombre de connexions conservées par hôte
+            rate_limiter (HostRateLimiter, optional): Limiteur de débit par domaine
+        """
+        self.cache = HTTPCache(cache_dir)
+        self.timeout = timeout
+        self.rate_limiter = rate_limiter
+        
+        self.session = requests.Session()
+        if headers:
+            self.session.headers.update(headers)
+        adapter = HTTPAdapter(pool_connections=pool_maxsize, pool_maxsize=pool_maxsize)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+    
+    def get(self, url, timeout=None):
+        """
+        Récupère une page, en revalidant la version en cache si elle existe
+        
+        Args:
+            url (str): L'URL demandée
+            timeout (float, optional): Délai maximal de la requête en secondes
+                (par défaut: celui du client)
+            
+        Returns:
+            CachedResponse: La réponse (not_modified=True si le serveur a répondu 304)
+        """
+        entry = self.cache.get(url)
+        conditional_headers = {}
+        if entry:
+            if entry.get("etag"):
+                conditional_headers["If-None-Match"] = entry["etag"]
+            if entry.get("last_modified"):
+                conditional_headers["If-Modified-Since"] = entry["last_modified"]
+        
+        if self.rate_limiter:
+            self.rate_limiter.acquire(url)
+        response = self.session.get(url, headers=conditional_headers, timeout=self.timeout if timeout is None else timeout)
+        if self.rate_limiter:
+            self.rate_limiter.report(url, response.status_code, response.headers.get("Retry-After"))
+        
+        if response.status_code == 304 and entry:
+            logger.info(f"Page inchangée (304), cache utilisé pour {url}")
+            return CachedResponse(self, url, 304, True, parsed=entry.get("parsed"))
+        
+        response.raise_for_status()
+        
+        etag = response.headers.get("ETag")
+        last_modified = response.headers.get("Last-Modified")
+        if etag or last_modified:
+            self.cache.put(url, response.text, etag, last_modified)
+        return CachedResponse(self, url, response.status_code, False, text=response.text)
+    
+    def store_parsed(self, url, parsed):
+        """
+        Mémorise les données extraites d'une page pour les prochains 304
+        
+        Args:
+            url (str): L'URL de la page
+            parsed (dict): Les données extraites
+        """
+        self.cache.store_parsed(url, parsed)
+    
+    def close(self):
+        """Ferme la session HTTP"""
+        self.session.close()
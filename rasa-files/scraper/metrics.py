@@ -0,0 +1,360 @@
+import time
+import bisect
+import logging
+import threading
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Configuration du logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Bornes par défaut des histogrammes de latence, en secondes
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+
+def _format_labels(label_names, label_values, extra=None):
+    """Formate les étiquettes d'un échantillon au format texte de Prometheus"""
+    pairs = list(zip(label_names, label_values))
+    if extra:
+        pairs.append(extra)
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in pairs) + "}"
+
+def _escape(value):
+    """Échappe la valeur d'une étiquette (barres obliques inverses, guillemets, retours à la ligne)"""
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+def _format_value(value):
+    """Formate une valeur numérique (entiers sans décimales, +Inf)"""
+    if value == float("inf"):
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+class _Metric:
+    """Base des métriques: nom, description et étiquettes"""
+    
+    type_name = "untyped"
+    
+    def __init__(self, name, documentation, labels=()):
+        self.name = name
+        self.documentation = documentation
+        self.label_names = tuple(labels)
+        self._lock = threading.Lock()
+    
+    def _key(self, labels):
+        """Valeurs des étiquettes, dans l'ordre de label_names"""
+        if len(labels) == len(self.label_names):
+            try:
+                return tuple([str(labels[name]) for name in self.label_names])
+            except KeyError:
+                pass
+        raise ValueError(f"Étiquettes attendues pour {self.name}: {self.label_names}, reçues: {tuple(labels)}")
+    
+    def samples(self):
+        """Échantillons: liste de (suffixe, valeurs des étiquettes, étiquette supplémentaire, valeur)"""
+        raise NotImplementedError
+    
+    def snapshot(self):
+        """Valeurs courantes, sous forme de dictionnaire"""
+        raise NotImplementedError
+
+class Counter(_Metric):
+    """Compteur croissant"""
+    
+    type_name = "counter"
+    
+    def __init__(self, name, documentation, labels=()):
+        super().__init__(name, documentation, labels)
+        self._values = {}
+    
+    def inc(self, amount=1, **labels):
+        """Incrémente le compteur"""
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+    
+    def value(self, **labels):
+        """Valeur courante du compteur"""
+        with self._lock:
+            return self._values.get(self._key(labels), 0)
+    
+    def samples(self):
+        with self._lock:
+            return [("", key, None, value) for key, value in self._values.items()]
+    
+    def snapshot(self):
+        with self._lock:
+            return {key: value for key, value in self._values.items()}
+
+class Gauge(_Metric):
+    """
+    Jauge: valeur instantanée, fixée par set() ou lue à la demande
+    
+    Avec une fonction, la jauge est évaluée à chaque collecte; la fonction
+    renvoie une valeur, ou un dictionnaire {valeurs des étiquettes: valeur}.
+    """
+    
+    type_name = "gauge"
+    
+    def __init__(self, name, documentation, labels=(), function=None):
+        super().__init__(name, documentation, labels)
+        self._values = {}
+        self.function = function
+    
+    def set(self, value, **labels):
+        """Fixe la valeur de la jauge"""
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+    
+    def inc(self, amount=1, **labels):
+        """Incrémente la jauge"""
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+    
+    def dec(self, amount=1, **labels):
+        """Décrémente la jauge"""
+        self.inc(-amount, **labels)
+    
+    def set_function(self, function):
+        """Remplace les valeurs de la jauge par une fonction évaluée à chaque collecte"""
+        self.function = function
+    
+    def _current(self):
+        """Valeurs courantes {valeurs des étiquettes: valeur}"""
+        if self.function is not None:
+            try:
+                values = self.function()
+            except Exception as e:
+                logger.warning(f"Impossible d'évaluer la métrique {self.name}: {e}")
+                return {}
+            if not isinstance(values, dict):
+                return {(): values}
+            return {key if isinstance(key, tuple) else (key,): value for key, value in values.items()}
+        with self._lock:
+            return dict(self._values)
+    
+    def samples(self):
+        return [("", key, None, value) for key, value in self._current().items()]
+    
+    def snapshot(self):
+        return self._current()
+
+class CounterFunction(Gauge):
+    """Compteur dont la valeur est lue à la demande (compteurs tenus par un autre objet)"""
+    
+    type_name = "counter"
+
+class Histogram(_Metric):
+    """Histogramme cumulatif (compatible Prometheus) de durées ou de tailles"""
+    
+    type_name = "histogram"
+    
+    def __init__(self, name, documentation, labels=(), buckets=DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labels)
+        self.buckets = tuple(sorted(buckets))
+        self._values = {}  # étiquettes -> [comptes par borne..., au-delà, compte total, somme]
+    
+    def observe(self, value, **labels):
+        """Enregistre une observation"""
+        key = self._key(labels) if labels or self.label_names else ()
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            counts = self._values.get(key)
+            if counts is None:
+                counts = self._values[key] = [0] * (len(self.buckets) + 3)
+            counts[index] += 1
+            counts[-2] += 1
+            counts[-1] += value
+    
+    @contextmanager
+    def time(self, **labels):
+        """Mesure la durée du bloc (en secondes)"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+    
+    def samples(self):
+        samples = []
+        with self._lock:
+            items = [(key, list(counts)) for key, counts in self._values.items()]
+        for key, counts in items:
+            cumulative = 0
+            for bound, count in zip(self.buckets, counts):
+                cumulative += count
+                samples.append(("_bucket", key, ("le", _format_value(bound)), cumulative))
+            samples.append(("_bucket", key, ("le", "+Inf"), counts[-2]))
+            samples.append(("_count", key, None, counts[-2]))
+            samples.append(("_sum", key, None, counts[-1]))
+        return samples
+    
+    def snapshot(self):
+        with self._lock:
+            return {
+                key: {"count": counts[-2], "sum": counts[-1],
+                      "buckets": dict(zip(self.buckets, counts[:len(self.buckets)]))}
+                for key, counts in self._values.items()
+            }
+
+class MetricsRegistry:
+    """
+    Registre des métriques du processus
+    
+    Les métriques sont créées (ou retrouvées si elles existent déjà) par
+    counter(), gauge(), counter_function() et histogram(). Elles sont
+    exposées au format texte de Prometheus par render() et sous forme de
+    dictionnaire par snapshot().
+    """
+    
+    def __init__(self):
+        self._metrics = {}
+        self._lock = threading.Lock()
+    
+    def _get_or_create(self, cls, name, *args, **kwargs):
+        """Renvoie la métrique nommée, en la créant si nécessaire"""
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = self._metrics[name] = cls(name, *args, **kwargs)
+            elif type(metric) is not cls:
+                raise ValueError(f"La métrique {name} existe déjà avec le type {metric.type_name}")
+            return metric
+    
+    def counter(self, name, documentation, labels=()):
+        """Compteur croissant"""
+        return self._get_or_create(Counter, name, documentation, labels)
+    
+    def gauge(self, name, documentation, labels=(), function=None):
+        """Jauge; si function est fournie, elle remplace la fonction existante"""
+        gauge = self._get_or_create(Gauge, name, documentation, labels)
+        if function is not None:
+            gauge.set_function(function)
+        return gauge
+    
+    def counter_function(self, name, documentation, function, labels=()):
+        """Compteur lu à la demande; function remplace la fonction existante"""
+        counter = self._get_or_create(CounterFunction, name, documentation, labels)
+        counter.set_function(function)
+        return counter
+    
+    def histogram(self, name, documentation, labels=(), buckets=DEFAULT_BUCKETS):
+        """Histogramme"""
+        return self._get_or_create(Histogram, name, documentation, labels, buckets)
+    
+    def unregister(self, name):
+        """Retire une métrique du registre"""
+        with self._lock:
+            self._metrics.pop(name, None)
+    
+    def snapshot(self):
+        """
+        Valeurs courantes de toutes les métriques
+        
+        Returns:
+            dict: {nom: [{"labels": {étiquette: valeur}, "value": valeur}]}; la
+                valeur d'un histogramme est {"count", "sum", "buckets"}
+        """
+        with self._lock:
+            metrics = list(self._metrics.values())
+        snapshot = {}
+        for metric in metrics:
+            snapshot[metric.name] = [
+                {"labels": dict(zip(metric.label_names, key)), "value": value}
+                for key, value in metric.snapshot().items()
+            ]
+        return snapshot
+    
+    def render(self):
+        """
+        Métriques au format texte d'exposition de Prometheus
+        
+        Returns:
+            str: Le contenu de l'endpoint /metrics
+        """
+        with self._lock:
+            metrics = sorted(self._metrics.values(), key=lambda metric: metric.name)
+        lines = []
+        for metric in metrics:
+            lines.append(f"# HELP {metric.name} {metric.documentation}")
+            lines.append(f"# TYPE {metric.name} {metric.type_name}")
+            for suffix, key, extra, value in metric.samples():
+                lines.append(f"{metric.name}{suffix}{_format_labels(metric.label_names, key, extra)} {_format_value(value)}")
+        return "\n".join(lines) + "\n"
+
+# Registre partagé par les actions, l'adaptateur et les scrapers
+REGISTRY = MetricsRegistry()
+
+class MetricsServer:
+    """Serveur HTTP exposant un registre sur /metrics (format texte de Prometheus)"""
+    
+    def __init__(self, port=9105, host="127.0.0.1", registry=REGISTRY):
+        """
+        Initialise le serveur
+        
+        Args:
+            port (int): Port d'écoute (0: port libre choisi par le système)
+            host (str): Adresse d'écoute (locale par défaut)
+            registry (MetricsRegistry): Registre exposé
+        """
+        self.registry = registry
+        
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(handler):
+                if handler.path.split("?", 1)[0] not in ("/metrics", "/"):
+                    handler.send_error(404)
+                    return
+                body = registry.render().encode("utf-8")
+                handler.send_response(200)
+                handler.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+                handler.send_header("Content-Length", str(len(body)))
+                handler.end_headers()
+                handler.wfile.write(body)
+            
+            def log_message(handler, format, *args):
+                pass
+        
+        self.server = ThreadingHTTPServer((host, port), Handler)
+        self.server.daemon_threads = True
+        self._thread = None
+    
+    @property
+    def port(self):
+        """Port d'écoute effectif"""
+        return self.server.server_address[1]
+    
+    def start(self):
+        """Démarre le serveur sur un thread dédié"""
+        if self._thread is None:
+            self._thread = threading.Thread(target=self.server.serve_forever, name="esg-metrics", daemon=True)
+            self._thread.start()
+            logger.info(f"Métriques exposées sur le port {self.port} (/metrics)")
+    
+    def stop(self):
+        """Arrête le serveur"""
+        if self._thread is not None:
+            self.server.shutdown()
+            self._thread.join()
+            self._thread = None
+        self.server.server_close()
+
+def start_metrics_server(port=9105, host="127.0.0.1", registry=REGISTRY):
+    """
+    Démarre un serveur /metrics en arrière-plan
+    
+    Args:
+        port (int): Port d'écoute
+        host (str): Adresse d'écoute (locale par défaut)
+        registry (MetricsRegistry): Registre exposé
+    
+    Returns:
+        MetricsServer: Le serveur démarré
+    """
+    server = MetricsServer(port, host, registry)
+    server.start()
+    return server
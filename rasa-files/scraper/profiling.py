@@ -0,0 +1,185 @@
+import os
+import re
+import time
+import random
+import logging
+import cProfile
+import functools
+import threading
+import inspect
+
+# Configuration du logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+class Profiler:
+    """
+    Profilage cProfile d'un échantillon d'appels
+    
+    Seule une fraction sample_rate des appels est profilée, un seul à la
+    fois dans le processus (cProfile ne supporte pas les profils
+    imbriqués): les appels qui arrivent pendant un profil s'exécutent
+    normalement. Chaque profil est écrit dans output_dir sous un nom
+    contenant l'horodatage et l'étiquette de l'appel (action, entités...);
+    seuls les max_files fichiers les plus récents sont conservés.
+    
+    Pour une coroutine, le profil couvre aussi ce qui s'exécute sur la
+    boucle d'événements pendant ses await.
+    """
+    
+    def __init__(self, enabled=False, sample_rate=0.01, output_dir="profiles", max_files=100):
+        """
+        Initialise le profileur
+        
+        Args:
+            enabled (bool): Active le profilage
+            sample_rate (float): Fraction des appels profilés (entre 0 et 1)
+            output_dir (str): Répertoire des fichiers .prof
+            max_files (int): Nombre maximal de fichiers conservés
+        """
+        self.enabled = enabled
+        self.sample_rate = sample_rate
+        self.output_dir = output_dir
+        self.max_files = max_files
+        self._active = threading.Lock()
+        self._files_lock = threading.Lock()
+    
+    @classmethod
+    def from_env(cls):
+        """
+        Crée un profileur configuré par les variables d'environnement
+        
+        ESG_PROFILE ("1" pour activer), ESG_PROFILE_SAMPLE_RATE,
+        ESG_PROFILE_DIR et ESG_PROFILE_MAX_FILES.
+        """
+        return cls(
+            enabled=os.environ.get("ESG_PROFILE", "0") == "1",
+            sample_rate=float(os.environ.get("ESG_PROFILE_SAMPLE_RATE", "0.01")),
+            output_dir=os.environ.get("ESG_PROFILE_DIR", "profiles"),
+            max_files=int(os.environ.get("ESG_PROFILE_MAX_FILES", "100"))
+        )
+    
+    def _start(self):
+        """
+        Démarre un profil si l'appel est tiré au sort et qu'aucun profil n'est en cours
+        
+        Returns:
+            cProfile.Profile: Le profil démarré, ou None
+        """
+        if not self.enabled or random.random() >= self.sample_rate:
+            return None
+        if not self._active.acquire(blocking=False):
+            return None
+        profile = cProfile.Profile()
+        try:
+            profile.enable()
+        except ValueError:
+            # Un autre outil de profilage est déjà actif
+            self._active.release()
+            return None
+        return profile
+    
+    def _finish(self, profile, tag, duration):
+        """Écrit un profil arrêté sur disque et supprime les fichiers les plus anciens"""
+        self._active.release()
+        try:
+            os.makedirs(self.output_dir, exist_ok=True)
+            timestamp = time.strftime("%Y%m%d-%H%M%S")
+            filename = f"{timestamp}-{int(time.time() * 1000) % 1000:03d}_{sanitize_tag(tag)}_{duration * 1000:.0f}ms.prof"
+            path = os.path.join(self.output_dir, filename)
+            profile.dump_stats(path)
+            logger.info(f"Profil écrit dans {path}")
+            self._rotate()
+        except OSError as e:
+            logger.error(f"Erreur lors de l'écriture du profil de {tag}: {e}")
+    
+    def _rotate(self):
+        """Supprime les fichiers de profil au-delà de max_files (les plus anciens d'abord)"""
+        with self._files_lock:
+            paths = [
+                os.path.join(self.output_dir, name)
+                for name in os.listdir(self.output_dir) if name.endswith(".prof")
+            ]
+            if len(paths) <= self.max_files:
+                return
+            paths.sort(key=os.path.getmtime)
+            for path in paths[:len(paths) - self.max_files]:
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+    
+    def profile(self, tag_fn):
+        """
+        Décorateur profilant un échantillon des appels d'une fonction ou d'une coroutine
+        
+        Args:
+            tag_fn (callable): Fonction recevant la fonction décorée et les
+                arguments de l'appel, et renvoyant son étiquette (par exemple
+                l'action et ses entités)
+        
+        Returns:
+            callable: Le décorateur
+        """
+        def decorator(fn):
+            if inspect.iscoroutinefunction(fn):
+                @functools.wraps(fn)
+                async def async_wrapper(*args, **kwargs):
+                    profile = self._start()
+                    if profile is None:
+                        return await fn(*args, **kwargs)
+                    start = time.perf_counter()
+                    try:
+                        return await fn(*args, **kwargs)
+                    finally:
+                        duration = time.perf_counter() - start
+                        profile.disable()
+                        self._finish(profile, tag_fn(fn, *args, **kwargs), duration)
+                return async_wrapper
+            
+            @functools.wraps(fn)
+            def wrapper(*args, **kwargs):
+                profile = self._start()
+                if profile is None:
+                    return fn(*args, **kwargs)
+                start = time.perf_counter()
+                try:
+                    return fn(*args, **kwargs)
+                finally:
+                    duration = time.perf_counter() - start
+                    profile.disable()
+                    self._finish(profile, tag_fn(fn, *args, **kwargs), duration)
+            return wrapper
+        return decorator
+
+def sanitize_tag(tag, max_length=120):
+    """
+    Transforme une étiquette en fragment de nom de fichier
+    
+    Args:
+        tag (str): L'étiquette
+        max_length (int): Longueur maximale
+    
+    Returns:
+        str: L'étiquette sans caractères spéciaux
+    """
+    return re.sub(r"[^\w=.,-]+", "-", str(tag)).strip("-")[:max_length] or "appel"
+
+def method_tag(fn, method_self, *args, **kwargs):
+    """Étiquette d'un appel de méthode: classe et méthode, puis arguments"""
+    values = [str(arg) for arg in args] + [f"{key}={value}" for key, value in kwargs.items()]
+    return ",".join([f"{type(method_self).__name__}.{fn.__name__}"] + values)
+
+# Profileur partagé, configuré par les variables d'environnement ESG_PROFILE*
+PROFILER = Profiler.from_env()
+
+def profiled(tag_fn=method_tag):
+    """
+    Décorateur profilant un échantillon des appels avec PROFILER
+    
+    Sans ESG_PROFILE=1, le seul coût est un test par appel.
+    
+    Args:
+        tag_fn (callable): Fonction calculant l'étiquette à partir des arguments
+    """
+    return PROFILER.profile(tag_fn)
@@ -0,0 +1,226 @@
+import asyncio
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlparse
+
+# Configuration du logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Limites par domaine: (requêtes par seconde, rafale maximale)
+DEFAULT_HOST_LIMITS = {
+    "msci.com": (0.5, 2),
+    "refinitiv.com": (1.0, 3),
+    "sustainalytics.com": (0.5, 2),
+    "bloomberg.com": (0.25, 1),
+    "cdp.net": (0.5, 2)
+}
+
+# Codes HTTP signalant que l'hôte demande de ralentir
+THROTTLE_STATUS_CODES = (429, 503)
+
+class TokenBucket:
+    """
+    Seau à jetons d'un hôte
+    
+    Chaque requête réserve un jeton; si le seau est vide, la réservation
+    renvoie le temps d'attente nécessaire. La réservation est protégée par
+    un verrou et ne dort jamais elle-même: l'attente est faite par l'appelant
+    (time.sleep ou asyncio.sleep), ce qui permet de partager le même seau
+    entre threads et tâches asyncio.
+    """
+    
+    def __init__(self, rate, burst, min_rate=0.05):
+        """
+        Initialise le seau
+        
+        Args:
+            rate (float): Requêtes autorisées par seconde
+            burst (int): Nombre maximal de requêtes en rafale
+            min_rate (float): Débit plancher après ralentissements successifs
+        """
+        self.base_rate = rate
+        self.rate = rate
+        self.burst = max(1, burst)
+        self.min_rate = min_rate
+        self.tokens = float(self.burst)
+        self.updated = time.monotonic()
+        self.blocked_until = 0.0
+        self._lock = threading.Lock()
+    
+    def _refill(self, now):
+        """Ajoute les jetons accumulés depuis la dernière mise à jour"""
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+    
+    def reserve(self):
+        """
+        Réserve un jeton
+        
+        Returns:
+            float: Temps d'attente (en secondes) avant de pouvoir envoyer la requête
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            self.tokens -= 1
+            wait = -self.tokens / self.rate if self.tokens < 0 else 0.0
+            return max(wait, self.blocked_until - now)
+    
+    def throttle(self, retry_after=None):
+        """
+        Ralentit l'hôte après une réponse 429/503
+        
+        Le débit est divisé par deux (sans descendre sous min_rate) et, si
+        l'hôte a fourni un Retry-After, plus aucune requête n'est envoyée avant
+        son expiration.
+        
+        Args:
+            retry_after (float, optional): Délai demandé par l'hôte en secondes
+        
+        Returns:
+            float: Le nouveau débit en requêtes par seconde
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            self.rate = max(self.min_rate, self.rate / 2)
+            self.tokens = min(self.tokens, 0.0)
+            if retry_after:
+                self.blocked_until = max(self.blocked_until, now + retry_after)
+            return self.rate
+    
+    def recover(self):
+        """Réaugmente progressivement le débit après une réponse réussie"""
+        with self._lock:
+            if self.rate < self.base_rate:
+                self._refill(time.monotonic())
+                self.rate = min(self.base_rate, self.rate + self.base_rate * 0.1)
+
+class HostRateLimiter:
+    """
+    Limiteur de débit par domaine, utilisable depuis des threads et des tâches asyncio
+    """
+    
+    def __init__(self, limits=None, default_rate=1.0, default_burst=2):
+        """
+        Initialise le limiteur
+        
+        Args:
+            limits (dict, optional): {domaine: (requêtes par seconde, rafale)}
+                (complète DEFAULT_HOST_LIMITS)
+            default_rate (float): Débit des domaines non configurés
+            default_burst (int): Rafale des domaines non configurés
+        """
+        self.limits = dict(DEFAULT_HOST_LIMITS)
+        if limits:
+            self.limits.update(limits)
+        self.default_rate = default_rate
+        self.default_burst = default_burst
+        self._buckets = {}
+        self._lock = threading.Lock()
+        self._local = threading.local()
+    
+    def _domain(self, url):
+        """Domaine configuré correspondant à une URL (ou son hôte s'il n'est pas configuré)"""
+        host = (urlparse(url).hostname or url).lower()
+        for domain in self.limits:
+            if host == domain or host.endswith(f".{domain}"):
+                return domain
+        return host
+    
+    def bucket(self, url):
+        """
+        Seau à jetons associé à une URL
+        
+        Args:
+            url (str): L'URL (ou le nom d'hôte) visée
+            
+        Returns:
+            TokenBucket: Le seau du domaine
+        """
+        domain = self._domain(url)
+        with self._lock:
+            bucket = self._buckets.get(domain)
+            if bucket is None:
+                rate, burst = self.limits.get(domain, (self.default_rate, self.default_burst))
+                bucket = TokenBucket(rate, burst)
+                self._buckets[domain] = bucket
+            return bucket
+    
+    def acquire(self, url):
+        """
+        Attend (en bloquant le thread) le droit d'envoyer une requête
+        
+        Args:
+            url (str): L'URL visée
+        """
+        wait = self.bucket(url).reserve()
+        if wait > 0:
+            listener = getattr(self._local, "on_wait", None)
+            if listener is not None:
+                listener(wait)
+            time.sleep(wait)
+    
+    @contextmanager
+    def waits_reported_to(self, listener):
+        """
+        Signale à listener les attentes de acquire() dans le thread courant
+        
+        Permet par exemple d'exclure l'attente d'un jeton du délai d'une tâche.
+        
+        Args:
+            listener (callable): Fonction recevant chaque attente en secondes,
+                appelée avant l'attente
+        """
+        previous = getattr(self._local, "on_wait", None)
+        self._local.on_wait = listener
+        try:
+            yield
+        finally:
+            self._local.on_wait = previous
+    
+    async def acquire_async(self, url):
+        """
+        Attend (sans bloquer la boucle asyncio) le droit d'envoyer une requête
+        
+        Args:
+            url (str): L'URL visée
+        """
+        wait = self.bucket(url).reserve()
+        if wait > 0:
+            await asyncio.sleep(wait)
+    
+    def report(self, url, status_code, retry_after=None):
+        """
+        Adapte le débit d'un hôte selon la réponse reçue
+        
+        Args:
+            url (str): L'URL visée
+            status_code (int): Code HTTP de la réponse
+            retry_after (str, optional): Valeur de l'en-tête Retry-After
+        """
+        bucket = self.bucket(url)
+        if status_code in THROTTLE_STATUS_CODES:
+            delay = self._parse_retry_after(retry_after)
+            rate = bucket.throttle(delay)
+            logger.warning(f"Réponse {status_code} de {self._domain(url)}: ralentissement à {rate:.2f} req/s")
+        elif status_code < 400:
+            bucket.recover()
+    
+    @staticmethod
+    def _parse_retry_after(value):
+        """Convertit un en-tête Retry-After (secondes ou date HTTP) en secondes"""
+        if not value:
+            return None
+        try:
+            return max(0.0, float(value))
+        except ValueError:
+            pass
+        try:
+            return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+        except Exception:
+            return None
@@ -0,0 +1,307 @@
+import os
+import json
+import time
+import sqlite3
+import logging
+import threading
+from collections.abc import Mapping
+
+# Configuration du logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+class SharedESGStore:
+    """
+    Magasin SQLite (mode WAL) partagé par les processus d'un même hôte
+    
+    Il contient les tables de données publiées par un seul processus
+    rafraîchisseur (désigné par un bail renouvelé périodiquement), avec un
+    numéro de version, et les données ESG des entreprises extraites par
+    n'importe quel processus. Les lecteurs ne bloquent pas l'écrivain (WAL):
+    une extraction faite par un worker profite à tous les autres.
+    
+    Les tables sont stockées ligne par ligne (une ligne par clé), chaque
+    ligne portant la version de sa dernière modification: les autres
+    processus lisent les lignes à la demande (voir SharedTable) et ne
+    relisent que les lignes modifiées depuis leur dernière synchronisation,
+    sans jamais désérialiser une table entière.
+    """
+    
+    def __init__(self, path, busy_timeout=5.0):
+        """
+        Ouvre (ou crée) le magasin
+        
+        Args:
+            path (str): Chemin du fichier SQLite
+            busy_timeout (float): Attente maximale d'un verrou d'écriture, en secondes
+        """
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, timeout=busy_timeout, check_same_thread=False)
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS esg_table_rows (
+                    name TEXT NOT NULL,
+                    key TEXT NOT NULL,
+                    payload TEXT,
+                    version INTEGER NOT NULL,
+                    PRIMARY KEY (name, key)
+                )
+            """)
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_esg_table_rows_version ON esg_table_rows (name, version)")
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS esg_companies (
+                    symbol TEXT PRIMARY KEY,
+                    payload TEXT NOT NULL,
+                    updated_at REAL NOT NULL
+                )
+            """)
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS esg_meta (
+                    key TEXT PRIMARY KEY,
+                    value TEXT NOT NULL,
+                    expires_at REAL
+                )
+            """)
+    
+    def data_version(self):
+        """
+        Version des tables publiées (lecture d'une seule ligne)
+        
+        Returns:
+            int: La version, 0 si aucune table n'a été publiée
+        """
+        with self._lock:
+            row = self._conn.execute("SELECT value FROM esg_meta WHERE key = 'data_version'").fetchone()
+        return int(row[0]) if row else 0
+    
+    def publish_tables(self, tables):
+        """
+        Publie les tables de données, en une transaction
+        
+        Seules les lignes ajoutées, modifiées ou supprimées sont écrites,
+        avec la nouvelle version; une ligne supprimée est conservée sans
+        contenu pour que les autres processus l'apprennent. La version n'est
+        incrémentée que si une ligne a changé.
+        
+        Args:
+            tables (dict): {nom de la table: données}
+        
+        Returns:
+            int: La version des tables publiées
+        """
+        with self._lock, self._conn:
+            row = self._conn.execute("SELECT value FROM esg_meta WHERE key = 'data_version'").fetchone()
+            version = (int(row[0]) if row else 0) + 1
+            changed = 0
+            for name, data in tables.items():
+                if isinstance(data, SharedTable) and data.store is self:
+                    # Table déjà lue depuis ce magasin
+                    continue
+                current = dict(self._conn.execute(
+                    "SELECT key, payload FROM esg_table_rows WHERE name = ? AND payload IS NOT NULL", (name,)
+                ))
+                rows = {key: json.dumps(value, ensure_ascii=False, sort_keys=True) for key, value in data.items()}
+                upserts = [(name, key, payload, version) for key, payload in rows.items() if current.get(key) != payload]
+                removed = [(version, name, key) for key in current if key not in rows]
+                self._conn.executemany("""
+                    INSERT INTO esg_table_rows (name, key, payload, version) VALUES (?, ?, ?, ?)
+                    ON CONFLICT (name, key) DO UPDATE SET payload = excluded.payload, version = excluded.version
+                """, upserts)
+                self._conn.executemany(
+                    "UPDATE esg_table_rows SET payload = NULL, version = ? WHERE name = ? AND key = ?", removed
+                )
+                changed += len(upserts) + len(removed)
+            if not changed:
+                return version - 1
+            self._conn.execute("""
+                INSERT INTO esg_meta (key, value) VALUES ('data_version', ?)
+                ON CONFLICT (key) DO UPDATE SET value = excluded.value
+            """, (str(version),))
+        logger.info(f"Tables publiées dans {self.path} (version {version}, {changed} lignes modifiées)")
+        return version
+    
+    def changed_tables(self, since=0):
+        """
+        Noms des tables modifiées après une version
+        
+        Args:
+            since (int): Dernière version connue de l'appelant
+        
+        Returns:
+            set: Les noms des tables
+        """
+        with self._lock:
+            rows = self._conn.execute("SELECT DISTINCT name FROM esg_table_rows WHERE version > ?", (since,))
+            return {name for name, in rows}
+    
+    def changed_rows(self, name, since=0):
+        """
+        Lignes d'une table modifiées après une version
+        
+        Args:
+            name (str): Nom de la table
+            since (int): Dernière version connue de l'appelant
+        
+        Returns:
+            list: Tuples (clé, données), les données valant None pour une ligne supprimée
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT key, payload FROM esg_table_rows WHERE name = ? AND version > ?", (name, since)
+            ).fetchall()
+        return [(key, json.loads(payload) if payload is not None else None) for key, payload in rows]
+    
+    def get_row(self, name, key):
+        """
+        Lit une ligne d'une table publiée
+        
+        Args:
+            name (str): Nom de la table
+            key (str): Clé de la ligne
+        
+        Returns:
+            Les données de la ligne
+        
+        Raises:
+            KeyError: Si la ligne est absente
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT payload FROM esg_table_rows WHERE name = ? AND key = ? AND payload IS NOT NULL", (name, key)
+            ).fetchone()
+        if row is None:
+            raise KeyError(key)
+        return json.loads(row[0])
+    
+    def table_keys(self, name):
+        """Clés d'une table publiée, dans l'ordre de publication"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT key FROM esg_table_rows WHERE name = ? AND payload IS NOT NULL ORDER BY rowid", (name,)
+            ).fetchall()
+        return [key for key, in rows]
+    
+    def table_items(self, name):
+        """Lignes (clé, données) d'une table publiée, dans l'ordre de publication"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT key, payload FROM esg_table_rows WHERE name = ? AND payload IS NOT NULL ORDER BY rowid", (name,)
+            ).fetchall()
+        return [(key, json.loads(payload)) for key, payload in rows]
+    
+    def table_len(self, name):
+        """Nombre de lignes d'une table publiée"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT COUNT(*) FROM esg_table_rows WHERE name = ? AND payload IS NOT NULL", (name,)
+            ).fetchone()
+        return row[0]
+    
+    def get_company(self, company_symbol):
+        """
+        Lit les données d'une entreprise
+        
+        Args:
+            company_symbol (str): Symbole boursier de l'entreprise
+        
+        Returns:
+            tuple: (données ESG, âge en secondes), ou None si l'entreprise est absente
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT payload, updated_at FROM esg_companies WHERE symbol = ?", (company_symbol,)
+            ).fetchone()
+        if row is None:
+            return None
+        return json.loads(row[0]), max(0.0, time.time() - row[1])
+    
+    def put_company(self, company_symbol, company_data, updated_at=None):
+        """
+        Enregistre les données d'une entreprise (remplace les précédentes)
+        
+        Args:
+            company_symbol (str): Symbole boursier de l'entreprise
+            company_data (dict): Données ESG par source
+            updated_at (float, optional): Date des données (timestamp, par défaut maintenant)
+        """
+        with self._lock, self._conn:
+            self._conn.execute("""
+                INSERT INTO esg_companies (symbol, payload, updated_at) VALUES (?, ?, ?)
+                ON CONFLICT (symbol) DO UPDATE SET payload = excluded.payload, updated_at = excluded.updated_at
+            """, (company_symbol, json.dumps(company_data, ensure_ascii=False), updated_at or time.time()))
+    
+    def acquire_refresher(self, owner, lease=10.0):
+        """
+        Prend ou renouvelle le rôle de rafraîchisseur (seul écrivain des tables)
+        
+        Le rôle est attribué par un bail: il revient au premier processus qui
+        le demande, puis à un autre si son détenteur ne l'a pas renouvelé
+        avant son expiration (processus arrêté).
+        
+        Args:
+            owner (str): Identifiant du processus demandeur
+            lease (float): Durée du bail en secondes
+        
+        Returns:
+            bool: True si owner détient le rôle
+        """
+        now = time.time()
+        with self._lock, self._conn:
+            cursor = self._conn.execute("""
+                INSERT INTO esg_meta (key, value, expires_at) VALUES ('refresher', ?, ?)
+                ON CONFLICT (key) DO UPDATE SET value = excluded.value, expires_at = excluded.expires_at
+                WHERE esg_meta.value = excluded.value OR esg_meta.expires_at < ?
+            """, (owner, now + lease, now))
+            return cursor.rowcount > 0
+    
+    def release_refresher(self, owner):
+        """Abandonne le rôle de rafraîchisseur s'il est détenu par owner"""
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM esg_meta WHERE key = 'refresher' AND value = ?", (owner,))
+    
+    def close(self):
+        """Ferme la connexion"""
+        with self._lock:
+            self._conn.close()
+
+class SharedTable(Mapping):
+    """
+    Vue en lecture seule d'une table publiée dans un SharedESGStore
+    
+    Chaque accès lit la ligne demandée dans le magasin: le processus ne
+    garde aucune copie de la table, et voit toujours la dernière version
+    publiée.
+    """
+    
+    def __init__(self, store, name):
+        """
+        Initialise la vue
+        
+        Args:
+            store (SharedESGStore): Le magasin partagé
+            name (str): Nom de la table
+        """
+        self.store = store
+        self.name = name
+    
+    def __getitem__(self, key):
+        return self.store.get_row(self.name, key)
+    
+    def __iter__(self):
+        return iter(self.store.table_keys(self.name))
+    
+    def __len__(self):
+        return self.store.table_len(self.name)
+    
+    def items(self):
+        """Lignes (clé, données) de la table, lues en une requête"""
+        return self.store.table_items(self.name)
+    
+    def __repr__(self):
+        return f"SharedTable({self.name!r}, {self.store.path!r})"
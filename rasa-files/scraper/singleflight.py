@@ -0,0 +1,109 @@
+import asyncio
+import threading
+from concurrent.futures import Future
+
+class SingleFlight:
+    """
+    Regroupement des appels concurrents portant sur la même clé
+    
+    Le premier appelant d'une clé exécute la fonction; les appelants
+    suivants, tant que cet appel est en cours, attendent son résultat (ou
+    son exception) au lieu de relancer le même travail. Les appelants
+    peuvent être des threads (do) ou des tâches asyncio (do_async), et les
+    deux peuvent partager le même appel en cours.
+    """
+    
+    def __init__(self):
+        self._calls = {}
+        self._lock = threading.Lock()
+    
+    def _join(self, key):
+        """
+        Rejoint l'appel en cours pour une clé, ou en crée un
+        
+        Returns:
+            tuple: (future partagée, True si l'appelant doit exécuter la fonction)
+        """
+        with self._lock:
+            future = self._calls.get(key)
+            if future is not None:
+                return future, False
+            future = Future()
+            # Une future "en cours" ne peut plus être annulée par un appelant qui abandonne
+            future.set_running_or_notify_cancel()
+            self._calls[key] = future
+            return future, True
+    
+    def _run(self, key, future, fn, args, kwargs):
+        """Exécute la fonction pour le compte de tous les appelants de la clé"""
+        try:
+            result = fn(*args, **kwargs)
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+    
+    def do(self, key, fn, *args, **kwargs):
+        """
+        Exécute fn une seule fois pour tous les appels concurrents de la clé (threads)
+        
+        Args:
+            key: La clé de regroupement
+            fn (callable): La fonction à exécuter
+            
+        Returns:
+            Le résultat de fn
+        """
+        future, leader = self._join(key)
+        if not leader:
+            return future.result()
+        return self._run(key, future, fn, args, kwargs)
+    
+    async def do_async(self, key, fn, *args, executor=None, **kwargs):
+        """
+        Variante asyncio de do(): la fonction bloquante s'exécute sur un exécuteur
+        
+        L'abandon (annulation) d'un appelant n'interrompt pas l'appel partagé.
+        
+        Args:
+            key: La clé de regroupement
+            fn (callable): La fonction bloquante à exécuter
+            executor (Executor, optional): Exécuteur utilisé (par défaut: celui de la boucle)
+            
+        Returns:
+            Le résultat de fn
+        """
+        future, leader = self._join(key)
+        if leader:
+            loop = asyncio.get_running_loop()
+            try:
+                loop.run_in_executor(executor, self._run_quietly, key, future, fn, args, kwargs)
+            except BaseException as e:
+                # Exécuteur arrêté: libérer la clé et transmettre l'erreur aux appelants
+                with self._lock:
+                    self._calls.pop(key, None)
+                future.set_exception(e)
+                raise
+        return await asyncio.wrap_future(future)
+    
+    def _run_quietly(self, key, future, fn, args, kwargs):
+        """Comme _run, l'exception n'étant transmise que par la future partagée"""
+        try:
+            self._run(key, future, fn, args, kwargs)
+        except BaseException:
+            pass
+    
+    def in_flight(self):
+        """
+        Clés dont un appel est en cours
+        
+        Returns:
+            list: Les clés
+        """
+        with self._lock:
+            return list(self._calls)
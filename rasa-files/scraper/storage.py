@@ -0,0 +1,292 @@
+import glob
+import json
+import logging
+import os
+import sqlite3
+import threading
+from datetime import datetime
+
+# Configuration du logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Répertoire de données partagé par les scrapers, l'adaptateur et les actions
+DEFAULT_DATA_DIR = os.environ.get(
+    "ESG_DATA_DIR",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data", "esg_data")
+)
+
+# Moteur de stockage des enregistrements utilisé par défaut (ESG_STORAGE_BACKEND)
+DEFAULT_STORAGE_BACKEND = os.environ.get("ESG_STORAGE_BACKEND", "sqlite")
+
+# pandas n'est importé que par les moteurs CSV et Parquet, pour ne pas
+# ralentir le démarrage des processus qui n'utilisent que SQLite
+
+class ESGStorage:
+    """
+    Interface commune des moteurs de stockage des enregistrements ESG
+    
+    Un enregistrement est identifié par (symbole, source, date d'extraction).
+    Les écritures sont mises en tampon et envoyées par lots (flush).
+    """
+    
+    def __init__(self, batch_size=500):
+        """
+        Initialise le stockage
+        
+        Args:
+            batch_size (int): Nombre d'enregistrements en tampon avant écriture
+        """
+        self.batch_size = batch_size
+        self._buffer = []
+        self._buffer_lock = threading.Lock()
+    
+    def add(self, company_symbol, source, record):
+        """
+        Ajoute un enregistrement (écrit lors du prochain flush)
+        
+        Args:
+            company_symbol (str): Le symbole de l'entreprise
+            source (str): La clé de la source
+            record (dict): Les données de la source
+        """
+        date_extracted = record.get("date_extracted") or datetime.now().strftime("%Y-%m-%d")
+        with self._buffer_lock:
+            self._buffer.append((company_symbol, source, date_extracted, record))
+            full = len(self._buffer) >= self.batch_size
+        if full:
+            self.flush()
+    
+    def flush(self):
+        """Écrit les enregistrements en tampon en un seul lot"""
+        with self._buffer_lock:
+            batch, self._buffer = self._buffer, []
+        if batch:
+            self._write_batch(batch)
+    
+    def _write_batch(self, batch):
+        """Écrit un lot de tuples (symbole, source, date, enregistrement)"""
+        raise NotImplementedError
+    
+    def latest_records(self, symbols=None, sources=None):
+        """
+        Dernier enregistrement valide (sans erreur) par entreprise et par source
+        
+        Args:
+            symbols (list, optional): Entreprises recherchées (par défaut: toutes)
+            sources (list, optional): Sources recherchées (par défaut: toutes)
+            
+        Returns:
+            dict: {symbole: {source: enregistrement}}
+        """
+        raise NotImplementedError
+    
+    def read_company(self, company_symbol):
+        """
+        Derniers enregistrements valides d'une entreprise
+        
+        Args:
+            company_symbol (str): Le symbole de l'entreprise
+            
+        Returns:
+            dict: {source: enregistrement}
+        """
+        return self.latest_records([company_symbol]).get(company_symbol, {})
+    
+    def close(self):
+        """Écrit le tampon et libère les ressources"""
+        self.flush()
+
+class CSVStorage(ESGStorage):
+    """Stockage historique: un fichier CSV par entreprise et par source"""
+    
+    def __init__(self, output_dir, batch_size=1):
+        super().__init__(batch_size)
+        self.output_dir = output_dir
+        os.makedirs(output_dir, exist_ok=True)
+    
+    def _write_batch(self, batch):
+        import pandas as pd
+        
+        for company_symbol, source, _, record in batch:
+            df = pd.DataFrame([record])
+            
+            # Sauvegarder en CSV
+            filename = f"{self.output_dir}/{company_symbol}_{source}_esg_data.csv"
+            df.to_csv(filename, index=False)
+            logger.info(f"Données sauvegardées dans {filename}")
+    
+    def latest_records(self, symbols=None, sources=None):
+        import pandas as pd
+        
+        self.flush()
+        results = {}
+        for filename in glob.glob(os.path.join(self.output_dir, "*_esg_data.csv")):
+            stem = os.path.basename(filename)[:-len("_esg_data.csv")]
+            if "_" not in stem or stem.startswith("consolidated_"):
+                continue
+            company_symbol, source = stem.rsplit("_", 1)
+            if (symbols is not None and company_symbol not in symbols) or \
+                    (sources is not None and source not in sources):
+                continue
+            record = pd.read_csv(filename, dtype=str, keep_default_na=False).to_dict("records")[0]
+            if "error" not in record:
+                results.setdefault(company_symbol, {})[source] = record
+        return results
+
+class SQLiteStorage(ESGStorage):
+    """
+    Stockage SQLite en mode WAL
+    
+    Les enregistrements sont insérés par lots dans une seule transaction et
+    indexés sur (symbol, source, date_extracted). Un enregistrement en
+    erreur ne remplace jamais un enregistrement valide du même jour.
+    """
+    
+    def __init__(self, output_dir, filename="esg_records.db", batch_size=500):
+        super().__init__(batch_size)
+        os.makedirs(output_dir, exist_ok=True)
+        self.path = os.path.join(output_dir, filename)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS esg_records (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    symbol TEXT NOT NULL,
+                    source TEXT NOT NULL,
+                    date_extracted TEXT NOT NULL,
+                    has_error INTEGER NOT NULL,
+                    payload TEXT NOT NULL
+                )
+            """)
+            self._conn.execute("""
+                CREATE UNIQUE INDEX IF NOT EXISTS idx_esg_records_key
+                ON esg_records (symbol, source, date_extracted)
+            """)
+    
+    def _write_batch(self, batch):
+        rows = [
+            (company_symbol, source, date_extracted, int("error" in record),
+             json.dumps(record, ensure_ascii=False))
+            for company_symbol, source, date_extracted, record in batch
+        ]
+        with self._lock, self._conn:
+            self._conn.executemany("""
+                INSERT INTO esg_records (symbol, source, date_extracted, has_error, payload)
+                VALUES (?, ?, ?, ?, ?)
+                ON CONFLICT (symbol, source, date_extracted) DO UPDATE SET
+                    has_error = excluded.has_error,
+                    payload = excluded.payload
+                WHERE excluded.has_error = 0 OR esg_records.has_error = 1
+            """, rows)
+        logger.info(f"{len(rows)} enregistrements écrits dans {self.path}")
+    
+    def latest_records(self, symbols=None, sources=None):
+        self.flush()
+        query = """
+            SELECT symbol, source, payload FROM esg_records AS r
+            WHERE has_error = 0
+              AND date_extracted = (
+                SELECT MAX(date_extracted) FROM esg_records
+                WHERE symbol = r.symbol AND source = r.source AND has_error = 0
+              )
+        """
+        params = []
+        if symbols is not None:
+            symbols = list(symbols)
+            query += f" AND symbol IN ({', '.join('?' * len(symbols))})"
+            params.extend(symbols)
+        if sources is not None:
+            sources = list(sources)
+            query += f" AND source IN ({', '.join('?' * len(sources))})"
+            params.extend(sources)
+        
+        results = {}
+        with self._lock:
+            for company_symbol, source, payload in self._conn.execute(query, params):
+                results.setdefault(company_symbol, {})[source] = json.loads(payload)
+        return results
+    
+    def close(self):
+        super().close()
+        with self._lock:
+            self._conn.close()
+
+class ParquetStorage(ESGStorage):
+    """
+    Stockage Parquet partitionné par source (nécessite pyarrow)
+    
+    Chaque lot produit un fichier par source dans <output_dir>/parquet/source=<source>/.
+    """
+    
+    def __init__(self, output_dir, batch_size=5000):
+        super().__init__(batch_size)
+        self.root = os.path.join(output_dir, "parquet")
+        os.makedirs(self.root, exist_ok=True)
+        self._part = 0
+    
+    def _write_batch(self, batch):
+        import pandas as pd
+        
+        by_source = {}
+        for company_symbol, source, date_extracted, record in batch:
+            by_source.setdefault(source, []).append({
+                "symbol": company_symbol,
+                "date_extracted": date_extracted,
+                "has_error": "error" in record,
+                "payload": json.dumps(record, ensure_ascii=False)
+            })
+        
+        stamp = datetime.now().strftime("%Y%m%d%H%M%S")
+        for source, rows in by_source.items():
+            partition = os.path.join(self.root, f"source={source}")
+            os.makedirs(partition, exist_ok=True)
+            self._part += 1
+            filename = os.path.join(partition, f"part-{stamp}-{os.getpid()}-{self._part}.parquet")
+            pd.DataFrame(rows).to_parquet(filename, index=False)
+            logger.info(f"{len(rows)} enregistrements écrits dans {filename}")
+    
+    def latest_records(self, symbols=None, sources=None):
+        import pandas as pd
+        
+        self.flush()
+        results = {}
+        for partition in glob.glob(os.path.join(self.root, "source=*")):
+            source = os.path.basename(partition).split("=", 1)[1]
+            if sources is not None and source not in sources:
+                continue
+            filters = [("has_error", "==", False)]
+            if symbols is not None:
+                filters.append(("symbol", "in", list(symbols)))
+            df = pd.read_parquet(partition, filters=filters)
+            if df.empty:
+                continue
+            df = df.sort_values("date_extracted").drop_duplicates("symbol", keep="last")
+            for company_symbol, payload in zip(df["symbol"], df["payload"]):
+                results.setdefault(company_symbol, {})[source] = json.loads(payload)
+        return results
+
+# Moteurs de stockage disponibles
+STORAGE_BACKENDS = {
+    "csv": CSVStorage,
+    "sqlite": SQLiteStorage,
+    "parquet": ParquetStorage
+}
+
+def create_storage(backend, output_dir, **kwargs):
+    """
+    Crée un moteur de stockage
+    
+    Args:
+        backend (str): "sqlite", "parquet" ou "csv"
+        output_dir (str): Répertoire des données
+        
+    Returns:
+        ESGStorage: Le moteur de stockage
+    """
+    if backend not in STORAGE_BACKENDS:
+        raise ValueError(f"Moteur de stockage inconnu: {backend} (choix: {', '.join(STORAGE_BACKENDS)})")
+    return STORAGE_BACKENDS[backend](output_dir, **kwargs)
@@ -0,0 +1,261 @@
+import itertools
+import logging
+import queue
+import threading
+import time
+import weakref
+from contextlib import contextmanager
+
+from selenium.common.exceptions import TimeoutException, NoSuchElementException
+from .metrics import REGISTRY
+
+try:
+    import psutil
+except ImportError:  # psutil est optionnel: sans lui, seul le nombre de pages est surveillé
+    psutil = None
+
+# Configuration du logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Exceptions "normales" d'une page: le navigateur reste utilisable
+BENIGN_EXCEPTIONS = (TimeoutException, NoSuchElementException)
+
+# Pools ouverts, exposés par les métriques ci-dessous (une étiquette "pool" par pool)
+_OPEN_POOLS = weakref.WeakSet()
+_POOL_IDS = itertools.count(1)
+
+def _pool_stats(states):
+    """
+    Statistiques des pools ouverts, au format des métriques évaluées à la demande
+    
+    Args:
+        states (tuple): États retenus (clés de WebDriverPool.stats())
+    
+    Returns:
+        dict: {(nom du pool, état): valeur}
+    """
+    values = {}
+    for pool in list(_OPEN_POOLS):
+        stats = pool.stats()
+        for state in states:
+            values[(pool.name, state)] = stats[state]
+    return values
+
+# Occupation des pools, exposée par le registre de métriques
+LEASE_WAIT = REGISTRY.histogram(
+    "esg_webdriver_lease_wait_seconds",
+    "Attente d'un navigateur libre avant chaque page"
+)
+REGISTRY.gauge(
+    "esg_webdriver_pool_drivers",
+    "Navigateurs du pool par état (size: capacité)",
+    labels=("pool", "state"),
+    function=lambda: _pool_stats(("size", "open", "in_use", "idle"))
+)
+REGISTRY.counter_function(
+    "esg_webdriver_pool_created_total",
+    "Navigateurs démarrés par le pool",
+    lambda: {(pool,): value for (pool, _), value in _pool_stats(("created",)).items()},
+    labels=("pool",)
+)
+REGISTRY.counter_function(
+    "esg_webdriver_pool_recycled_total",
+    "Navigateurs recyclés par le pool",
+    lambda: {(pool,): value for (pool, _), value in _pool_stats(("recycled",)).items()},
+    labels=("pool",)
+)
+
+class _PooledDriver:
+    """Navigateur du pool avec ses compteurs d'usage"""
+    
+    def __init__(self, driver):
+        self.driver = driver
+        self.pages = 0
+        self.created_at = time.monotonic()
+
+class WebDriverPool:
+    """
+    Pool de navigateurs headless réutilisables
+    
+    Les navigateurs sont prêtés page par page via lease() puis rendus au pool.
+    Un navigateur est recyclé (fermé puis recréé à la demande) après
+    max_pages pages, lorsque sa mémoire dépasse max_memory_mb, ou lorsqu'une
+    erreur inattendue laisse penser qu'il est dans un état incohérent.
+    """
+    
+    def __init__(self, driver_factory, size=1, max_pages=100, max_memory_mb=1024, name=None):
+        """
+        Initialise le pool
+        
+        Args:
+            driver_factory (callable): Fonction sans argument créant un WebDriver
+            size (int): Nombre maximal de navigateurs ouverts simultanément
+            max_pages (int): Nombre de pages avant recyclage d'un navigateur
+            max_memory_mb (int): Mémoire (Mo) au-delà de laquelle un navigateur est recyclé
+            name (str, optional): Nom du pool dans les métriques (par défaut: pool-<n>)
+        """
+        self.name = name or f"pool-{next(_POOL_IDS)}"
+        self.driver_factory = driver_factory
+        self.size = max(1, size)
+        self.max_pages = max_pages
+        self.max_memory_mb = max_memory_mb
+        
+        self._idle = queue.LifoQueue()  # Réutiliser d'abord les navigateurs les plus chauds
+        self._slots = threading.BoundedSemaphore(self.size)
+        self._lock = threading.Lock()
+        self._drivers = set()
+        self._in_use = 0
+        self._created = 0
+        self._recycled = 0
+        self._closed = False
+        _OPEN_POOLS.add(self)
+    
+    def warm_up(self, count=None):
+        """
+        Démarre des navigateurs à l'avance pour éviter le coût du premier prêt
+        
+        Args:
+            count (int, optional): Nombre de navigateurs à démarrer (par défaut: size)
+        """
+        count = self.size if count is None else min(count, self.size)
+        missing = count - self._idle.qsize()
+        for _ in range(max(0, missing)):
+            self._idle.put(self._create())
+    
+    @contextmanager
+    def lease(self, timeout=None):
+        """
+        Prête un navigateur pour une page
+        
+        Args:
+            timeout (float, optional): Attente maximale d'un navigateur libre
+            
+        Yields:
+            WebDriver: Le navigateur prêté
+        """
+        if self._closed:
+            raise RuntimeError("Le pool de navigateurs est fermé")
+        with LEASE_WAIT.time():
+            acquired = self._slots.acquire(timeout=timeout)
+        if not acquired:
+            raise TimeoutError(f"Aucun navigateur libre après {timeout}s")
+        
+        pooled = None
+        broken = False
+        try:
+            pooled = self._acquire()
+            yield pooled.driver
+        except BENIGN_EXCEPTIONS:
+            raise
+        except Exception:
+            broken = True
+            raise
+        finally:
+            if pooled is not None:
+                self._release(pooled, broken)
+            self._slots.release()
+    
+    def _acquire(self):
+        """Récupère un navigateur libre ou en crée un nouveau"""
+        try:
+            pooled = self._idle.get_nowait()
+        except queue.Empty:
+            pooled = self._create()
+        with self._lock:
+            self._in_use += 1
+        return pooled
+    
+    def _release(self, pooled, broken):
+        """Rend un navigateur au pool, ou le recycle si nécessaire"""
+        pooled.pages += 1
+        with self._lock:
+            self._in_use -= 1
+            if pooled not in self._drivers:
+                # Déjà fermé par close()
+                return
+        
+        reason = None
+        if broken:
+            reason = "erreur"
+        elif self._closed:
+            reason = "fermeture du pool"
+        elif self.max_pages and pooled.pages >= self.max_pages:
+            reason = f"{pooled.pages} pages"
+        elif self.max_memory_mb:
+            memory_mb = self._memory_mb(pooled.driver)
+            if memory_mb is not None and memory_mb > self.max_memory_mb:
+                reason = f"{memory_mb:.0f} Mo"
+        
+        if reason:
+            logger.info(f"Recyclage d'un navigateur ({reason})")
+            with self._lock:
+                self._recycled += 1
+            self._quit(pooled)
+        else:
+            self._idle.put(pooled)
+    
+    def _create(self):
+        """Crée un navigateur et l'enregistre dans le pool"""
+        pooled = _PooledDriver(self.driver_factory())
+        with self._lock:
+            self._drivers.add(pooled)
+            self._created += 1
+        return pooled
+    
+    def _quit(self, pooled):
+        """Ferme un navigateur et l'oublie"""
+        with self._lock:
+            self._drivers.discard(pooled)
+        try:
+            pooled.driver.quit()
+        except Exception as e:
+            logger.warning(f"Erreur lors de la fermeture d'un navigateur: {str(e)}")
+    
+    @staticmethod
+    def _memory_mb(driver):
+        """
+        Mémoire résidente du navigateur (chromedriver et processus Chrome enfants)
+        
+        Returns:
+            float: Mémoire en Mo, ou None si elle ne peut pas être mesurée
+        """
+        if psutil is None:
+            return None
+        try:
+            process = psutil.Process(driver.service.process.pid)
+            processes = [process] + process.children(recursive=True)
+            return sum(p.memory_info().rss for p in processes) / (1024 * 1024)
+        except Exception:
+            return None
+    
+    def stats(self):
+        """
+        Occupation actuelle du pool
+        
+        Returns:
+            dict: Taille, navigateurs ouverts, prêtés, libres, créés et recyclés
+        """
+        with self._lock:
+            return {
+                "size": self.size,
+                "open": len(self._drivers),
+                "in_use": self._in_use,
+                "idle": self._idle.qsize(),
+                "created": self._created,
+                "recycled": self._recycled
+            }
+    
+    def close(self):
+        """Ferme tous les navigateurs, y compris ceux encore prêtés"""
+        self._closed = True
+        _OPEN_POOLS.discard(self)
+        while True:
+            try:
+                self._idle.get_nowait()
+            except queue.Empty:
+                break
+        with self._lock:
+            drivers = list(self._drivers)
+        for pooled in drivers:
+            self._quit(pooled)
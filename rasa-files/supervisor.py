@@ -0,0 +1,337 @@
+import os
+import sys
+import time
+import asyncio
+import logging
+import itertools
+import threading
+import subprocess
+import urllib.request
+
+from scraper.storage import DEFAULT_DATA_DIR
+
+# Configuration du logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Répertoire du projet Rasa (module actions/)
+PROJECT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Nombre de workers par défaut: un par cœur, dans la limite de 4
+DEFAULT_WORKERS = min(os.cpu_count() or 1, 4)
+
+class ActionWorker:
+    """Un processus serveur d'actions (python -m rasa_sdk) sur un port local"""
+    
+    def __init__(self, index, port, metrics_port=0, warmup=True, env=None):
+        """
+        Initialise le worker (sans le démarrer)
+        
+        Args:
+            index (int): Numéro du worker
+            port (int): Port du serveur d'actions
+            metrics_port (int): Port de l'endpoint /metrics (0 pour le désactiver)
+            warmup (bool): Si True, le worker préchauffe les actions au démarrage
+            env (dict, optional): Variables d'environnement supplémentaires
+        """
+        self.index = index
+        self.port = port
+        self.metrics_port = metrics_port
+        self.warmup = warmup
+        self.env = env or {}
+        self.process = None
+        self.healthy = False
+        self.ready = False
+        self.started_at = None
+        self.failures = 0
+        self.restarts = 0
+        self.next_start = 0.0
+    
+    def start(self):
+        """Lance le processus du worker"""
+        env = {**os.environ, **self.env}
+        env["ESG_METRICS_PORT"] = str(self.metrics_port)
+        env["ESG_ACTIONS_WARMUP"] = "1" if self.warmup else "0"
+        self.process = subprocess.Popen(
+            [sys.executable, "-m", "rasa_sdk", "--actions", "actions", "--port", str(self.port)],
+            env=env,
+            cwd=PROJECT_DIR
+        )
+        self.healthy = False
+        self.ready = False
+        self.failures = 0
+        self.started_at = time.monotonic()
+        logger.info(f"Worker d'actions {self.index} démarré (pid {self.process.pid}, port {self.port})")
+    
+    def is_running(self):
+        """Indique si le processus est en cours d'exécution"""
+        return self.process is not None and self.process.poll() is None
+    
+    def check_health(self, timeout=2.0):
+        """
+        Interroge l'endpoint /health du worker
+        
+        Args:
+            timeout (float): Délai maximal de la requête, en secondes
+        
+        Returns:
+            bool: True si le worker répond
+        """
+        try:
+            with urllib.request.urlopen(f"http://127.0.0.1:{self.port}/health", timeout=timeout) as response:
+                return response.status == 200
+        except OSError:
+            return False
+    
+    def stop(self, timeout=10.0):
+        """Arrête le processus (SIGTERM, puis SIGKILL après timeout secondes)"""
+        self.healthy = False
+        if not self.is_running():
+            return
+        self.process.terminate()
+        try:
+            self.process.wait(timeout)
+        except subprocess.TimeoutExpired:
+            logger.warning(f"Worker d'actions {self.index} ne s'arrête pas, arrêt forcé")
+            self.process.kill()
+            self.process.wait()
+
+class RoundRobinProxy:
+    """
+    Proxy TCP répartissant les connexions entre les workers en bon état
+    
+    La répartition se fait par connexion: le serveur Rasa ouvre une
+    connexion par requête d'action concurrente, les requêtes simultanées
+    sont donc réparties entre les workers. Si un worker refuse la
+    connexion, le suivant est essayé.
+    """
+    
+    def __init__(self, host, port, backends, connect_timeout=1.0):
+        """
+        Initialise le proxy
+        
+        Args:
+            host (str): Adresse d'écoute
+            port (int): Port d'écoute
+            backends (callable): Fonction renvoyant les ports des workers disponibles
+            connect_timeout (float): Délai de connexion à un worker, en secondes
+        """
+        self.host = host
+        self.port = port
+        self.backends = backends
+        self.connect_timeout = connect_timeout
+        self._counter = itertools.count()
+        self._loop = None
+        self._thread = None
+        self._server = None
+        self._connections = set()
+    
+    async def _pipe(self, reader, writer):
+        """
+        Recopie un flux vers l'autre jusqu'à sa fin
+        
+        La fin du flux est transmise par une demi-fermeture (write_eof), ce
+        qui laisse l'autre sens de la connexion ouvert jusqu'à sa propre fin.
+        En cas d'erreur, la connexion est fermée pour interrompre l'autre sens.
+        """
+        try:
+            while True:
+                data = await reader.read(65536)
+                if not data:
+                    break
+                writer.write(data)
+                await writer.drain()
+            if writer.can_write_eof():
+                writer.write_eof()
+        except (ConnectionError, OSError):
+            writer.close()
+    
+    async def _handle(self, client_reader, client_writer):
+        """Relaie une connexion cliente vers un worker"""
+        task = asyncio.current_task()
+        self._connections.add(task)
+        backend_writer = None
+        try:
+            ports = self.backends()
+            if ports:
+                start = next(self._counter) % len(ports)
+                ports = ports[start:] + ports[:start]
+            for port in ports:
+                try:
+                    backend_reader, backend_writer = await asyncio.wait_for(
+                        asyncio.open_connection("127.0.0.1", port), self.connect_timeout
+                    )
+                except (OSError, asyncio.TimeoutError):
+                    continue
+                # Les deux sens sont fermés une fois leurs deux recopies terminées
+                await asyncio.gather(
+                    self._pipe(client_reader, backend_writer),
+                    self._pipe(backend_reader, client_writer)
+                )
+                return
+            logger.error("Aucun worker d'actions disponible")
+        except asyncio.CancelledError:
+            # Arrêt du proxy: la connexion se termine normalement
+            pass
+        finally:
+            client_writer.close()
+            if backend_writer is not None:
+                backend_writer.close()
+            self._connections.discard(task)
+    
+    async def _shutdown(self):
+        """Ferme le port d'écoute et interrompt les connexions en cours"""
+        self._server.close()
+        for task in list(self._connections):
+            task.cancel()
+        await asyncio.gather(*self._connections, return_exceptions=True)
+        await self._server.wait_closed()
+    
+    def start(self):
+        """Démarre le proxy sur un thread dédié (bloque jusqu'à l'ouverture du port)"""
+        self._loop = asyncio.new_event_loop()
+        self._server = self._loop.run_until_complete(
+            asyncio.start_server(self._handle, self.host, self.port, reuse_address=True, backlog=256)
+        )
+        self._thread = threading.Thread(target=self._loop.run_forever, name="esg-action-proxy", daemon=True)
+        self._thread.start()
+        logger.info(f"Proxy des actions à l'écoute sur {self.host}:{self.port}")
+    
+    def stop(self, timeout=5.0):
+        """
+        Arrête le proxy
+        
+        Args:
+            timeout (float): Attente maximale de la fermeture des connexions, en secondes
+        """
+        if self._thread is not None:
+            try:
+                asyncio.run_coroutine_threadsafe(self._shutdown(), self._loop).result(timeout)
+            except Exception as e:
+                logger.warning(f"Arrêt incomplet du proxy des actions: {e}")
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._thread.join()
+            self._thread = None
+            self._server = None
+            self._loop.close()
+
+class ActionSupervisor:
+    """
+    Superviseur de plusieurs workers du serveur d'actions
+    
+    Les workers écoutent sur des ports consécutifs à partir de base_port,
+    derrière un proxy à répartition circulaire sur port (l'URL de
+    endpoints.yml ne change pas). Chaque worker est interrogé sur /health
+    toutes les health_interval secondes: un worker arrêté, ou qui ne répond
+    plus max_failures fois de suite, est relancé avec un délai croissant.
+    Chaque worker expose ses métriques sur metrics_port + son numéro.
+    Les workers partagent un magasin SQLite (ESG_SHARED_STORE): un seul
+    d'entre eux rafraîchit les tables, et une entreprise extraite par l'un
+    est servie aux autres sans nouvelle extraction.
+    """
+    
+    def __init__(self, workers=DEFAULT_WORKERS, port=5055, base_port=5100, host="0.0.0.0",
+                 metrics_port=9105, warmup=True, health_interval=2.0, max_failures=3,
+                 startup_timeout=120.0, shared_store=None):
+        """
+        Initialise le superviseur
+        
+        Args:
+            workers (int): Nombre de workers
+            port (int): Port du proxy (celui de endpoints.yml)
+            base_port (int): Port du premier worker
+            host (str): Adresse d'écoute du proxy
+            metrics_port (int): Port /metrics du premier worker (0 pour les désactiver)
+            warmup (bool): Si True, les workers préchauffent les actions au démarrage
+            health_interval (float): Intervalle entre deux vérifications, en secondes
+            max_failures (int): Vérifications échouées avant de relancer un worker
+            startup_timeout (float): Délai accordé à un worker pour répondre après son démarrage
+            shared_store (str, optional): Magasin SQLite partagé par les workers
+                (par défaut, esg_shared.db dans ESG_DATA_DIR dès qu'il y a plusieurs workers)
+        """
+        workers = max(1, workers)
+        if shared_store is None and workers > 1:
+            shared_store = os.environ.get("ESG_SHARED_STORE") or os.path.join(DEFAULT_DATA_DIR, "esg_shared.db")
+        env = {"ESG_SHARED_STORE": shared_store} if shared_store else {}
+        self.workers = [
+            ActionWorker(index, base_port + index, metrics_port + index if metrics_port else 0, warmup, env)
+            for index in range(workers)
+        ]
+        self.proxy = RoundRobinProxy(host, port, self.healthy_ports)
+        self.health_interval = health_interval
+        self.max_failures = max_failures
+        self.startup_timeout = startup_timeout
+        self._stop = threading.Event()
+        self._thread = None
+    
+    def healthy_ports(self):
+        """Ports des workers en bon état (à défaut, de tous les workers en cours d'exécution)"""
+        ports = [worker.port for worker in self.workers if worker.healthy]
+        return ports or [worker.port for worker in self.workers if worker.is_running()]
+    
+    def start(self):
+        """Lance les workers, le proxy et la surveillance"""
+        logger.info(f"Démarrage de {len(self.workers)} workers d'actions...")
+        for worker in self.workers:
+            worker.start()
+        self.proxy.start()
+        self._thread = threading.Thread(target=self._monitor, name="esg-action-supervisor", daemon=True)
+        self._thread.start()
+    
+    def _restart(self, worker, reason):
+        """Arrête un worker et planifie son redémarrage"""
+        worker.stop()
+        worker.process = None
+        delay = min(2 ** worker.restarts, 30)
+        worker.restarts += 1
+        worker.next_start = time.monotonic() + delay
+        logger.warning(f"Worker d'actions {worker.index} {reason}, redémarrage dans {delay}s "
+                       f"({worker.restarts} redémarrage(s))")
+    
+    def _check(self, worker):
+        """Vérifie un worker et le relance si nécessaire"""
+        if worker.process is None:
+            if time.monotonic() >= worker.next_start:
+                worker.start()
+            return
+        if not worker.is_running():
+            self._restart(worker, f"arrêté (code {worker.process.returncode})")
+            return
+        if worker.check_health():
+            if not worker.healthy:
+                logger.info(f"Worker d'actions {worker.index} prêt (port {worker.port})")
+            worker.healthy = worker.ready = True
+            worker.failures = 0
+            if time.monotonic() - worker.started_at > 60:
+                worker.restarts = 0
+            return
+        worker.healthy = False
+        if not worker.ready and time.monotonic() - worker.started_at < self.startup_timeout:
+            # Démarrage en cours (import des actions, préchauffage)
+            return
+        worker.failures += 1
+        if worker.failures >= self.max_failures:
+            self._restart(worker, "ne répond plus")
+    
+    def _monitor(self):
+        """Boucle de surveillance des workers"""
+        while not self._stop.is_set():
+            for worker in self.workers:
+                if self._stop.is_set():
+                    break
+                try:
+                    self._check(worker)
+                except Exception as e:
+                    logger.error(f"Erreur lors de la surveillance du worker {worker.index}: {e}")
+            self._stop.wait(self.health_interval)
+    
+    def stop(self):
+        """Arrête la surveillance, le proxy et les workers"""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        self.proxy.stop()
+        for worker in self.workers:
+            worker.stop()
+        logger.info("Workers d'actions arrêtés")
@@ -0,0 +1,11 @@
+import os
+import sys
+import tempfile
+
+# Répertoire de données jetable, fixé avant l'import des modules qui le lisent
+os.environ.setdefault("ESG_DATA_DIR", os.path.join(tempfile.mkdtemp(prefix="esg-tests-"), "esg_data"))
+os.environ.setdefault("ESG_HOT_RELOAD", "0")
+os.environ.pop("ESG_METRICS_PORT", None)
+
+# Rendre importables scraper/, actions/, run.py et supervisor.py
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,59 @@
+import asyncio
+import json
+import os
+
+import pytest
+from rasa_sdk.executor import CollectingDispatcher
+
+from actions import actions
+from actions.actions import ResponseCache
+
+def run_action(action_class, entities=None):
+    dispatcher = CollectingDispatcher()
+    asyncio.run(action_class().run(dispatcher, actions.build_synthetic_tracker(entities), {}))
+    return dispatcher.messages[0]["text"]
+
+@pytest.fixture(autouse=True)
+def clear_response_cache():
+    actions.response_cache.clear()
+    yield
+    actions.response_cache.clear()
+
+def test_response_cache_serves_same_version():
+    cache = ResponseCache()
+    assert cache.get("action", ("q2",), 1) is None
+    cache.set("action", ("q2",), 1, "réponse")
+    assert cache.get("action", ("q2",), 1) == "réponse"
+
+def test_response_cache_is_cleared_on_new_version():
+    cache = ResponseCache()
+    cache.get("action", ("q2",), 1)
+    cache.set("action", ("q2",), 1, "réponse")
+    assert cache.get("action", ("q2",), 2) is None
+    assert cache.get("action", ("q2",), 1) is None
+    assert cache.stats()["size"] == 0
+
+def test_response_rendered_from_old_version_is_not_cached():
+    cache = ResponseCache()
+    cache.get("action", ("q2",), 2)
+    cache.set("action", ("q2",), 1, "réponse périmée")
+    assert cache.get("action", ("q2",), 2) is None
+
+def test_action_response_cached_until_data_reload():
+    adapter = actions.get_esg_adapter()
+    first = run_action(actions.ActionGetParite, {"departement": "marketing"})
+    assert run_action(actions.ActionGetParite, {"departement": "marketing"}) == first
+    assert actions.response_cache.stats()["hits"] >= 1
+    
+    parite = dict(adapter.scraper.parite_data, marketing=0.6)
+    with open(os.path.join(adapter.data_dir, "parite.json"), "w", encoding="utf-8") as f:
+        json.dump(parite, f)
+    adapter.reload_data(["parite.json"])
+    
+    updated = run_action(actions.ActionGetParite, {"departement": "marketing"})
+    assert "60.0%" in updated and updated != first
+
+def test_entities_are_displayed_as_typed():
+    assert "département R&D " in run_action(actions.ActionGetParite, {"departement": "R&D"})
+    assert "département r&d " in run_action(actions.ActionGetParite, {"departement": " r&d "})
+    assert "pour Q2 " in run_action(actions.ActionGetEmissionsCO2, {"periode": "Q2"})
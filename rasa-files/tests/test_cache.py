@@ -0,0 +1,53 @@
+from scraper.cache import TTLCache
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+    
+    def __call__(self):
+        return self.now
+
+def test_entries_expire_after_ttl():
+    clock = FakeClock()
+    cache = TTLCache(ttl=10, clock=clock)
+    cache.set("AAPL", 1)
+    clock.now = 9.9
+    assert cache.get("AAPL") == 1
+    clock.now = 10
+    assert cache.get("AAPL") is None
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 1
+
+def test_least_recently_used_entry_is_evicted():
+    cache = TTLCache(max_entries=2)
+    cache.set("AAPL", 1)
+    cache.set("MSFT", 2)
+    cache.get("AAPL")
+    cache.set("GOOGL", 3)
+    assert "MSFT" not in cache
+    assert "AAPL" in cache and "GOOGL" in cache
+    assert cache.stats()["evictions"] == 1
+
+def test_stale_entries_are_served_within_stale_ttl():
+    clock = FakeClock()
+    cache = TTLCache(ttl=10, stale_ttl=5, clock=clock)
+    cache.set("AAPL", 1)
+    assert cache.get_stale("AAPL") == (1, True)
+    clock.now = 12
+    assert cache.get("AAPL") is None
+    assert cache.get_stale("AAPL") == (1, False)
+    clock.now = 15
+    assert cache.get_stale("AAPL") is None
+    assert cache.stats()["expirations"] == 1
+
+def test_expiring_keys_only_lists_used_entries():
+    clock = FakeClock()
+    cache = TTLCache(ttl=10, clock=clock)
+    cache.set("AAPL", 1)
+    cache.set("MSFT", 2)
+    cache.set("GOOGL", 3, ttl=100)
+    cache.get("AAPL")
+    cache.get("GOOGL")
+    assert cache.expiring_keys(within=5) == []
+    assert cache.expiring_keys(within=20) == ["AAPL"]
+    assert cache.expiring_keys(within=20, min_hits=0) == ["AAPL", "MSFT"]
@@ -0,0 +1,82 @@
+import json
+
+from scraper.checkpoint import CheckpointJournal
+
+def test_resume_reloads_recorded_results(tmp_path):
+    path = str(tmp_path / "journal.jsonl")
+    journal = CheckpointJournal(path)
+    journal.record("AAPL", "msci", {"rating": "AA"})
+    journal.record("AAPL", "cdp", {"score": "A-"})
+    journal.close()
+    
+    journal = CheckpointJournal(path, resume=True)
+    assert journal.results("AAPL") == {"msci": {"rating": "AA"}, "cdp": {"score": "A-"}}
+    assert journal.results("MSFT") == {}
+    journal.close()
+
+def test_truncated_last_line_is_ignored(tmp_path):
+    path = tmp_path / "journal.jsonl"
+    line = json.dumps({"company": "AAPL", "source": "msci", "data": {"rating": "AA"}})
+    path.write_text(line + "\n" + line[:20], encoding="utf-8")
+    
+    journal = CheckpointJournal(str(path), resume=True)
+    assert journal.results("AAPL") == {"msci": {"rating": "AA"}}
+    journal.close()
+
+def test_without_resume_the_journal_is_reset(tmp_path):
+    path = str(tmp_path / "journal.jsonl")
+    journal = CheckpointJournal(path)
+    journal.record("AAPL", "msci", {"rating": "AA"})
+    journal.close()
+    
+    journal = CheckpointJournal(path, resume=False)
+    assert journal.results("AAPL") == {}
+    journal.close()
+    assert (tmp_path / "journal.jsonl").read_text() == ""
+
+def test_results_are_copies(tmp_path):
+    journal = CheckpointJournal(str(tmp_path / "journal.jsonl"))
+    journal.record("AAPL", "msci", {"rating": "AA"})
+    journal.results("AAPL")["cdp"] = {}
+    assert list(journal.results("AAPL")) == ["msci"]
+    journal.close()
+
+def test_record_after_truncated_last_line_survives_resume(tmp_path):
+    """Régression: le premier enregistrement après reprise était accolé à la ligne tronquée"""
+    path = tmp_path / "journal.jsonl"
+    line = json.dumps({"company": "AAPL", "source": "msci", "data": {"rating": "AA"}})
+    path.write_text(line + "\n" + line[:20], encoding="utf-8")
+    
+    journal = CheckpointJournal(str(path), resume=True)
+    journal.record("AAPL", "cdp", {"score": "A-"})
+    journal.close()
+    
+    journal = CheckpointJournal(str(path), resume=True)
+    assert journal.results("AAPL") == {"msci": {"rating": "AA"}, "cdp": {"score": "A-"}}
+    journal.close()
+
+def test_last_line_without_newline_is_kept(tmp_path):
+    path = tmp_path / "journal.jsonl"
+    line = json.dumps({"company": "AAPL", "source": "msci", "data": {"rating": "AA"}})
+    path.write_text(line, encoding="utf-8")
+    
+    journal = CheckpointJournal(str(path), resume=True)
+    journal.record("AAPL", "cdp", {"score": "A-"})
+    journal.close()
+    
+    journal = CheckpointJournal(str(path), resume=True)
+    assert journal.results("AAPL") == {"msci": {"rating": "AA"}, "cdp": {"score": "A-"}}
+    journal.close()
+
+def test_entries_with_missing_keys_are_skipped(tmp_path):
+    path = tmp_path / "journal.jsonl"
+    lines = [
+        json.dumps({"company": "AAPL", "data": {}}),
+        json.dumps(["AAPL", "msci"]),
+        json.dumps({"company": "AAPL", "source": "msci", "data": {"rating": "AA"}})
+    ]
+    path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+    
+    journal = CheckpointJournal(str(path), resume=True)
+    assert journal.results("AAPL") == {"msci": {"rating": "AA"}}
+    journal.close()
@@ -0,0 +1,52 @@
+import csv
+
+from scraper.consolidation import ConsolidationWriter
+
+SOURCE_FIELDS = {"msci": ["esg_rating"], "cdp": ["climate_rating", "water_rating"]}
+
+def read_rows(path):
+    with open(path, encoding="utf-8", newline="") as f:
+        return list(csv.DictReader(f))
+
+def record(source, company, **fields):
+    return {"source": source, "company": company, **fields, "date_extracted": "2024-01-02"}
+
+def test_writes_source_and_combined_files(tmp_path):
+    with ConsolidationWriter(str(tmp_path), SOURCE_FIELDS) as writer:
+        writer.add_company("AAPL", {
+            "msci": record("MSCI", "AAPL", esg_rating="AA"),
+            "cdp": record("CDP", "Apple", climate_rating="A-", water_rating="B")
+        })
+        writer.add_company("MSFT", {"msci": record("MSCI", "MSFT", esg_rating="AAA")})
+    
+    msci = read_rows(writer.source_path("msci"))
+    assert [row["esg_rating"] for row in msci] == ["AA", "AAA"]
+    assert list(msci[0]) == ["source", "company", "esg_rating", "date_extracted"]
+    
+    combined = read_rows(writer.combined_path)
+    assert list(combined[0]) == ["company_symbol", "msci_esg_rating", "cdp_climate_rating", "cdp_water_rating"]
+    assert combined[0]["cdp_water_rating"] == "B"
+    assert combined[1] == {"company_symbol": "MSFT", "msci_esg_rating": "AAA",
+                           "cdp_climate_rating": "", "cdp_water_rating": ""}
+
+def test_error_records_are_left_out(tmp_path):
+    with ConsolidationWriter(str(tmp_path), SOURCE_FIELDS) as writer:
+        writer.add_company("AAPL", {
+            "msci": {"source": "MSCI", "company": "AAPL", "error": "Délai dépassé"},
+            "cdp": record("CDP", "Apple", climate_rating="A-", water_rating="B")
+        })
+    
+    assert not (tmp_path / "consolidated_msci_esg_data.csv").exists()
+    combined = read_rows(writer.combined_path)
+    assert combined[0]["msci_esg_rating"] == ""
+    assert combined[0]["cdp_climate_rating"] == "A-"
+
+def test_rows_are_written_every_chunk(tmp_path):
+    writer = ConsolidationWriter(str(tmp_path), SOURCE_FIELDS, chunk_size=2)
+    for symbol in ["A", "B", "C"]:
+        writer.add_company(symbol, {"msci": record("MSCI", symbol, esg_rating="BBB")})
+    
+    # Le troisième enregistrement reste en tampon jusqu'au prochain bloc
+    assert [row["company_symbol"] for row in read_rows(writer.combined_path)] == ["A", "B"]
+    writer.close()
+    assert [row["company"] for row in read_rows(writer.source_path("msci"))] == ["A", "B", "C"]
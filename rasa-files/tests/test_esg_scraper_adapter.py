@@ -0,0 +1,126 @@
+import json
+import os
+import threading
+import time
+
+import pytest
+
+from scraper.esg_scraper_adapter import ESGScraperAdapter
+from scraper.shared_store import SharedTable
+
+@pytest.fixture
+def make_adapter(tmp_path):
+    adapters = []
+    
+    def make(**kwargs):
+        kwargs.setdefault("hot_reload", False)
+        adapter = ESGScraperAdapter(data_dir=str(tmp_path / "esg_data"), **kwargs)
+        adapters.append(adapter)
+        return adapter
+    
+    yield make
+    for adapter in adapters:
+        adapter.close()
+
+def fake_fetch(adapter, calls=None, delay=0.05):
+    def fetch(company_symbol):
+        if calls is not None:
+            calls.append(company_symbol)
+        time.sleep(delay)
+        company_data = {"msci": {"esg_rating": company_symbol}}
+        adapter._cache_company_data(company_symbol, company_data)
+        return company_data
+    adapter._fetch_company_data = fetch
+
+def write_companies(adapter, companies):
+    with open(os.path.join(adapter.data_dir, "company_esg_data.json"), "w", encoding="utf-8") as f:
+        json.dump(companies, f)
+
+def test_simulated_data_is_not_persisted_over_real_records(make_adapter):
+    """Régression: les données aléatoires des entreprises inconnues remplaçaient les enregistrements réels"""
+    adapter = make_adapter()
+    real = {"source": "MSCI", "company": "ZZZ", "esg_rating": "AAA", "date_extracted": "2024-01-02"}
+    adapter.storage.add("ZZZ", "msci", real)
+    adapter.storage.flush()
+    
+    adapter.get_company_esg_data("ZZZ", force_refresh=True)
+    adapter.get_company_esg_data("UNKNOWN")
+    records = adapter.storage.latest_records()
+    assert records["ZZZ"]["msci"]["esg_rating"] == "AAA"
+    assert "UNKNOWN" not in records
+
+def test_expired_entry_is_served_while_refreshed_in_background(make_adapter):
+    adapter = make_adapter(cache_ttl=0.05, stale_while_revalidate=True, storage_backend="none")
+    refreshed = threading.Event()
+    
+    def fetch(company_symbol):
+        adapter.cache.set(company_symbol, {"msci": {"esg_rating": "AAA"}})
+        refreshed.set()
+    
+    adapter._fetch_company_data = fetch
+    adapter.cache.set("ZZZ", {"msci": {"esg_rating": "BB"}})
+    time.sleep(0.1)
+    assert adapter.get_company_esg_data("ZZZ") == {"msci": {"esg_rating": "BB"}}
+    assert refreshed.wait(2)
+    assert adapter.get_company_esg_data("ZZZ") == {"msci": {"esg_rating": "AAA"}}
+
+def test_reload_evicts_companies_removed_from_file(make_adapter):
+    adapter = make_adapter()
+    companies = dict(adapter.scraper.company_esg_data)
+    assert "MSFT" in adapter.cache
+    
+    del companies["MSFT"]
+    companies["AAPL"] = {"msci": {"esg_rating": "CCC"}}
+    write_companies(adapter, companies)
+    adapter.reload_data(["company_esg_data.json"])
+    
+    assert "MSFT" not in adapter.cache
+    assert adapter.cache.get("AAPL") == {"msci": {"esg_rating": "CCC"}}
+
+def test_batch_lookup_from_io_executor_does_not_deadlock(make_adapter):
+    """Régression: get_companies_esg_data attendait des tâches soumises à son propre exécuteur"""
+    adapter = make_adapter(io_workers=1)
+    fake_fetch(adapter)
+    future = adapter._get_io_executor().submit(adapter.get_companies_esg_data, ["A", "B", "C", "A"])
+    assert list(future.result(timeout=5)) == ["A", "B", "C"]
+
+def test_concurrent_lookups_fetch_each_company_once(make_adapter):
+    adapter = make_adapter()
+    calls = []
+    fake_fetch(adapter, calls)
+    results = adapter.get_companies_esg_data(["X1", "X2", "X1", "X3"])
+    assert sorted(calls) == ["X1", "X2", "X3"]
+    assert results["X2"] == {"msci": {"esg_rating": "X2"}}
+    assert adapter.get_company_esg_data("X1") == results["X1"]
+    assert len(calls) == 3
+
+def test_workers_read_tables_from_shared_store(make_adapter, tmp_path):
+    store = str(tmp_path / "shared.db")
+    refresher = make_adapter(shared_store=store)
+    worker = make_adapter(shared_store=store)
+    assert refresher._is_refresher and not worker._is_refresher
+    assert isinstance(worker.scraper.tables["company_esg_data"], SharedTable)
+    assert worker.get_empreinte_carbone("France", "Allemagne") == {"france": 8200, "allemagne": 10500}
+    
+    companies = dict(refresher.scraper.company_esg_data)
+    del companies["MSFT"]
+    companies["AAPL"] = {"msci": {"esg_rating": "CCC"}}
+    write_companies(refresher, companies)
+    refresher.reload_data(["company_esg_data.json"])
+    version = worker.data_version
+    worker.sync_shared_store()
+    
+    assert worker.data_version > version
+    assert worker.cache.get("AAPL") == {"msci": {"esg_rating": "CCC"}}
+    assert "MSFT" not in worker.cache
+
+def test_company_fetched_by_one_worker_is_served_to_others(make_adapter, tmp_path):
+    store = str(tmp_path / "shared.db")
+    first = make_adapter(shared_store=store, storage_backend="none")
+    second = make_adapter(shared_store=store, storage_backend="none")
+    first.get_company_esg_data("TSLA")
+    
+    def fail(company_symbol):
+        raise AssertionError("extraction inutile")
+    second.scraper.get_company_esg_data = fail
+    assert second.get_company_esg_data("TSLA") == first.get_company_esg_data("TSLA")
@@ -0,0 +1,143 @@
+import threading
+import time
+
+import pytest
+
+from scraper.esg_scraper_real import DEFAULT_PAGE_LOAD_TIMEOUT, SOURCES, ESGScraper, _SourceDeadline
+from scraper.webdriver_pool import WebDriverPool
+
+SOURCE_METHODS = {
+    "msci": "scrape_msci_esg_ratings",
+    "refinitiv": "scrape_refinitiv_esg",
+    "sustainalytics": "scrape_sustainalytics_esg",
+    "bloomberg": "scrape_bloomberg_esg",
+    "cdp": "scrape_cdp_climate_ratings"
+}
+
+@pytest.fixture
+def make_scraper(tmp_path):
+    scrapers = []
+    
+    def make(delay=0.0, calls=None, **kwargs):
+        scraper = ESGScraper(output_dir=str(tmp_path), **kwargs)
+        scrapers.append(scraper)
+        for source, method in SOURCE_METHODS.items():
+            def fetch(arg, source=source):
+                if calls is not None:
+                    calls.append((arg, source))
+                time.sleep(delay)
+                return {"source": source, "company": arg, "date_extracted": "2024-01-02"}
+            setattr(scraper, method, fetch)
+        return scraper
+    
+    yield make
+    for scraper in scrapers:
+        scraper.close()
+
+def errors(results):
+    return [(company, source) for company, data in results.items()
+            for source, record in data.items() if isinstance(record, dict) and "error" in record]
+
+def test_concurrent_sources_take_the_slowest_source_time(make_scraper):
+    scraper = make_scraper(delay=0.2, concurrent=True)
+    start = time.monotonic()
+    data = scraper.scrape_company_esg_data("AAPL")
+    assert time.monotonic() - start < 0.2 * len(SOURCES) / 2
+    assert list(data) == SOURCES
+    assert not errors({"AAPL": data})
+
+def test_slow_source_times_out_without_blocking_others(make_scraper):
+    scraper = make_scraper(concurrent=True, source_timeouts={"cdp": 0.2})
+    release = threading.Event()
+    scraper.scrape_cdp_climate_ratings = lambda arg: release.wait(2) and {}
+    start = time.monotonic()
+    data = scraper.scrape_company_esg_data("AAPL")
+    release.set()
+    assert time.monotonic() - start < 1
+    assert "error" in data["cdp"]
+    assert all("error" not in data[source] for source in SOURCES if source != "cdp")
+
+def test_queued_sources_do_not_time_out_before_they_start(make_scraper):
+    """Régression: le délai d'une source démarrait à sa soumission, pas à son exécution"""
+    scraper = make_scraper(delay=0.2, concurrent=True, pool_size=4,
+                           source_timeouts={source: 0.6 for source in SOURCES})
+    results = scraper.scrape_multiple_companies([f"C{i}" for i in range(8)], keep_results=True)
+    assert errors(results) == []
+
+def test_rate_limiter_waits_are_not_counted_in_source_timeout(make_scraper):
+    """Régression: l'attente d'un jeton du limiteur de débit consommait le délai de la source"""
+    scraper = make_scraper(concurrent=True, pool_size=3, source_timeouts={source: 0.3 for source in SOURCES},
+                           rate_limits={"bloomberg.com": (5, 1)})
+    
+    def bloomberg(arg):
+        scraper.rate_limiter.acquire("https://www.bloomberg.com/profile")
+        time.sleep(0.02)
+        return {"source": "Bloomberg", "company": arg}
+    
+    scraper.scrape_bloomberg_esg = bloomberg
+    results = scraper.scrape_multiple_companies([f"C{i}" for i in range(6)], keep_results=True)
+    assert errors(results) == []
+
+def test_results_are_streamed_by_default(make_scraper):
+    scraper = make_scraper()
+    assert scraper.scrape_multiple_companies([("AAPL", "Apple")]) is None
+    assert set(scraper.storage.read_company("AAPL")) == set(SOURCES)
+
+def test_resume_skips_journaled_sources(make_scraper, tmp_path):
+    journal_path = str(tmp_path / "journal.jsonl")
+    calls = []
+    scraper = make_scraper(calls=calls)
+    scraper.scrape_multiple_companies([("AAPL", "Apple")], journal_path=journal_path)
+    assert len(calls) == len(SOURCES)
+    
+    calls.clear()
+    results = scraper.scrape_multiple_companies([("AAPL", "Apple"), ("MSFT", "Microsoft")],
+                                                journal_path=journal_path, resume=True, keep_results=True)
+    assert {company for company, _ in calls} == {"MSFT", "Microsoft"}
+    assert list(results) == ["AAPL", "MSFT"]
+    assert results["AAPL"]["msci"]["company"] == "AAPL"
+
+def test_deadline_not_started_has_its_full_timeout():
+    """Régression: remaining() levait TypeError pour une tâche annulée avant de démarrer"""
+    assert _SourceDeadline(5).remaining() == 5
+    assert _SourceDeadline(None).remaining() is None
+
+def test_http_request_is_bounded_by_the_source_timeout(make_scraper):
+    scraper = make_scraper(concurrent=True, http_timeout=15, source_timeouts={"refinitiv": 2})
+    del scraper.scrape_refinitiv_esg
+    timeouts = []
+    
+    def get(url, timeout=None):
+        timeouts.append(timeout)
+        raise ConnectionError("hors ligne")
+    
+    scraper.http.get = get
+    data = scraper.scrape_company_esg_data("AAPL", sources=["refinitiv"])
+    assert "error" in data["refinitiv"]
+    assert len(timeouts) == 1 and 0 < timeouts[0] <= 2
+
+class FakeDriver:
+    def __init__(self):
+        self.page_load_timeouts = []
+    
+    def set_page_load_timeout(self, seconds):
+        self.page_load_timeouts.append(seconds)
+    
+    def get(self, url):
+        raise TimeoutError("page trop lente")
+    
+    def quit(self):
+        pass
+
+@pytest.mark.parametrize("concurrent, limit", [(True, 3), (False, DEFAULT_PAGE_LOAD_TIMEOUT)])
+def test_page_load_is_bounded_by_the_source_timeout(make_scraper, concurrent, limit):
+    scraper = make_scraper(concurrent=concurrent, source_timeouts={"msci": 3})
+    del scraper.scrape_msci_esg_ratings
+    driver = FakeDriver()
+    scraper.driver_pool.close()
+    scraper.driver_pool = WebDriverPool(lambda: driver, max_memory_mb=0)
+    data = scraper.scrape_company_esg_data("AAPL", sources=["msci"])
+    assert "error" in data["msci"]
+    assert len(driver.page_load_timeouts) == 1
+    assert 0 < driver.page_load_timeouts[0] <= limit
+    assert driver.page_load_timeouts[0] > limit - 1
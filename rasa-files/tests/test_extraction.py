@@ -0,0 +1,51 @@
+from scraper.extraction import ExtractionSpec, FieldSpec
+
+PAGE = """
+<html><body>
+  <div class="header">MSCI</div>
+  <div class="esg-rating highlight">AA</div>
+  <div class="esg-rating">BBB</div>
+  <span class="env-score">7.5</span>
+  <span class="soc-score">n/a</span>
+</body></html>
+"""
+
+def make_spec():
+    return ExtractionSpec([
+        FieldSpec("rating", ".esg-rating"),
+        FieldSpec("environmental_score", ".env-score", type=float),
+        FieldSpec("social_score", ".soc-score", type=float, default=None),
+        FieldSpec("governance_score", ".gov-score", type=float, default=0.0)
+    ])
+
+def test_extracts_first_match_with_types_and_defaults():
+    assert make_spec().parse_and_extract(PAGE) == {
+        "rating": "AA",
+        "environmental_score": 7.5,
+        "social_score": None,
+        "governance_score": 0.0
+    }
+
+def test_field_names_and_selectors_follow_spec_order():
+    spec = make_spec()
+    assert spec.field_names == ["rating", "environmental_score", "social_score", "governance_score"]
+    assert spec.selectors[0] == ".esg-rating"
+
+def test_partial_and_full_parse_agree():
+    spec = make_spec()
+    assert spec.parse_and_extract(PAGE, partial=True) == spec.parse_and_extract(PAGE, partial=False)
+
+def test_partial_parse_keeps_only_targeted_nodes():
+    soup = make_spec().parse(PAGE)
+    assert soup.find(class_="header") is None
+    assert soup.find(class_="esg-rating") is not None
+
+def test_partial_parse_falls_back_to_full_document():
+    spec = ExtractionSpec([FieldSpec("rating", ".absent")])
+    soup = spec.parse(PAGE)
+    assert soup.find(class_="header") is not None
+
+def test_complex_selectors_disable_partial_parse():
+    spec = ExtractionSpec([FieldSpec("rating", "div.esg-rating"), FieldSpec("score", "span.env-score", type=float)])
+    assert spec._strainer is None
+    assert spec.parse_and_extract(PAGE) == {"rating": "AA", "score": 7.5}
@@ -0,0 +1,48 @@
+import threading
+import time
+
+import pytest
+
+from scraper import file_watcher
+from scraper.file_watcher import FileWatcher
+
+@pytest.fixture(params=["polling", "inotify"])
+def watch(request, tmp_path, monkeypatch):
+    if request.param == "polling":
+        monkeypatch.setattr(file_watcher, "INotify", None)
+    elif file_watcher.INotify is None:
+        pytest.skip("inotify_simple n'est pas installé")
+    calls = []
+    notified = threading.Event()
+    
+    def callback(changed):
+        calls.append(changed)
+        notified.set()
+    
+    watcher = FileWatcher(str(tmp_path), ["a.json", "b.json"], callback, interval=0.05, debounce=0.3)
+    watcher.start()
+    yield tmp_path, calls, notified
+    watcher.stop()
+
+def test_successive_writes_are_debounced_into_one_callback(watch):
+    directory, calls, notified = watch
+    (directory / "a.json").write_text("{}")
+    time.sleep(0.1)
+    (directory / "b.json").write_text("{}")
+    assert notified.wait(2)
+    time.sleep(0.4)
+    assert calls == [{"a.json", "b.json"}]
+
+def test_unwatched_files_are_ignored(watch):
+    directory, calls, notified = watch
+    (directory / "other.json").write_text("{}")
+    assert not notified.wait(0.5)
+    assert calls == []
+
+def test_atomic_replace_is_detected(watch):
+    directory, calls, notified = watch
+    tmp_file = directory / "a.json.tmp"
+    tmp_file.write_text('{"global": 0.5}')
+    tmp_file.replace(directory / "a.json")
+    assert notified.wait(2)
+    assert calls == [{"a.json"}]
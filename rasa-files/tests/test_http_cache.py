@@ -0,0 +1,101 @@
+import threading
+
+import pytest
+
+from scraper.http_cache import CachedHTTPClient, HTTPCache
+
+class FakeResponse:
+    def __init__(self, status_code, text="", headers=None):
+        self.status_code = status_code
+        self.text = text
+        self.headers = headers or {}
+    
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise RuntimeError(f"HTTP {self.status_code}")
+
+@pytest.fixture
+def client(tmp_path):
+    client = CachedHTTPClient(str(tmp_path / "http_cache"))
+    client.requests = []
+    client.responses = []
+    
+    def get(url, headers=None, timeout=None):
+        client.requests.append(headers)
+        return client.responses.pop(0)
+    
+    client.session.get = get
+    yield client
+    client.close()
+
+URL = "https://example.org/esg"
+
+def test_first_response_is_cached_with_validators(client):
+    client.responses.append(FakeResponse(200, "<p>AA</p>", {"ETag": '"v1"'}))
+    response = client.get(URL)
+    assert not response.not_modified
+    assert response.text == "<p>AA</p>"
+    assert client.requests == [{}]
+    assert client.cache.get(URL)["etag"] == '"v1"'
+
+def test_not_modified_reuses_body_and_parsed_data(client):
+    client.responses.append(FakeResponse(200, "<p>AA</p>", {"ETag": '"v1"', "Last-Modified": "Mon, 01 Jan 2024 00:00:00 GMT"}))
+    client.get(URL)
+    client.store_parsed(URL, {"rating": "AA"})
+    
+    client.responses.append(FakeResponse(304))
+    response = client.get(URL)
+    assert client.requests[1] == {"If-None-Match": '"v1"', "If-Modified-Since": "Mon, 01 Jan 2024 00:00:00 GMT"}
+    assert response.not_modified
+    assert response.status_code == 304
+    assert response.parsed == {"rating": "AA"}
+    assert response.text == "<p>AA</p>"
+
+def test_response_without_validators_is_not_cached(client):
+    client.responses.append(FakeResponse(200, "<p>A</p>"))
+    client.get(URL)
+    assert client.cache.get(URL) is None
+    
+    client.responses.append(FakeResponse(200, "<p>B</p>"))
+    assert client.get(URL).text == "<p>B</p>"
+    assert client.requests == [{}, {}]
+
+def test_changed_page_replaces_cache_entry(client):
+    client.responses.append(FakeResponse(200, "<p>A</p>", {"ETag": '"v1"'}))
+    client.get(URL)
+    client.store_parsed(URL, {"rating": "A"})
+    
+    client.responses.append(FakeResponse(200, "<p>B</p>", {"ETag": '"v2"'}))
+    response = client.get(URL)
+    assert response.text == "<p>B</p>"
+    entry = client.cache.get(URL)
+    assert entry["etag"] == '"v2"'
+    assert entry["parsed"] is None
+
+def test_unreadable_entry_is_ignored(tmp_path):
+    cache = HTTPCache(str(tmp_path))
+    cache.put(URL, "<p>A</p>", etag='"v1"')
+    meta_path, _ = cache._paths(URL)
+    with open(meta_path, "w") as f:
+        f.write("{tronqué")
+    assert cache.get(URL) is None
+
+def test_store_parsed_does_not_overwrite_a_concurrent_put(tmp_path, monkeypatch):
+    """Régression: store_parsed relisait les métadonnées hors du verrou de put()"""
+    cache = HTTPCache(str(tmp_path))
+    cache.put(URL, "<p>A</p>", etag='"v1"')
+    read = cache.get
+    writer = threading.Thread(target=cache.put, args=(URL, "<p>B</p>", '"v2"'))
+    
+    def get_then_put(url):
+        meta = read(url)
+        # Une autre requête enregistre une nouvelle version pendant la lecture
+        writer.start()
+        writer.join(0.2)
+        return meta
+    
+    monkeypatch.setattr(cache, "get", get_then_put)
+    cache.store_parsed(URL, {"rating": "A"})
+    writer.join()
+    monkeypatch.undo()
+    assert cache.get(URL)["etag"] == '"v2"'
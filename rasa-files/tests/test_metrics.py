@@ -0,0 +1,61 @@
+import urllib.error
+import urllib.request
+
+import pytest
+
+from scraper.metrics import MetricsRegistry, start_metrics_server
+
+def test_counter_and_gauge_are_rendered_with_labels():
+    registry = MetricsRegistry()
+    requests = registry.counter("esg_requests_total", "Requêtes", labels=("action",))
+    requests.inc(action="emissions")
+    requests.inc(2, action="emissions")
+    registry.gauge("esg_cache_entries", "Entrées du cache", function=lambda: 3)
+    
+    assert requests.value(action="emissions") == 3
+    text = registry.render()
+    assert "# TYPE esg_requests_total counter" in text
+    assert 'esg_requests_total{action="emissions"} 3' in text
+    assert "esg_cache_entries 3" in text
+
+def test_histogram_buckets_are_cumulative():
+    registry = MetricsRegistry()
+    latency = registry.histogram("esg_latency_seconds", "Latence", buckets=(0.1, 1))
+    for value in (0.05, 0.5, 5):
+        latency.observe(value)
+    
+    text = registry.render()
+    assert 'esg_latency_seconds_bucket{le="0.1"} 1' in text
+    assert 'esg_latency_seconds_bucket{le="1"} 2' in text
+    assert 'esg_latency_seconds_bucket{le="+Inf"} 3' in text
+    assert "esg_latency_seconds_count 3" in text
+    assert registry.snapshot()["esg_latency_seconds"][0]["value"]["sum"] == pytest.approx(5.55)
+
+def test_metric_names_are_unique_per_type():
+    registry = MetricsRegistry()
+    assert registry.counter("esg_total", "Total") is registry.counter("esg_total", "Total")
+    with pytest.raises(ValueError):
+        registry.gauge("esg_total", "Total")
+    with pytest.raises(ValueError):
+        registry.counter("esg_labelled_total", "Total", labels=("source",)).inc(reason="timeout")
+
+def test_failing_gauge_function_is_skipped():
+    registry = MetricsRegistry()
+    registry.gauge("esg_broken", "Jauge en échec", function=lambda: 1 / 0)
+    registry.counter("esg_ok_total", "Total").inc()
+    assert "esg_ok_total 1" in registry.render()
+    assert registry.snapshot()["esg_broken"] == []
+
+def test_server_exposes_registry_on_localhost():
+    registry = MetricsRegistry()
+    registry.counter("esg_served_total", "Total").inc()
+    server = start_metrics_server(port=0, registry=registry)
+    try:
+        assert server.server.server_address[0] == "127.0.0.1"
+        with urllib.request.urlopen(f"http://127.0.0.1:{server.port}/metrics", timeout=5) as response:
+            assert "text/plain" in response.headers["Content-Type"]
+            assert "esg_served_total 1" in response.read().decode("utf-8")
+        with pytest.raises(urllib.error.HTTPError):
+            urllib.request.urlopen(f"http://127.0.0.1:{server.port}/autre", timeout=5)
+    finally:
+        server.stop()
@@ -0,0 +1,59 @@
+import asyncio
+import os
+import pstats
+
+from scraper.profiling import Profiler, method_tag, sanitize_tag
+
+def tag(fn, *args, **kwargs):
+    return f"{fn.__name__},{','.join(map(str, args))}"
+
+def profiles(directory):
+    return sorted(name for name in os.listdir(directory) if name.endswith(".prof")) if os.path.isdir(directory) else []
+
+def test_disabled_profiler_writes_nothing(tmp_path):
+    profiler = Profiler(enabled=False, sample_rate=1, output_dir=str(tmp_path / "profiles"))
+    assert profiler.profile(tag)(lambda x: x * 2)(21) == 42
+    assert profiles(str(tmp_path / "profiles")) == []
+
+def test_sampled_calls_are_dumped_with_their_tag(tmp_path):
+    output_dir = str(tmp_path / "profiles")
+    profiler = Profiler(enabled=True, sample_rate=1, output_dir=output_dir)
+    
+    @profiler.profile(tag)
+    def lookup(company):
+        return sorted(company)
+    
+    assert lookup("AAPL") == ["A", "A", "L", "P"]
+    names = profiles(output_dir)
+    assert len(names) == 1 and "_lookup,AAPL_" in names[0]
+    assert pstats.Stats(os.path.join(output_dir, names[0])).total_calls > 0
+
+def test_coroutines_are_profiled(tmp_path):
+    output_dir = str(tmp_path / "profiles")
+    profiler = Profiler(enabled=True, sample_rate=1, output_dir=output_dir)
+    
+    @profiler.profile(tag)
+    async def run(company):
+        await asyncio.sleep(0)
+        return company
+    
+    assert asyncio.run(run("MSFT")) == "MSFT"
+    assert len(profiles(output_dir)) == 1
+
+def test_only_the_most_recent_files_are_kept(tmp_path):
+    output_dir = str(tmp_path / "profiles")
+    profiler = Profiler(enabled=True, sample_rate=1, output_dir=output_dir, max_files=2)
+    profiled = profiler.profile(tag)(lambda company: company)
+    for company in ["A", "B", "C"]:
+        profiled(company)
+    assert len(profiles(output_dir)) == 2
+
+def test_tags_are_safe_file_names():
+    class ActionGetParite:
+        def run(self, departement, periode=None):
+            pass
+    
+    label = method_tag(ActionGetParite.run, ActionGetParite(), "R&D", periode="Q2 2024")
+    assert label == "ActionGetParite.run,R&D,periode=Q2 2024"
+    assert sanitize_tag(label) == "ActionGetParite.run,R-D,periode=Q2-2024"
+    assert sanitize_tag("///") == "appel"
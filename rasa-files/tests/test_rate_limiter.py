@@ -0,0 +1,66 @@
+import time
+
+import pytest
+
+from scraper.rate_limiter import HostRateLimiter, TokenBucket
+
+def test_bucket_allows_burst_then_spaces_requests():
+    bucket = TokenBucket(rate=10, burst=2)
+    assert bucket.reserve() == 0
+    assert bucket.reserve() == 0
+    assert bucket.reserve() == pytest.approx(0.1, abs=0.02)
+
+def test_throttle_halves_rate_and_honours_retry_after():
+    bucket = TokenBucket(rate=2, burst=1, min_rate=0.5)
+    bucket.throttle(retry_after=0.5)
+    assert bucket.rate == 1
+    assert bucket.reserve() >= 0.45
+    bucket.throttle()
+    bucket.throttle()
+    assert bucket.rate == 0.5
+
+def test_recover_restores_base_rate_progressively():
+    bucket = TokenBucket(rate=1, burst=1)
+    bucket.throttle()
+    bucket.recover()
+    assert 0.5 < bucket.rate < 1
+    for _ in range(10):
+        bucket.recover()
+    assert bucket.rate == 1
+
+def test_subdomains_share_the_configured_bucket():
+    limiter = HostRateLimiter()
+    assert limiter.bucket("https://www.msci.com/a") is limiter.bucket("https://msci.com/b")
+    assert limiter.bucket("https://example.org/") is not limiter.bucket("https://msci.com/")
+    assert limiter.bucket("https://example.org/").rate == limiter.default_rate
+
+def test_report_throttles_on_429_only():
+    limiter = HostRateLimiter(limits={"example.org": (4, 1)})
+    limiter.report("https://example.org/", 200)
+    assert limiter.bucket("https://example.org/").rate == 4
+    limiter.report("https://example.org/", 429, retry_after="1")
+    bucket = limiter.bucket("https://example.org/")
+    assert bucket.rate == 2
+    assert bucket.blocked_until > time.monotonic()
+
+@pytest.mark.parametrize("value, expected", [("3", 3.0), ("-1", 0.0), (None, None), ("demain", None)])
+def test_parse_retry_after(value, expected):
+    assert HostRateLimiter._parse_retry_after(value) == expected
+
+def test_waits_are_reported_to_listener():
+    limiter = HostRateLimiter(limits={"example.org": (20, 1)})
+    waits = []
+    with limiter.waits_reported_to(waits.append):
+        limiter.acquire("https://example.org/")
+        limiter.acquire("https://example.org/")
+    limiter.acquire("https://example.org/")
+    assert len(waits) == 1
+    assert waits[0] == pytest.approx(0.05, abs=0.02)
+
+def test_throttle_log_reports_the_clamped_rate(caplog):
+    """Régression: le journal annonçait rate / 2 même sous le plancher min_rate"""
+    limiter = HostRateLimiter(limits={"example.org": (0.08, 1)})
+    with caplog.at_level("WARNING", logger="scraper.rate_limiter"):
+        limiter.report("https://example.org/a", 429)
+    assert limiter.bucket("https://example.org/a").rate == 0.05
+    assert "ralentissement à 0.05 req/s" in caplog.text
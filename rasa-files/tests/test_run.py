@@ -0,0 +1,82 @@
+import os
+
+import pytest
+
+import run
+
+@pytest.fixture
+def project(tmp_path, monkeypatch):
+    monkeypatch.setattr(run, "PROJECT_DIR", str(tmp_path))
+    monkeypatch.setattr(run, "MODELS_DIR", str(tmp_path / "models"))
+    monkeypatch.setattr(run, "rasa_version", lambda: "3.6.0")
+    (tmp_path / "models").mkdir()
+    (tmp_path / "data").mkdir()
+    for name, content in {
+        "config.yml": "pipeline: []\n",
+        "domain.yml": "intents: [greet]\n",
+        "data/nlu.yml": "nlu: []\n",
+        "data/stories.yml": "stories: []\n"
+    }.items():
+        (tmp_path / name).write_text(content)
+    return tmp_path
+
+@pytest.fixture
+def commands(monkeypatch):
+    commands = []
+    
+    def fake_run(command, cwd=None, check=False):
+        commands.append(command)
+        fingerprint = command[command.index("--fixed-model-name") + 1]
+        open(os.path.join(run.MODELS_DIR, f"{fingerprint}.tar.gz"), "w").close()
+    
+    monkeypatch.setattr(run.subprocess, "run", fake_run)
+    return commands
+
+def test_training_files_cover_config_domain_and_data(project):
+    assert run.training_files() == ["config.yml", "data/nlu.yml", "data/stories.yml", "domain.yml"]
+    assert run.training_files("config.fast.yml")[0] == "config.fast.yml"
+
+def test_fingerprint_changes_with_files_and_rasa_version(project, monkeypatch):
+    fingerprint = run.compute_fingerprint()
+    assert run.compute_fingerprint() == fingerprint
+    (project / "data" / "stories.yml").write_text("stories: [happy]\n")
+    changed = run.compute_fingerprint()
+    assert changed != fingerprint
+    monkeypatch.setattr(run, "rasa_version", lambda: "3.6.1")
+    assert run.compute_fingerprint() != changed
+
+def test_existing_model_is_reused(project, commands):
+    path = run.train_model()
+    assert commands and "--finetune" not in commands[0]
+    assert run.train_model() == path
+    assert len(commands) == 1
+
+def test_nlu_only_change_finetunes_previous_model(project, commands):
+    base_model = run.train_model()
+    (project / "data" / "nlu.yml").write_text("nlu: [bonjour]\n")
+    assert run.find_finetune_base(run.training_file_hashes()) == base_model
+    
+    run.train_model(epoch_fraction=0.3)
+    command = commands[-1]
+    assert command[command.index("--finetune") + 1] == base_model
+    assert command[command.index("--epoch-fraction") + 1] == "0.3"
+
+@pytest.mark.parametrize("changed_file", ["domain.yml", "data/stories.yml", "config.yml"])
+def test_other_changes_require_full_training(project, commands, changed_file):
+    run.train_model()
+    (project / changed_file).write_text("modifié: true\n")
+    assert run.find_finetune_base(run.training_file_hashes()) is None
+
+def test_finetune_requires_same_rasa_version(project, commands, monkeypatch):
+    run.train_model()
+    (project / "data" / "nlu.yml").write_text("nlu: [bonjour]\n")
+    monkeypatch.setattr(run, "rasa_version", lambda: "3.7.0")
+    assert run.find_finetune_base(run.training_file_hashes()) is None
+
+def test_force_and_no_finetune_train_fully(project, commands):
+    run.train_model()
+    (project / "data" / "nlu.yml").write_text("nlu: [bonjour]\n")
+    run.train_model(finetune=False)
+    run.train_model(force=True)
+    assert all("--finetune" not in command for command in commands)
+    assert [command for command in commands if "--force" in command] == [commands[-1]]
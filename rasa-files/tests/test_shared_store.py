@@ -0,0 +1,74 @@
+import time
+
+import pytest
+
+from scraper.shared_store import SharedESGStore, SharedTable
+
+@pytest.fixture
+def path(tmp_path):
+    return str(tmp_path / "shared.db")
+
+@pytest.fixture
+def store(path):
+    store = SharedESGStore(path)
+    yield store
+    store.close()
+
+@pytest.fixture
+def other(path):
+    store = SharedESGStore(path)
+    yield store
+    store.close()
+
+def test_single_refresher_until_lease_expires(store, other):
+    assert store.acquire_refresher("a", lease=0.2)
+    assert not other.acquire_refresher("b", lease=0.2)
+    assert store.acquire_refresher("a", lease=0.2)
+    time.sleep(0.3)
+    assert other.acquire_refresher("b", lease=0.2)
+    assert not store.acquire_refresher("a", lease=0.2)
+
+def test_released_lease_is_taken_immediately(store, other):
+    assert store.acquire_refresher("a", lease=60)
+    other.release_refresher("a")
+    assert other.acquire_refresher("b", lease=60)
+    store.release_refresher("a")
+    assert not store.acquire_refresher("a", lease=60)
+
+def test_publish_only_bumps_version_on_change(store):
+    assert store.data_version() == 0
+    assert store.publish_tables({"parite_data": {"global": 0.42}}) == 1
+    assert store.publish_tables({"parite_data": {"global": 0.42}}) == 1
+    assert store.publish_tables({"parite_data": {"global": 0.5}}) == 2
+
+def test_changed_rows_include_removals(store, other):
+    store.publish_tables({"company_esg_data": {"AAPL": {"msci": "AA"}, "MSFT": {"msci": "AAA"}}})
+    store.publish_tables({"company_esg_data": {"AAPL": {"msci": "A"}, "TSLA": {"msci": "BBB"}}})
+    assert other.changed_tables(since=1) == {"company_esg_data"}
+    assert sorted(other.changed_rows("company_esg_data", since=1)) == [
+        ("AAPL", {"msci": "A"}), ("MSFT", None), ("TSLA", {"msci": "BBB"})
+    ]
+    assert other.changed_rows("company_esg_data", since=2) == []
+
+def test_shared_table_reads_rows_on_demand(store, other):
+    store.publish_tables({"empreinte_carbone": {"france": 8200, "allemagne": 10500}})
+    table = SharedTable(other, "empreinte_carbone")
+    assert table["france"] == 8200
+    assert "espagne" not in table
+    assert table.get("espagne", 0) == 0
+    assert table.items() == [("france", 8200), ("allemagne", 10500)]
+    assert len(table) == 2
+    
+    store.publish_tables({"empreinte_carbone": {"france": 8000}})
+    assert dict(table.items()) == {"france": 8000}
+
+def test_views_of_the_same_store_are_not_republished(store):
+    store.publish_tables({"parite_data": {"global": 0.42}})
+    assert store.publish_tables({"parite_data": SharedTable(store, "parite_data")}) == 1
+
+def test_companies_are_shared_with_their_age(store, other):
+    store.put_company("AAPL", {"msci": {"esg_rating": "AA"}}, updated_at=time.time() - 60)
+    data, age = other.get_company("AAPL")
+    assert data == {"msci": {"esg_rating": "AA"}}
+    assert 59 <= age < 70
+    assert other.get_company("MSFT") is None
@@ -0,0 +1,90 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from scraper.singleflight import SingleFlight
+
+def test_concurrent_calls_share_one_execution():
+    flight = SingleFlight()
+    calls = []
+    
+    def fetch(key):
+        calls.append(key)
+        time.sleep(0.1)
+        return key.lower()
+    
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        results = list(executor.map(lambda _: flight.do("AAPL", fetch, "AAPL"), range(8)))
+    assert results == ["aapl"] * 8
+    assert calls == ["AAPL"]
+    assert flight.in_flight() == []
+
+def test_exception_is_shared_and_key_released():
+    flight = SingleFlight()
+    started = threading.Event()
+    
+    def fail():
+        started.set()
+        time.sleep(0.1)
+        raise RuntimeError("extraction impossible")
+    
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        leader = executor.submit(flight.do, "AAPL", fail)
+        started.wait()
+        follower = executor.submit(flight.do, "AAPL", lambda: "jamais appelé")
+        for future in (leader, follower):
+            with pytest.raises(RuntimeError):
+                future.result()
+    assert flight.in_flight() == []
+    assert flight.do("AAPL", lambda: "ok") == "ok"
+
+def test_async_and_thread_callers_share_the_call():
+    flight = SingleFlight()
+    calls = []
+    
+    def fetch():
+        calls.append(1)
+        time.sleep(0.1)
+        return "AA"
+    
+    async def main():
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            first = asyncio.ensure_future(flight.do_async("AAPL", fetch, executor=executor))
+            await asyncio.sleep(0.02)
+            thread_result = await asyncio.get_running_loop().run_in_executor(None, flight.do, "AAPL", fetch)
+            return await first, thread_result
+    
+    assert asyncio.run(main()) == ("AA", "AA")
+    assert calls == [1]
+
+def test_cancelled_async_caller_does_not_cancel_shared_call():
+    flight = SingleFlight()
+    
+    def fetch():
+        time.sleep(0.1)
+        return "AA"
+    
+    async def main():
+        first = asyncio.ensure_future(flight.do_async("AAPL", fetch))
+        second = asyncio.ensure_future(flight.do_async("AAPL", fetch))
+        await asyncio.sleep(0.02)
+        first.cancel()
+        return await second
+    
+    assert asyncio.run(main()) == "AA"
+
+def test_key_released_when_executor_rejects_the_call():
+    flight = SingleFlight()
+    executor = ThreadPoolExecutor(max_workers=1)
+    executor.shutdown()
+    
+    async def main():
+        with pytest.raises(RuntimeError):
+            await flight.do_async("AAPL", lambda: "AA", executor=executor)
+        assert flight.in_flight() == []
+        return await flight.do_async("AAPL", lambda: "AA")
+    
+    assert asyncio.run(main()) == "AA"
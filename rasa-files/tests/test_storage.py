@@ -0,0 +1,59 @@
+import pytest
+
+from scraper.storage import STORAGE_BACKENDS, SQLiteStorage, create_storage
+
+def record(rating, date="2024-01-02"):
+    return {"source": "MSCI", "esg_rating": rating, "date_extracted": date}
+
+def error_record(date="2024-01-02"):
+    return {"source": "MSCI", "error": "Délai dépassé", "date_extracted": date}
+
+@pytest.fixture(params=sorted(STORAGE_BACKENDS))
+def storage(request, tmp_path):
+    if request.param == "parquet":
+        pytest.importorskip("pyarrow")
+    storage = create_storage(request.param, str(tmp_path))
+    yield storage
+    storage.close()
+
+def test_round_trip(storage):
+    storage.add("AAPL", "msci", record("AA"))
+    storage.add("MSFT", "msci", record("AAA"))
+    storage.flush()
+    assert storage.read_company("AAPL") == {"msci": record("AA")}
+    assert set(storage.latest_records()) == {"AAPL", "MSFT"}
+
+def test_filters_by_symbol_and_source(storage):
+    storage.add("AAPL", "msci", record("AA"))
+    storage.add("AAPL", "cdp", {"source": "CDP", "climate_score": "A", "date_extracted": "2024-01-02"})
+    storage.add("MSFT", "msci", record("AAA"))
+    storage.flush()
+    assert storage.latest_records(["AAPL"], ["cdp"]) == {
+        "AAPL": {"cdp": {"source": "CDP", "climate_score": "A", "date_extracted": "2024-01-02"}}
+    }
+
+def test_unknown_backend_is_rejected(tmp_path):
+    with pytest.raises(ValueError):
+        create_storage("mongodb", str(tmp_path))
+
+@pytest.fixture
+def sqlite_storage(tmp_path):
+    storage = SQLiteStorage(str(tmp_path), batch_size=1)
+    yield storage
+    storage.close()
+
+def test_sqlite_keeps_latest_valid_record(sqlite_storage):
+    sqlite_storage.add("AAPL", "msci", record("A", "2024-01-01"))
+    sqlite_storage.add("AAPL", "msci", record("AA", "2024-01-02"))
+    sqlite_storage.add("AAPL", "msci", error_record("2024-01-03"))
+    assert sqlite_storage.read_company("AAPL") == {"msci": record("AA", "2024-01-02")}
+
+def test_sqlite_error_does_not_overwrite_same_day_record(sqlite_storage):
+    sqlite_storage.add("AAPL", "msci", record("AA"))
+    sqlite_storage.add("AAPL", "msci", error_record())
+    assert sqlite_storage.read_company("AAPL") == {"msci": record("AA")}
+
+def test_sqlite_valid_record_replaces_same_day_error(sqlite_storage):
+    sqlite_storage.add("AAPL", "msci", error_record())
+    sqlite_storage.add("AAPL", "msci", record("AA"))
+    assert sqlite_storage.read_company("AAPL") == {"msci": record("AA")}
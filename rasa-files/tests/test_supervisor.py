@@ -0,0 +1,90 @@
+import socket
+import threading
+import time
+
+import pytest
+
+from supervisor import RoundRobinProxy
+
+def start_backend(name):
+    """Serveur qui lit la requête jusqu'à la demi-fermeture, puis répond"""
+    server = socket.socket()
+    server.bind(("127.0.0.1", 0))
+    server.listen()
+    
+    def handle(connection):
+        with connection:
+            request = b""
+            while True:
+                data = connection.recv(1024)
+                if not data:
+                    break
+                request += data
+            time.sleep(0.05)
+            connection.sendall(name + b":" + request)
+    
+    def serve():
+        while True:
+            try:
+                connection, _ = server.accept()
+            except OSError:
+                return
+            threading.Thread(target=handle, args=(connection,), daemon=True).start()
+    
+    threading.Thread(target=serve, daemon=True).start()
+    return server
+
+def request(port, payload):
+    with socket.create_connection(("127.0.0.1", port)) as client:
+        client.sendall(payload)
+        client.shutdown(socket.SHUT_WR)
+        response = b""
+        while True:
+            data = client.recv(1024)
+            if not data:
+                return response
+            response += data
+
+@pytest.fixture
+def backends():
+    servers = [start_backend(b"a"), start_backend(b"b")]
+    yield [server.getsockname()[1] for server in servers]
+    for server in servers:
+        server.close()
+
+@pytest.fixture
+def proxy(backends):
+    proxy = RoundRobinProxy("127.0.0.1", 0, lambda: backends)
+    proxy.start()
+    yield proxy
+    proxy.stop()
+
+def proxy_port(proxy):
+    return proxy._server.sockets[0].getsockname()[1]
+
+def test_reply_after_client_half_close_is_relayed(proxy):
+    assert request(proxy_port(proxy), b"ping") in (b"a:ping", b"b:ping")
+
+def test_connections_alternate_between_backends(proxy):
+    responses = {request(proxy_port(proxy), b"x") for _ in range(4)}
+    assert responses == {b"a:x", b"b:x"}
+
+def test_unreachable_backend_is_skipped(backends):
+    unused = socket.socket()
+    unused.bind(("127.0.0.1", 0))
+    closed_port = unused.getsockname()[1]
+    unused.close()
+    proxy = RoundRobinProxy("127.0.0.1", 0, lambda: [closed_port, backends[0]])
+    proxy.start()
+    try:
+        assert all(request(proxy_port(proxy), b"x") == b"a:x" for _ in range(3))
+    finally:
+        proxy.stop()
+
+def test_stop_closes_open_connections(proxy):
+    idle = socket.create_connection(("127.0.0.1", proxy_port(proxy)))
+    time.sleep(0.1)
+    proxy.stop()
+    idle.settimeout(2)
+    assert idle.recv(10) == b""
+    idle.close()
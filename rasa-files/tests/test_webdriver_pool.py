@@ -0,0 +1,125 @@
+import threading
+
+import pytest
+from selenium.common.exceptions import TimeoutException
+
+from scraper.metrics import REGISTRY
+from scraper.webdriver_pool import WebDriverPool
+
+class FakeDriver:
+    def __init__(self):
+        self.closed = False
+    
+    def quit(self):
+        self.closed = True
+
+@pytest.fixture
+def drivers():
+    return []
+
+@pytest.fixture
+def make_pool(drivers):
+    pools = []
+    
+    def factory():
+        driver = FakeDriver()
+        drivers.append(driver)
+        return driver
+    
+    def make(**kwargs):
+        kwargs.setdefault("max_memory_mb", 0)
+        pool = WebDriverPool(factory, **kwargs)
+        pools.append(pool)
+        return pool
+    
+    yield make
+    for pool in pools:
+        pool.close()
+
+def test_lease_reuses_idle_driver(make_pool, drivers):
+    pool = make_pool(size=2)
+    with pool.lease() as first:
+        pass
+    with pool.lease() as second:
+        assert second is first
+    assert len(drivers) == 1
+    assert pool.stats()["idle"] == 1
+
+def test_driver_recycled_after_max_pages(make_pool, drivers):
+    pool = make_pool(size=1, max_pages=2)
+    for _ in range(3):
+        with pool.lease():
+            pass
+    assert len(drivers) == 2
+    assert drivers[0].closed and not drivers[1].closed
+    assert pool.stats()["recycled"] == 1
+
+def test_unexpected_error_recycles_driver(make_pool, drivers):
+    pool = make_pool(size=1)
+    with pytest.raises(RuntimeError):
+        with pool.lease():
+            raise RuntimeError("navigateur planté")
+    assert drivers[0].closed
+    assert pool.stats()["open"] == 0
+
+def test_benign_error_keeps_driver(make_pool, drivers):
+    pool = make_pool(size=1)
+    with pytest.raises(TimeoutException):
+        with pool.lease():
+            raise TimeoutException("page lente")
+    assert not drivers[0].closed
+    assert pool.stats()["idle"] == 1
+
+def test_lease_times_out_when_pool_is_busy(make_pool):
+    pool = make_pool(size=1)
+    with pool.lease():
+        with pytest.raises(TimeoutError):
+            with pool.lease(timeout=0.05):
+                pass
+
+def test_pool_never_exceeds_size(make_pool, drivers):
+    pool = make_pool(size=2)
+    peak = []
+    barrier = threading.Barrier(4)
+    
+    def worker():
+        barrier.wait()
+        for _ in range(5):
+            with pool.lease():
+                peak.append(pool.stats()["in_use"])
+    
+    threads = [threading.Thread(target=worker) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert max(peak) <= 2
+    assert len(drivers) <= 2
+
+def test_close_quits_all_drivers(make_pool, drivers):
+    pool = make_pool(size=2)
+    pool.warm_up()
+    pool.close()
+    assert len(drivers) == 2
+    assert all(driver.closed for driver in drivers)
+    with pytest.raises(RuntimeError):
+        with pool.lease():
+            pass
+
+def test_metrics_report_each_open_pool(make_pool):
+    """Régression: chaque pool remplaçait les jauges globales du précédent"""
+    first = make_pool(size=1, name="first")
+    second = make_pool(size=3, name="second")
+    second.warm_up(2)
+    
+    def sizes():
+        samples = REGISTRY.snapshot()["esg_webdriver_pool_drivers"]
+        return {sample["labels"]["pool"]: sample["value"] for sample in samples if sample["labels"]["state"] == "size"}
+    
+    created = {sample["labels"]["pool"]: sample["value"]
+               for sample in REGISTRY.snapshot()["esg_webdriver_pool_created_total"]}
+    assert sizes()["first"] == 1 and sizes()["second"] == 3
+    assert created["second"] == 2
+    
+    first.close()
+    assert "first" not in sizes() and "second" in sizes()